@@ -72,16 +72,29 @@ import mininet.node
 from mininet.link import TCLink
 from mininet.log import setLogLevel, info
 from mininet.net import Mininet
-from mininet.util import ipStr, ipParse
 
 import minindn
 import minindn.common as minindn_common
 import minindn.config as minindn_config
 import ndn
+import ndn.command_log as command_log
+import ndn.convergence
 import ndn.nlsr as nlsr
+import ndn.phases as phases
+import ndn.profiling as profiling
+import ndn.tracing as tracing
 from minindn.topology import Topology
 
-from ndn.ndn_host import NdnHost, CpuLimitedNdnHost
+from ndn.bring_up import BringUp, DEFAULT_MAX_WORKERS
+from ndn.cgroup_accountant import CgroupAccountant
+from ndn.link_monitor import LinkSampler
+from ndn.nfd_counters import NfdCounterSampler
+from ndn.overload_watchdog import OverloadWatchdog
+from ndn.queue_monitor import QueueSampler
+from ndn.routing_overhead import RoutingOverheadMeter
+from ndn.experiments.experiment import Experiment, TRAFFIC_APPS, TRAFFIC_APP_NDNPING
+from ndn.process_monitor import ProcessSampler
+from ndn.ndn_host import NdnHost, CpuLimitedNdnHost, assign_ips, log_cmd_report, make_home_folders
 
 def print_experiment_names(option, opt, value, parser):
     print 'Mini-NDN experiments:'
@@ -121,7 +134,16 @@ def parse_args():
         dest="ctime",
         type="int",
         default=60,
-        help="Specify convergence time for the topology (Default: 60 seconds)"
+        help="Specify the maximum convergence time for the topology (Default: 60 seconds)"
+    )
+    parser.add_option(
+        "--convergence-interval",
+        action="store",
+        dest="convergence_interval",
+        type="float",
+        default=ndn.convergence.DEFAULT_INTERVAL,
+        help="Seconds between FIB checks while waiting for convergence (Default: {})".format(
+            ndn.convergence.DEFAULT_INTERVAL)
     )
     parser.add_option(
         "--experiment",
@@ -151,6 +173,14 @@ def parse_args():
         callback=print_experiment_names,
         help="Lists the names of all available experiments"
     )
+    parser.add_option(
+        "--max-workers",
+        action="store",
+        dest="max_workers",
+        type="int",
+        default=DEFAULT_MAX_WORKERS,
+        help="Number of hosts brought up concurrently (Default: {})".format(DEFAULT_MAX_WORKERS)
+    )
     parser.add_option(
         "--no-cli",
         action="store_false",
@@ -166,6 +196,73 @@ def parse_args():
         default=300,
         help="Number of pings to perform between each node in the experiment"
     )
+    parser.add_option(
+        "--monitor-processes",
+        action="store_true",
+        dest="monitor_processes",
+        default=False,
+        help="Sample /proc/<pid>/stat of NFD, NLSR and experiment apps into <work-dir>/process-monitor"
+    )
+    parser.add_option(
+        "--monitor-hosts",
+        action="store_true",
+        dest="monitor_hosts",
+        default=False,
+        help="Account the CPU, memory and I/O of every node's cgroup per phase into <work-dir>/host-resources"
+    )
+    parser.add_option(
+        "--monitor-links",
+        action="store_true",
+        dest="monitor_links",
+        default=False,
+        help="Sample the traffic and drops of every link into <work-dir>/link-monitor"
+    )
+    parser.add_option(
+        "--monitor-queues",
+        action="store_true",
+        dest="monitor_queues",
+        default=False,
+        help="Sample the qdisc statistics of every shaped link into <work-dir>/queue-monitor"
+    )
+    parser.add_option(
+        "--monitor-nfd",
+        action="store_true",
+        dest="monitor_nfd",
+        default=False,
+        help="Sample the forwarder and face counters of every node's NFD into <work-dir>/nfd-counters"
+    )
+    parser.add_option(
+        "--measure-routing-overhead",
+        action="store_true",
+        dest="measure_routing_overhead",
+        default=False,
+        help="Capture NLSR's sync, LSA and hello traffic of every node and summarize it per phase "
+             "into <work-dir>/routing-overhead"
+    )
+    parser.add_option(
+        "--record-commands",
+        action="store_true",
+        dest="record_commands",
+        default=False,
+        help="Record every command sent to the nodes' shells with its latency, output size and caller "
+             "into <work-dir>/commands, with a report per command template"
+    )
+    parser.add_option(
+        "--profile",
+        action="store_true",
+        dest="profile",
+        default=False,
+        help="Profile Mini-NDN itself with cProfile and write a profile per phase and a summary of "
+             "the hottest call sites into <work-dir>/profile"
+    )
+    parser.add_option(
+        "--monitor-interval",
+        action="store",
+        dest="monitor_interval",
+        type="float",
+        default=1,
+        help="Seconds between the samples of the monitors, at least 0.1 (Default: 1)"
+    )
     parser.add_option(
         "--nlsr-security",
         action="store_true",
@@ -203,6 +300,24 @@ def parse_args():
         default=1.0,
         help="Specify the percentage of nodes each node should ping"
     )
+    parser.add_option(
+        "--ping-jitter",
+        action="store",
+        dest="ping_jitter",
+        type="float",
+        default=0,
+        help="Delay each ping client by a random 0 to PING_JITTER seconds (Default: 0)"
+    )
+    parser.add_option(
+        "--traffic-app",
+        action="store",
+        dest="traffic_app",
+        type="choice",
+        choices=TRAFFIC_APPS,
+        default=TRAFFIC_APP_NDNPING,
+        help="Traffic generator used by experiments: {} (Default: {})".format(
+            ', '.join(TRAFFIC_APPS), TRAFFIC_APP_NDNPING)
+    )
     parser.add_option(
         '--version',
         '-V',
@@ -251,40 +366,41 @@ def execute(options):
         options.result_dir = create_results_dir(options.result_dir, options.num_faces, options.is_hr_enabled)
 
     start_time = datetime.now()
+    phases.enter(phases.SETUP)
 
-    config = minindn_config.parse(template_file)
-    topo = Topology(config, options.work_dir)
+    if options.profile:
+        profiling.profiler = profiling.PhaseProfiler(os.path.join(options.work_dir, 'profile'))
+        profiling.profiler.start()
 
-    if topo.is_tc_link is True and topo.is_limited is True:
-        net = Mininet(topo, host=CpuLimitedNdnHost, link=TCLink)
-    elif topo.is_tc_link is True and topo.is_limited is False:
-        net = Mininet(topo, host=NdnHost, link=TCLink)
-    elif topo.is_tc_link is False and topo.is_limited is True:
-        net = Mininet(topo, host=CpuLimitedNdnHost)
-    else:
-        net = Mininet(topo, host=NdnHost)
+    if options.record_commands:
+        command_log.recorder = command_log.CommandRecorder()
+
+    with tracing.span('config parse'):
+        config = minindn_config.parse(template_file)
+
+    with tracing.span('topology build'):
+        topo = Topology(config, options.work_dir)
 
-    net.start()
+    make_home_folders(options.work_dir, [host.name for host in topo.hosts_conf])
+
+    phases.enter(phases.HOSTS)
+    with tracing.span('host construction'):
+        if topo.is_tc_link is True and topo.is_limited is True:
+            net = Mininet(topo, host=CpuLimitedNdnHost, link=TCLink)
+        elif topo.is_tc_link is True and topo.is_limited is False:
+            net = Mininet(topo, host=NdnHost, link=TCLink)
+        elif topo.is_tc_link is False and topo.is_limited is True:
+            net = Mininet(topo, host=CpuLimitedNdnHost)
+        else:
+            net = Mininet(topo, host=NdnHost)
+
+    with tracing.span('net start'):
+        net.start()
+    phases.enter(phases.SETUP)
 
     # Giving proper IPs to intf so neighbor nodes can communicate
-    # This is one way of giving connectivity, another way could be
-    # to insert a switch between each pair of neighbors
-    ndn_net_base = "1.0.0.0"
-    interfaces = []
-    for host in net.hosts:
-        for intf in host.intfList():
-            link = intf.link
-            node1, node2 = link.intf1.node, link.intf2.node
-
-            if node1 in net.switches or node2 in net.switches:
-                continue
-
-            if link.intf1 not in interfaces and link.intf2 not in interfaces:
-                interfaces.append(link.intf1)
-                interfaces.append(link.intf2)
-                node1.setIP(ipStr(ipParse(ndn_net_base) + 1) + '/30', intf=link.intf1)
-                node2.setIP(ipStr(ipParse(ndn_net_base) + 2) + '/30', intf=link.intf2)
-                ndn_net_base = ipStr(ipParse(ndn_net_base) + 4)
+    with tracing.span('IP assignment'):
+        assign_ips(net)
 
     # Used later to check prefix name in checkFIB
     nodes = ','.join([str(host.name) for host in net.hosts])
@@ -294,25 +410,175 @@ def execute(options):
         'max-faces-per-prefix': options.num_faces,
         'hyperbolic-state': options.is_hr_enabled
     }
-    nlsr.setup(net, topo.hosts_conf, options.work_dir, nlsr_opts)
 
-    logging.info('Setup time: {}'.format((start_time - datetime.now()).seconds))
-
-    # Load experiment
+    experiment = None
     if options.experiment_name is not None:
         experiment_args = {
             "net": net,
             "nodes": nodes,
             "ctime": options.ctime,
-            "num_pings": options.num_pings,
-            "pct_traffic": options.pct_traffic
+            "convergenceInterval": options.convergence_interval,
+            "nPings": options.num_pings,
+            "pctTraffic": options.pct_traffic,
+            "pingJitter": options.ping_jitter,
+            "trafficApp": options.traffic_app,
+            "workDir": options.work_dir,
+            "routeRecordInterval": options.monitor_interval
         }
-        ndn.ExperimentManager.run(options.experiment_name, experiment_args)
-
-    if options.is_cli_enabled:
-        CLI(net)
-
-    net.stop()
+        logging.info("Loading experiment: {}".format(options.experiment_name))
+        experiment = ndn.ExperimentManager.create(options.experiment_name, experiment_args)
+
+    # The samplers and captures run detached from minindn: from here on, they and the network
+    # are stopped on every exit path, including a failed bring-up or convergence
+    cgroup_accountant = None
+    link_sampler = None
+    queue_sampler = None
+    routing_overhead = None
+    overload_watchdog = None
+    process_sampler = None
+    nfd_sampler = None
+    failed = False
+    try:
+        # Host cgroups must be set up before the hosts start their applications
+        if options.monitor_hosts:
+            cgroup_accountant = CgroupAccountant(os.path.join(options.work_dir, 'host-resources'),
+                                                 options.monitor_interval)
+            cgroup_accountant.attach(net.hosts)
+            cgroup_accountant.start()
+
+        if options.monitor_links:
+            link_sampler = LinkSampler(os.path.join(options.work_dir, 'link-monitor'), options.monitor_interval)
+            link_sampler.addLinks(net, topo.links_conf)
+            link_sampler.start()
+
+        if options.monitor_queues:
+            if topo.is_tc_link:
+                queue_sampler = QueueSampler(os.path.join(options.work_dir, 'queue-monitor'),
+                                             options.monitor_interval)
+                queue_sampler.addLinks(net, topo.links_conf)
+                queue_sampler.start()
+            else:
+                logging.warning("No shaped link in the topology; queues will not be monitored")
+
+        if options.measure_routing_overhead:
+            parameters = dict(nlsr_opts)
+            parameters['topology'] = template_file
+            routing_overhead = RoutingOverheadMeter(os.path.join(options.work_dir, 'routing-overhead'), parameters)
+            routing_overhead.start(net.hosts)
+
+        # Flag the intervals in which the machine was too loaded for the measurements to be trusted
+        if experiment is not None:
+            overload_watchdog = OverloadWatchdog(options.work_dir)
+            overload_watchdog.attach(net.hosts)
+            overload_watchdog.start()
+
+        # Bring up nfd -> nlsr -> experiment services on all hosts concurrently
+        bring_up = BringUp(net.hosts, options.max_workers)
+        bring_up.addStage('nfd', lambda host: host.nfd.start())
+        nlsr.add_stages(bring_up, net, topo.hosts_conf, options.work_dir, nlsr_opts)
+        if experiment is not None:
+            experiment.addSetupStages(bring_up)
+
+        # The stages are pipelined per node, so the experiment services started in the
+        # bring-up are part of the nlsr phase too
+        phases.enter(phases.NLSR)
+        with tracing.span('bring-up'):
+            bring_up.run()
+        phases.enter(phases.SETUP)
+
+        ndn.nfd.log_startup_report(net.hosts)
+        log_cmd_report(net.hosts)
+
+        if options.monitor_processes:
+            process_sampler = ProcessSampler(os.path.join(options.work_dir, 'process-monitor'),
+                                             options.monitor_interval)
+            for host in net.hosts:
+                process_sampler.add(host.nfd.processId, '{}-nfd'.format(host.name))
+                process_sampler.add(host.nlsr.processId, '{}-nlsr'.format(host.name))
+            if experiment is not None:
+                experiment.setProcessSampler(process_sampler)
+            process_sampler.start()
+
+        if options.monitor_nfd:
+            nfd_sampler = NfdCounterSampler(os.path.join(options.work_dir, 'nfd-counters'),
+                                            options.monitor_interval, nfdVersion=ndn.nfd.VERSION)
+            nfd_sampler.addHosts(net.hosts)
+            nfd_sampler.start()
+
+        logging.info('Setup time: {:.3f}s'.format((datetime.now() - start_time).total_seconds()))
+        tracing.tracer.logReport()
+
+        if experiment is not None:
+            experiment.start()
+
+        phases.end()
+
+        if overload_watchdog is not None:
+            overload_watchdog.stop()
+            overload_watchdog.logReport()
+
+        if routing_overhead is not None:
+            routing_overhead.stop()
+
+        if options.is_cli_enabled:
+            CLI(net)
+    except (BringUp.Error, Experiment.Error) as e:
+        logging.critical(e)
+        failed = True
+    finally:
+        # Stopping is idempotent: what the normal path already stopped is not stopped twice
+        phases.end()
+        phases.timeline.write(os.path.join(options.work_dir, 'phases.txt'))
+
+        if overload_watchdog is not None:
+            overload_watchdog.stop()
+
+        if routing_overhead is not None:
+            routing_overhead.stop()
+
+        if process_sampler is not None:
+            process_sampler.stop()
+
+        if link_sampler is not None:
+            link_sampler.stop()
+            link_sampler.logReport()
+
+        if nfd_sampler is not None:
+            nfd_sampler.stop()
+            nfd_sampler.logReport()
+
+        if queue_sampler is not None:
+            queue_sampler.stop()
+            queue_sampler.logReport()
+
+        if cgroup_accountant is not None:
+            cgroup_accountant.stop()
+            cgroup_accountant.writeSummary()
+            cgroup_accountant.logReport()
+
+        with tracing.span('teardown'):
+            net.stop()
+
+        # The host cgroups can only be removed once their processes have exited
+        if cgroup_accountant is not None:
+            cgroup_accountant.cleanup()
+
+    if routing_overhead is not None:
+        routing_overhead.analyze()
+
+    tracing.tracer.export(os.path.join(options.work_dir, 'trace.json'), phases.timeline)
+
+    if command_log.recorder is not None:
+        command_log.recorder.write(os.path.join(options.work_dir, 'commands'))
+        command_log.recorder.logReport()
+
+    if profiling.profiler is not None:
+        profiling.profiler.stop()
+        profiling.profiler.write()
+        profiling.profiler.logReport()
+
+    if failed:
+        sys.exit(1)
 
     if options.result_dir is not None:
         logging.info("Moving results to {}".format(options.result_dir))
@@ -0,0 +1,83 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import optparse
+import math
+import sys
+
+from ndn import overload_watchdog
+from ndn import ping_results
+
+def main():
+    usage = """Usage: minindn-ping-results [options] work_dir output_dir
+    Parses every <work_dir>/<node>/ping-data/<dest>.txt file into columnar
+    NumPy arrays stored in output_dir and prints a summary.
+    """
+    parser = optparse.OptionParser(usage)
+    parser.add_option(
+        "--processes",
+        action="store",
+        dest="processes",
+        type="int",
+        default=None,
+        help="Number of parser processes (Default: number of CPUs)"
+    )
+    parser.add_option(
+        "--exclude-intervals",
+        action="store",
+        dest="exclude_intervals",
+        default=None,
+        help="Leave out of the summary the pings sent during the intervals of this file, "
+             "e.g. <work_dir>/fidelity-compromised.txt"
+    )
+
+    (options, args) = parser.parse_args()
+    if len(args) != 2:
+        parser.print_help()
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO)
+    results = ping_results.ingest(args[0], args[1], options.processes)
+
+    if options.exclude_intervals is not None:
+        intervals = overload_watchdog.read_intervals(options.exclude_intervals)
+        excluded = results.inIntervals(intervals).sum()
+        results = results.excluding(intervals)
+        print "Excluded {} record(s) sent during {} interval(s)".format(excluded, len(intervals))
+
+    print "Records: {}".format(len(results))
+    print "Loss: {:.2%}".format(results.loss())
+    print "RTT p50/p90/p99 (ms): {:.2f} / {:.2f} / {:.2f}".format(*results.rttPercentiles())
+
+    if len(results.launchWindows) > 0:
+        widest = max(end - start for start, end in results.launchWindows)
+        offsets = sorted(offset for offset in results.pairStarts()[3].tolist() if not math.isnan(offset))
+        print "Launch windows: {}, widest {:.3f}s".format(len(results.launchWindows), widest)
+        if len(offsets) > 0:
+            print "First result of a pair after its launch p50/max (s): {:.3f} / {:.3f}".format(
+                offsets[len(offsets) // 2], offsets[-1])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import random
+import re
+
+from ndn import command_batch
+
+CONF_SEPARATOR = '##########'
+
+DEFAULT_INTERVAL = 1000
+
+class NdnTrafficClient(object):
+    '''Drives all of a host's destinations from a single ndn-traffic-client process instead
+       of one ndnping per destination. Each destination is a traffic pattern with an equal
+       share of the traffic; the total count is count times the number of destinations and
+       the client sends one Interest every interval / N ms, so that each destination gets
+       `count` Interests every `interval` ms on average. ndn-traffic-client picks the pattern
+       of every Interest at random: the exact count of each destination varies around `count`.'''
+
+    def __init__(self, host, **kwargs):
+        self.host = host
+        self.interval = kwargs.get('interval', None)
+        self.timeout = kwargs.get('timeout', None)
+        self.count = kwargs.get('count', None)
+        self.must_be_fresh = kwargs.get('must_be_fresh', True)
+        self.conf_file = kwargs.get('conf_file', 'traffic-client.conf')
+        self.log_file = kwargs.get('log_file', None)
+
+        if self.count is not None and int(self.count) < 1:
+            raise ValueError("count must be at least 1, got {}".format(self.count))
+        if self.timeout is not None and int(self.timeout) < 1:
+            raise ValueError("timeout must be at least 1 ms, got {}".format(self.timeout))
+
+    def getInterval(self, name_prefixes):
+        '''Milliseconds between two Interests of the client. ndn-traffic-client takes whole
+           milliseconds, so an interval that is not a multiple of the number of destinations
+           cannot be kept and is rejected rather than rounded.'''
+        interval = int(self.interval) if self.interval is not None else DEFAULT_INTERVAL
+        if interval < len(name_prefixes) or interval % len(name_prefixes) != 0:
+            raise ValueError("ndn-traffic-client cannot ping {} destinations every {} ms: the interval "
+                             "must be a multiple of the number of destinations".format(len(name_prefixes), interval))
+        return interval // len(name_prefixes)
+
+    def getConfig(self, name_prefixes):
+        if len(name_prefixes) == 0:
+            raise ValueError("A traffic client needs at least one destination")
+
+        patterns = []
+        for name_prefix in name_prefixes:
+            pattern = [
+                'TrafficPercentage={}'.format(100.0 / len(name_prefixes)),
+                # ndnpingserver answers Interests for <prefix>/ping/<number>
+                'Name={}/ping'.format(name_prefix),
+                'NameAppendSequenceNumber=1'
+            ]
+            if self.must_be_fresh:
+                pattern.append('MustBeFresh=1')
+            if self.timeout is not None:
+                pattern.append('InterestLifetime={}'.format(self.timeout))
+            patterns.append('\n'.join(pattern))
+
+        return ('\n{}\n'.format(CONF_SEPARATOR)).join(patterns) + '\n'
+
+    def writeConfig(self, name_prefixes):
+        with open(os.path.join(self.host.homeFolder, self.conf_file), 'w') as conf_file:
+            conf_file.write(self.getConfig(name_prefixes))
+
+    def getCommand(self, name_prefixes, background=True):
+        args = ['ndn-traffic-client',]
+        if self.count is not None:
+            args.extend(('-c', self.count * len(name_prefixes)))
+        args.extend(('-i', self.getInterval(name_prefixes)))
+        args.append(self.conf_file)
+        if self.log_file is not None:
+            args.extend(('>>', self.log_file))
+        if background:
+            args.append('&')
+
+        args = [str(arg) for arg in args]
+        return ' '.join(args)
+
+    def start(self, name_prefixes):
+        self.writeConfig(name_prefixes)
+        self.host.cmd(self.getCommand(name_prefixes))
+
+def start(host, name_prefixes, **kwargs):
+    client = NdnTrafficClient(host, **kwargs)
+    client.start(name_prefixes)
+
+def start_all(schedule, jitter=0, **kwargs):
+    '''Start one traffic client per host, all hosts concurrently.
+       schedule: dict of host -> (list of name prefixes, conf file, log file).
+       jitter: if set, each client is delayed by a random 0 to jitter seconds.
+       Returns a dict of host name -> list of command_batch.CommandResult.'''
+    hostCommands = {}
+    for host, (name_prefixes, conf_file, log_file) in schedule.items():
+        client = NdnTrafficClient(host, conf_file=conf_file, log_file=log_file, **kwargs)
+        client.writeConfig(name_prefixes)
+        if jitter > 0:
+            hostCommands[host] = ['(sleep {:.3f}; exec {}) &'.format(
+                random.uniform(0, jitter), client.getCommand(name_prefixes, background=False))]
+        else:
+            hostCommands[host] = [client.getCommand(name_prefixes)]
+
+    return command_batch.run_all(hostCommands)
+
+_PATTERN_RE = re.compile(r'PatternType=(\d+)')
+
+def split_log(log_file, output_files):
+    '''Split a traffic client log into one file per destination: the log lines of
+       pattern N of the client's configuration are appended to output_files[N - 1].
+       The files are read by ndn.ping_results.parse_traffic_file.'''
+    outputs = [open(output_file, 'a') for output_file in output_files]
+    try:
+        with open(log_file, 'r') as log:
+            for line in log:
+                match = _PATTERN_RE.search(line)
+                if match is not None and 1 <= int(match.group(1)) <= len(outputs):
+                    outputs[int(match.group(1)) - 1].write(line)
+    finally:
+        for output in outputs:
+            output.close()
@@ -21,6 +21,10 @@
 # along with Mini-NDN, e.g., in COPYING.md file.
 # If not, see <http://www.gnu.org/licenses/>.
 
+import random
+
+from ndn import command_batch
+
 class NdnPing(object):
     def __init__(self, host, **kwargs):
         self.host = host
@@ -34,6 +38,9 @@ class NdnPing(object):
         self.log_file = kwargs.get('log_file', None)
 
     def start(self, name_prefix):
+        self.host.cmd(self.getCommand(name_prefix))
+
+    def getCommand(self, name_prefix, background=True):
         args = ['ndnping',]
         if self.interval is not None:
             args.extend(('-i', self.interval))
@@ -52,11 +59,31 @@ class NdnPing(object):
         args.append(name_prefix)
         if self.log_file is not None:
             args.extend(('>>', self.log_file))
-        args.append('&')
+        if background:
+            args.append('&')
 
         args = [str(arg) for arg in args]
-        self.host.cmd(' '.join(args))
+        return ' '.join(args)
 
 def ping(host, name_prefix, **kwargs):
     ping = NdnPing(host, **kwargs)
     ping.start(name_prefix)
+
+def ping_all(schedule, jitter=0, **kwargs):
+    '''Start many pings with one batch of commands per host, all hosts concurrently.
+       schedule: dict of host -> list of (name prefix, log file) tuples.
+       jitter: if set, each client is delayed by a random 0 to jitter seconds.
+       Returns a dict of host name -> list of command_batch.CommandResult.'''
+    hostCommands = {}
+    for host, pings in schedule.items():
+        commands = []
+        for name_prefix, log_file in pings:
+            ping = NdnPing(host, log_file=log_file, **kwargs)
+            if jitter > 0:
+                commands.append('(sleep {:.3f}; exec {}) &'.format(
+                    random.uniform(0, jitter), ping.getCommand(name_prefix, background=False)))
+            else:
+                commands.append(ping.getCommand(name_prefix))
+        hostCommands[host] = commands
+
+    return command_batch.run_all(hostCommands)
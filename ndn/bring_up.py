@@ -0,0 +1,159 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import Queue
+import threading
+import time
+
+from ndn import profiling, tracing
+
+DEFAULT_MAX_WORKERS = 16
+
+class BringUp(object):
+    '''Runs per-host setup stages (e.g. nfd -> nlsr -> strategy -> ndnpingserver) concurrently
+       across hosts. Stages of one host run in dependency order on a single worker, since they
+       share the host's shell; different hosts are brought up in parallel by up to maxWorkers threads.'''
+
+    class Error(Exception):
+        def __init__(self, what):
+            self.what = what
+        def __str__(self):
+            return repr(self.what)
+
+    def __init__(self, hosts, maxWorkers=DEFAULT_MAX_WORKERS):
+        self.hosts = hosts
+        self.maxWorkers = max(1, int(maxWorkers))
+        self.stages = []
+
+        # Per-host results: host name -> {stage name: seconds}
+        self.timings = {}
+        # Per-host failures: host name -> (stage name, exception)
+        self.failures = {}
+        self.elapsed = None
+
+        self._lock = threading.Lock()
+
+    def addStage(self, name, action, requires=()):
+        '''Register a stage that calls action(host) on every host.
+           Required stages that are not registered are assumed to be satisfied already.'''
+        if self.hasStage(name):
+            raise BringUp.Error("Stage '%s' has already been added" % name)
+
+        self.stages.append((name, action, tuple(requires)))
+
+    def hasStage(self, name):
+        return any(stage[0] == name for stage in self.stages)
+
+    def orderedStages(self):
+        "Topologically sort the stages, keeping registration order between independent stages"
+        names = [stage[0] for stage in self.stages]
+        remaining = [(name, action, [dep for dep in requires if dep in names])
+                     for name, action, requires in self.stages]
+        ordered = []
+        done = set()
+
+        while len(remaining) > 0:
+            ready = [stage for stage in remaining if all(dep in done for dep in stage[2])]
+            if len(ready) == 0:
+                raise BringUp.Error("Cyclic stage dependencies: %s" % ', '.join(stage[0] for stage in remaining))
+
+            for stage in ready:
+                ordered.append((stage[0], stage[1]))
+                done.add(stage[0])
+                remaining.remove(stage)
+
+        return ordered
+
+    def _bringUpHost(self, host, stages):
+        timings = {}
+        for name, action in stages:
+            start_time = time.time()
+            try:
+                with tracing.span(name, track=host.name):
+                    action(host)
+            except Exception as e:
+                logging.error("Stage '{}' failed on {}: {}".format(name, host.name, e))
+                with self._lock:
+                    self.failures[host.name] = (name, e)
+                break
+            timings[name] = time.time() - start_time
+
+        with self._lock:
+            self.timings[host.name] = timings
+
+    def _worker(self, hostQueue, stages):
+        with profiling.thread():
+            while True:
+                try:
+                    host = hostQueue.get_nowait()
+                except Queue.Empty:
+                    return
+                self._bringUpHost(host, stages)
+
+    def run(self):
+        stages = self.orderedStages()
+        start_time = time.time()
+
+        hostQueue = Queue.Queue()
+        for host in self.hosts:
+            hostQueue.put(host)
+
+        workers = []
+        for i in range(min(self.maxWorkers, len(self.hosts))):
+            worker = threading.Thread(target=self._worker, args=(hostQueue, stages))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+
+        # Join with a timeout so that SIGINT is still delivered to the main thread
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(0.5)
+
+        self.elapsed = time.time() - start_time
+        self.logReport()
+
+        if len(self.failures) > 0:
+            raise BringUp.Error("Bring-up failed on %d host(s): %s" %
+                                (len(self.failures), ', '.join(sorted(self.failures))))
+
+        return self.timings
+
+    def hostTime(self, name):
+        return sum(self.timings.get(name, {}).values())
+
+    def logReport(self):
+        if len(self.timings) == 0:
+            return
+
+        slowest = max(self.timings, key=self.hostTime)
+        logging.info("Brought up {} host(s) in {:.2f}s with {} worker(s); slowest host {} took {:.2f}s".format(
+            len(self.timings), self.elapsed, min(self.maxWorkers, len(self.hosts)),
+            slowest, self.hostTime(slowest)))
+
+        for name, action in self.orderedStages():
+            stageTimes = [timings[name] for timings in self.timings.values() if name in timings]
+            if len(stageTimes) > 0:
+                logging.debug("  {}: mean {:.3f}s, max {:.3f}s".format(
+                    name, sum(stageTimes) / len(stageTimes), max(stageTimes)))
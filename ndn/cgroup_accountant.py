@@ -0,0 +1,411 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import errno
+import glob
+import json
+import logging
+import os
+import struct
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ndn import phases
+from ndn.sampler import DEFAULT_FLUSH_INTERVAL, PeriodicSampler, append_records
+
+# Samples are stored as fixed-width little-endian records in <host>.cgstat files.
+# Every field but memory_bytes is a cumulative counter.
+RECORD_FIELDS = ['timestamp', 'cpu_usec', 'user_usec', 'system_usec', 'nr_throttled', 'throttled_usec',
+                 'memory_bytes', 'io_read_bytes', 'io_write_bytes']
+RECORD_STRUCT = struct.Struct('<d8Q')
+FILE_SUFFIX = '.cgstat'
+SUMMARY_FILE = 'summary.json'
+
+CGROUP_V1 = 1
+CGROUP_V2 = 2
+
+# Accounting groups created for hosts that do not have their own cgroup
+V2_PARENT = 'minindn'
+V1_CONTROLLERS = {'cpu': 'cpuacct', 'memory': 'memory', 'io': 'blkio'}
+
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+def parse_mounts(mounts):
+    '''Parse /proc/mounts into a dict of cgroup v1 controller -> mount point.
+       The cgroup v2 (unified) mount point, if any, is stored under the empty name.'''
+    mountPoints = {}
+    for line in mounts.splitlines():
+        fields = line.split()
+        if len(fields) < 4:
+            continue
+        if fields[2] == 'cgroup2':
+            mountPoints.setdefault('', fields[1])
+        elif fields[2] == 'cgroup':
+            for option in fields[3].split(','):
+                if option in V1_CONTROLLERS.values() or option == 'cpu':
+                    mountPoints.setdefault(option, fields[1])
+    return mountPoints
+
+def parse_proc_cgroup(cgroups):
+    '''Parse /proc/<pid>/cgroup into a dict of controller -> cgroup path.
+       The cgroup v2 path is stored under the empty name.'''
+    paths = {}
+    for line in cgroups.splitlines():
+        fields = line.split(':', 2)
+        if len(fields) != 3:
+            continue
+        if fields[1] == '':
+            paths[''] = fields[2]
+        else:
+            for controller in fields[1].split(','):
+                paths[controller] = fields[2]
+    return paths
+
+def parse_keyed(text):
+    "Parse 'key value' lines, e.g. cpu.stat or cpuacct.stat"
+    values = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and fields[1].isdigit():
+            values[fields[0]] = int(fields[1])
+    return values
+
+def parse_blkio(text):
+    "Sum the Read and Write bytes of all devices in blkio.throttle.io_service_bytes"
+    read = write = 0
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) != 3:
+            continue
+        if fields[1] == 'Read':
+            read += int(fields[2])
+        elif fields[1] == 'Write':
+            write += int(fields[2])
+    return read, write
+
+def parse_io_stat(text):
+    "Sum the rbytes and wbytes of all devices in io.stat"
+    read = write = 0
+    for line in text.splitlines():
+        for field in line.split()[1:]:
+            key, _, value = field.partition('=')
+            if key == 'rbytes':
+                read += int(value)
+            elif key == 'wbytes':
+                write += int(value)
+    return read, write
+
+def _read(path):
+    "Return the content of a cgroup file, or an empty string if the controller is not available"
+    try:
+        with open(path) as f:
+            return f.read()
+    except IOError as e:
+        if e.errno in (errno.ENOENT, errno.ENODEV, errno.EINVAL):
+            return ""
+        raise
+
+def _readInt(path):
+    text = _read(path).strip()
+    return int(text) if text.isdigit() else 0
+
+class HostCgroup(object):
+    '''The cgroup directories of one host: directories maps 'cpu', 'memory' and 'io'
+       to a directory (all the same one with cgroup v2) or None if not accounted.'''
+
+    def __init__(self, directories, version):
+        self.directories = directories
+        self.version = version
+
+    def read(self):
+        "Return the RECORD_FIELDS values but the timestamp"
+        cpu = self.directories.get('cpu')
+        memory = self.directories.get('memory')
+        io = self.directories.get('io')
+
+        if self.version == CGROUP_V2:
+            cpuStat = parse_keyed(_read(os.path.join(cpu, 'cpu.stat'))) if cpu else {}
+            cpuValues = (cpuStat.get('usage_usec', 0), cpuStat.get('user_usec', 0), cpuStat.get('system_usec', 0),
+                         cpuStat.get('nr_throttled', 0), cpuStat.get('throttled_usec', 0))
+            memoryBytes = _readInt(os.path.join(memory, 'memory.current')) if memory else 0
+            ioBytes = parse_io_stat(_read(os.path.join(io, 'io.stat'))) if io else (0, 0)
+        else:
+            if cpu:
+                cpuacctStat = parse_keyed(_read(os.path.join(cpu, 'cpuacct.stat')))
+                cpuStat = parse_keyed(_read(os.path.join(cpu, 'cpu.stat')))
+                cpuValues = (_readInt(os.path.join(cpu, 'cpuacct.usage')) // 1000,
+                             cpuacctStat.get('user', 0) * 1000000 // _CLOCK_TICKS,
+                             cpuacctStat.get('system', 0) * 1000000 // _CLOCK_TICKS,
+                             cpuStat.get('nr_throttled', 0), cpuStat.get('throttled_time', 0) // 1000)
+            else:
+                cpuValues = (0, 0, 0, 0, 0)
+            memoryBytes = _readInt(os.path.join(memory, 'memory.usage_in_bytes')) if memory else 0
+            ioBytes = parse_blkio(_read(os.path.join(io, 'blkio.throttle.io_service_bytes'))) if io else (0, 0)
+
+        return cpuValues + (memoryBytes,) + ioBytes
+
+def _move(processId, directory):
+    "Move a process and the children it will spawn to the cgroup in directory"
+    with open(os.path.join(directory, 'cgroup.procs'), 'w') as procs:
+        procs.write(str(processId))
+
+def resolve_host_cgroup(name, processId, mounts, ownPaths, created=None):
+    '''Return the HostCgroup of the host whose shell is processId. Hosts that share the
+       orchestrator's cgroup (i.e. not CpuLimitedNdnHost) get a cgroup of their own, named
+       after the host, so that the processes they spawn from now on are accounted to them.
+       Created directories are appended to created; if created is None, no cgroup is created
+       and None is returned for a host without any cgroup of its own.'''
+    paths = parse_proc_cgroup(_read('/proc/{}/cgroup'.format(processId)))
+
+    if '' in mounts and '' in paths and not any(controller in paths for controller in V1_CONTROLLERS.values()):
+        directory = mounts[''] + paths['']
+        if paths[''] == ownPaths.get(''):
+            if created is None:
+                return None
+
+            parent = os.path.join(mounts[''], V2_PARENT)
+            directory = os.path.join(parent, name)
+            for path in (parent, directory):
+                if not os.path.isdir(path):
+                    os.mkdir(path)
+                    created.append(path)
+            # Delegate the controllers down to the host groups; the root group has no such restriction
+            for path in (mounts[''], parent):
+                try:
+                    with open(os.path.join(path, 'cgroup.subtree_control'), 'w') as control:
+                        control.write('+cpu +memory +io')
+                except IOError as e:
+                    logging.debug("Cannot enable cgroup controllers in {}: {}".format(path, e))
+            _move(processId, directory)
+
+        return HostCgroup({'cpu': directory, 'memory': directory, 'io': directory}, CGROUP_V2)
+
+    directories = {}
+    for metric, controller in V1_CONTROLLERS.items():
+        if controller not in mounts or controller not in paths:
+            directories[metric] = None
+            continue
+
+        if paths[controller] != ownPaths.get(controller):
+            directories[metric] = mounts[controller] + paths[controller]
+            continue
+
+        if created is None:
+            directories[metric] = None
+            continue
+
+        directory = os.path.join(mounts[controller], name)
+        if not os.path.isdir(directory):
+            os.mkdir(directory)
+            created.append(directory)
+        _move(processId, directory)
+        directories[metric] = directory
+
+    if all(directory is None for directory in directories.values()):
+        return None
+
+    return HostCgroup(directories, CGROUP_V1)
+
+def load_samples(outputDir):
+    '''Load the samples written by CgroupAccountant.
+       Returns a dict of host name -> memory-mapped NumPy record array with the RECORD_FIELDS columns.'''
+    if numpy is None:
+        raise ImportError("NumPy is required to load cgroup samples")
+
+    dtype = numpy.dtype([('timestamp', '<f8')] + [(field, '<u8') for field in RECORD_FIELDS[1:]])
+    samples = {}
+    for path in glob.glob(os.path.join(outputDir, '*' + FILE_SUFFIX)):
+        name = os.path.basename(path)[:-len(FILE_SUFFIX)]
+        if os.path.getsize(path) == 0:
+            samples[name] = numpy.zeros(0, dtype=dtype)
+        else:
+            samples[name] = numpy.memmap(path, dtype=dtype, mode='r')
+
+    return samples
+
+class CgroupAccountant(PeriodicSampler):
+    '''Samples the CPU, memory and I/O counters of every host's cgroup from a single thread.
+       Samples are appended to <outputDir>/<host>.cgstat as fixed-width records (see RECORD_FIELDS)
+       and aggregated per host and per experiment phase (see ndn.phases) as they are taken.'''
+
+    def __init__(self, outputDir, interval=1, flushInterval=DEFAULT_FLUSH_INTERVAL, timeline=None):
+        PeriodicSampler.__init__(self, outputDir, interval, flushInterval)
+        self.timeline = phases.timeline if timeline is None else timeline
+
+        # host name -> HostCgroup
+        self.cgroups = {}
+        # Cgroup directories created by attach(), removed by cleanup()
+        self.createdCgroups = []
+
+        # host name -> buffered records
+        self._buffers = {}
+        # host name -> (timestamp, values) of the previous sample
+        self._previous = {}
+        # phase -> host name -> aggregated usage; phase -> {'duration': s, 'memory_peak': bytes}
+        self._usage = {}
+        self._totals = {}
+
+    def add(self, hostName, cgroup):
+        with self._lock:
+            self.cgroups[hostName] = cgroup
+
+    def attach(self, hosts):
+        '''Find or create the cgroup of every host. Must be called before the hosts start
+           their applications, since only the processes spawned afterwards are moved.'''
+        mounts = parse_mounts(_read('/proc/mounts'))
+        ownPaths = parse_proc_cgroup(_read('/proc/self/cgroup'))
+        if len(mounts) == 0:
+            logging.warning("cgroups are not mounted; host resources will not be accounted")
+            return
+
+        for host in hosts:
+            try:
+                self.add(host.name, resolve_host_cgroup(host.name, host.pid, mounts, ownPaths, self.createdCgroups))
+            except (OSError, IOError) as e:
+                logging.warning("Cannot account resources of {}: {}".format(host.name, e))
+
+    def cleanup(self):
+        "Remove the cgroups created by attach(); their processes must have exited"
+        for directory in reversed(self.createdCgroups):
+            try:
+                os.rmdir(directory)
+            except OSError as e:
+                logging.debug("Cannot remove cgroup {}: {}".format(directory, e))
+        self.createdCgroups = []
+
+    def sample(self):
+        with self._lock:
+            cgroups = self.cgroups.items()
+
+        currentTime = time.time()
+        phase = self.timeline.current()
+        samples = []
+        for hostName, cgroup in cgroups:
+            try:
+                samples.append((hostName, cgroup.read()))
+            except (OSError, IOError) as e:
+                logging.debug("Cannot read cgroup of {}: {}".format(hostName, e))
+
+        with self._lock:
+            memoryTotal = 0
+            duration = None
+            for hostName, values in samples:
+                self._buffers.setdefault(hostName, bytearray()).extend(RECORD_STRUCT.pack(currentTime, *values))
+                memoryTotal += values[5]
+
+                previous = self._previous.get(hostName)
+                self._previous[hostName] = (currentTime, values)
+                if phase is None or previous is None:
+                    continue
+
+                # Counters are attributed to the phase the sample is taken in
+                elapsed = currentTime - previous[0]
+                duration = elapsed
+                delta = [max(0, value - old) for value, old in zip(values, previous[1])]
+                usage = self._usage.setdefault(phase, {}).setdefault(hostName, {
+                    'duration': 0.0, 'cpu_usec': 0, 'user_usec': 0, 'system_usec': 0, 'throttled_usec': 0,
+                    'memory_peak': 0, 'memory_sum': 0, 'samples': 0, 'io_read_bytes': 0, 'io_write_bytes': 0
+                })
+                usage['duration'] += elapsed
+                usage['cpu_usec'] += delta[0]
+                usage['user_usec'] += delta[1]
+                usage['system_usec'] += delta[2]
+                usage['throttled_usec'] += delta[4]
+                usage['memory_peak'] = max(usage['memory_peak'], values[5])
+                usage['memory_sum'] += values[5]
+                usage['samples'] += 1
+                usage['io_read_bytes'] += delta[6]
+                usage['io_write_bytes'] += delta[7]
+
+            if duration is not None:
+                totals = self._totals.setdefault(phase, {'duration': 0.0, 'memory_peak': 0})
+                totals['duration'] += duration
+                totals['memory_peak'] = max(totals['memory_peak'], memoryTotal)
+
+    def flush(self):
+        with self._lock:
+            buffers = self._buffers
+            self._buffers = {}
+
+        for hostName, records in buffers.items():
+            append_records("{}/{}{}".format(self.outputDir, hostName, FILE_SUFFIX), records)
+
+    def summary(self):
+        '''Return phase -> {'hosts': {host name -> usage}, 'total': usage} where usage has
+           cpu_seconds, cpu_cores (average number of cores in use), throttled_seconds,
+           memory_peak_bytes, memory_mean_bytes, io_read_bytes and io_write_bytes'''
+        with self._lock:
+            summary = {}
+            for phase, hosts in self._usage.items():
+                summary[phase] = {'hosts': {}}
+                for hostName, usage in hosts.items():
+                    summary[phase]['hosts'][hostName] = {
+                        'duration': usage['duration'],
+                        'cpu_seconds': usage['cpu_usec'] / 1e6,
+                        'user_seconds': usage['user_usec'] / 1e6,
+                        'system_seconds': usage['system_usec'] / 1e6,
+                        'cpu_cores': usage['cpu_usec'] / 1e6 / usage['duration'] if usage['duration'] > 0 else 0.0,
+                        'throttled_seconds': usage['throttled_usec'] / 1e6,
+                        'memory_peak_bytes': usage['memory_peak'],
+                        'memory_mean_bytes': usage['memory_sum'] // usage['samples'],
+                        'io_read_bytes': usage['io_read_bytes'],
+                        'io_write_bytes': usage['io_write_bytes']
+                    }
+
+                hostUsages = summary[phase]['hosts'].values()
+                totals = self._totals[phase]
+                cpuSeconds = sum(usage['cpu_seconds'] for usage in hostUsages)
+                summary[phase]['total'] = {
+                    'duration': totals['duration'],
+                    'cpu_seconds': cpuSeconds,
+                    'user_seconds': sum(usage['user_seconds'] for usage in hostUsages),
+                    'system_seconds': sum(usage['system_seconds'] for usage in hostUsages),
+                    'cpu_cores': cpuSeconds / totals['duration'] if totals['duration'] > 0 else 0.0,
+                    'throttled_seconds': sum(usage['throttled_seconds'] for usage in hostUsages),
+                    'memory_peak_bytes': totals['memory_peak'],
+                    'memory_mean_bytes': sum(usage['memory_mean_bytes'] for usage in hostUsages),
+                    'io_read_bytes': sum(usage['io_read_bytes'] for usage in hostUsages),
+                    'io_write_bytes': sum(usage['io_write_bytes'] for usage in hostUsages)
+                }
+
+        return summary
+
+    def writeSummary(self):
+        with open(os.path.join(self.outputDir, SUMMARY_FILE), "w") as summaryFile:
+            json.dump(self.summary(), summaryFile, indent=2, sort_keys=True)
+
+    def logReport(self):
+        summary = self.summary()
+        for phase in [name for name, start, end in self.timeline.phases]:
+            if phase not in summary:
+                continue
+
+            total = summary.pop(phase)['total']
+            logging.info("Resources during {}: {:.2f} cores, peak memory {:.1f} MiB, "
+                         "I/O {:.1f} MiB read, {:.1f} MiB written".format(
+                             phase, total['cpu_cores'], total['memory_peak_bytes'] / 1048576.0,
+                             total['io_read_bytes'] / 1048576.0, total['io_write_bytes'] / 1048576.0))
@@ -0,0 +1,134 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import re
+
+from ndn import fan_out
+
+# Commands are joined into one shell line; keep it under the pty's canonical line limit (4096)
+MAX_LINE_LENGTH = 3800
+
+# Each command is followed by a marker line: \x02<index> <exit status> [<pid>]
+_MARKER_RE = re.compile(r'\x02(\d+) (-?\d+)(?: (\d+))?\r?\n')
+# Job control notices printed by the interactive shell for backgrounded commands
+_JOB_RE = re.compile(r'\[\d+\]\+?\s+(?:\d+|Done.*|Exit.*)\r?\n')
+
+class CommandResult(object):
+    def __init__(self, cmd, output='', status=None, pid=None):
+        self.cmd = cmd
+        self.output = output
+        self.status = status
+        self.pid = pid
+
+    def __repr__(self):
+        return 'cmd: {} status: {} pid: {}'.format(self.cmd, self.status, self.pid)
+
+
+def _is_background(cmd):
+    cmd = cmd.rstrip()
+    return cmd.endswith('&') and not cmd.endswith('&&')
+
+def _wrap(index, cmd):
+    cmd = cmd.strip()
+    if _is_background(cmd):
+        # Launch status is 0; the PID comes from $! of the launched command
+        return "{} printf '\\002%d 0 %d\\n' {} $!;".format(cmd, index)
+    else:
+        return "{}; printf '\\002%d %d\\n' {} $?;".format(cmd.rstrip(';'), index)
+
+def build_lines(commands):
+    "Join commands, each followed by its marker, into as few shell lines as possible"
+    lines = []
+    current = []
+    length = 0
+
+    for index, cmd in enumerate(commands):
+        wrapped = _wrap(index, cmd)
+        if len(current) > 0 and length + len(wrapped) + 1 > MAX_LINE_LENGTH:
+            lines.append(' '.join(current))
+            current = []
+            length = 0
+
+        current.append(wrapped)
+        length += len(wrapped) + 1
+
+    if len(current) > 0:
+        lines.append(' '.join(current))
+
+    return lines
+
+def parse_output(commands, output, results=None):
+    "Split the output of one or more batch lines into per-command results"
+    if results is None:
+        results = [CommandResult(cmd) for cmd in commands]
+
+    output = _JOB_RE.sub('', output)
+
+    # re.split with three groups gives [text, index, status, pid, text, index, ...]
+    parts = _MARKER_RE.split(output)
+    for i in range(1, len(parts) - 1, 4):
+        result = results[int(parts[i])]
+        result.output = parts[i - 1].replace('\r\n', '\n')
+        result.status = int(parts[i + 1])
+        if parts[i + 2] is not None:
+            result.pid = int(parts[i + 2])
+
+    return results
+
+def run(host, commands):
+    '''Send many commands to a host's shell with as few writes as possible.
+       Returns one CommandResult per command, in order, with its output, exit status
+       (launch status for commands ending in '&') and, for background commands, its PID.'''
+    results = [CommandResult(cmd) for cmd in commands]
+
+    for line in build_lines(commands):
+        output = host.cmd(line)
+        if output is not None:
+            parse_output(commands, output, results)
+
+    return results
+
+def run_all(hostCommands):
+    '''Run a list of commands on each host, all hosts concurrently.
+       hostCommands: dict of host -> list of commands.
+       Returns a dict of host name -> list of CommandResult.'''
+    results = {}
+    hostLines = {}
+    for host, commands in hostCommands.items():
+        results[host.name] = [CommandResult(cmd) for cmd in commands]
+        hostLines[host] = build_lines(commands)
+
+    # Round i sends the i-th line of every host that has one
+    i = 0
+    while True:
+        lines = dict((host.name, hostLines[host][i]) for host in hostLines if i < len(hostLines[host]))
+        if len(lines) == 0:
+            break
+
+        outputs = fan_out.run(hostLines.keys(), lines)
+        for host in hostLines:
+            if host.name in outputs:
+                parse_output(hostCommands[host], outputs[host.name], results[host.name])
+        i += 1
+
+    return results
@@ -0,0 +1,157 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from ndn import phases
+
+# Modules whose frames are skipped when looking for the code that issued a command
+_SKIPPED_MODULES = ('ndn_host', 'command_log', 'command_batch', 'fan_out')
+_SKIPPED_DIRS = (os.sep + 'mininet' + os.sep,)
+
+_QUOTED = re.compile(r"'[^']*'|\"[^\"]*\"")
+_URI = re.compile(r"\b[a-z0-9]+://\S+")
+_PATH = re.compile(r"(?<![\w.-])/\S*")
+_NUMBER = re.compile(r"\b\d+(\.\d+)*\b")
+_SPACES = re.compile(r"\s+")
+
+MAX_TEMPLATE_WORDS = 8
+
+def command_template(command, hostName=None):
+    '''Reduce a command to a template shared by its repetitions on every node, e.g.
+       "nfdc face create udp://1.0.0.2" to "nfdc face create <uri>". Quoted strings, URIs,
+       paths and NDN names, numbers and the host's name are replaced by placeholders.'''
+    template = command.strip()
+    if hostName:
+        template = re.sub(r"\b{}\b".format(re.escape(hostName)), '<host>', template)
+    template = _QUOTED.sub("'...'", template)
+    template = _URI.sub('<uri>', template)
+    template = _PATH.sub('<path>', template)
+    template = _NUMBER.sub('N', template)
+
+    words = _SPACES.split(template)
+    if len(words) > MAX_TEMPLATE_WORDS:
+        words = words[:MAX_TEMPLATE_WORDS] + ['...']
+    return ' '.join(words)
+
+def caller_site(depth=1):
+    "Return file:line(function) of the first frame outside of Mininet and the command helpers"
+    frame = sys._getframe(depth)
+    while frame is not None:
+        fileName = frame.f_code.co_filename
+        if (os.path.splitext(os.path.basename(fileName))[0] not in _SKIPPED_MODULES and
+                not any(directory in fileName for directory in _SKIPPED_DIRS)):
+            path = os.path.join(*fileName.split(os.sep)[-2:])
+            return "{}:{}({})".format(path, frame.f_lineno, frame.f_code.co_name)
+        frame = frame.f_back
+    return '?'
+
+class Command(object):
+    "A command sent to a node's shell, completed when the shell returns the prompt"
+    def __init__(self, host, command, caller, phase, timestamp):
+        self.host = host
+        self.command = command
+        self.caller = caller
+        self.phase = phase
+        self.timestamp = timestamp
+        self.latency = None
+        self.outputSize = 0
+
+    def finish(self):
+        self.latency = time.time() - self.timestamp
+
+class CommandRecorder(object):
+    '''Records every command sent to the shell of the nodes (see NdnHostCommon.sendCmd()) with
+       its host, latency, output size, caller and phase, and aggregates them per command template.
+       The commands are kept in memory until write() is called.'''
+
+    def __init__(self, timeline=phases.timeline):
+        self.timeline = timeline
+        self.commands = []
+        self._lock = threading.Lock()
+
+    def begin(self, hostName, command):
+        record = Command(hostName, command, caller_site(2), self.timeline.current(), time.time())
+        with self._lock:
+            self.commands.append(record)
+        return record
+
+    def aggregate(self):
+        '''Return [template, count, total latency, max latency, output bytes, {caller: count}]
+           per command template, by decreasing total latency. Unfinished commands count with no latency.'''
+        with self._lock:
+            commands = list(self.commands)
+
+        templates = {}
+        for record in commands:
+            template = command_template(record.command, record.host)
+            entry = templates.setdefault(template, [template, 0, 0.0, 0.0, 0, {}])
+            entry[1] += 1
+            entry[4] += record.outputSize
+            entry[5][record.caller] = entry[5].get(record.caller, 0) + 1
+            if record.latency is not None:
+                entry[2] += record.latency
+                entry[3] = max(entry[3], record.latency)
+
+        return sorted(templates.values(), key=lambda entry: entry[2], reverse=True)
+
+    def write(self, outputDir):
+        '''Write commands.log, one tab-separated line per command: timestamp, phase, host, latency,
+           output bytes, caller and command; and report.txt with the totals per command template'''
+        if not os.path.isdir(outputDir):
+            os.makedirs(outputDir)
+
+        with self._lock:
+            commands = list(self.commands)
+
+        with open(os.path.join(outputDir, 'commands.log'), 'w') as logFile:
+            for record in commands:
+                logFile.write("{:.6f}\t{}\t{}\t{}\t{}\t{}\t{}\n".format(
+                    record.timestamp, record.phase or '-', record.host,
+                    '-' if record.latency is None else '{:.6f}'.format(record.latency),
+                    record.outputSize, record.caller, record.command.replace('\n', ' ')))
+
+        with open(os.path.join(outputDir, 'report.txt'), 'w') as reportFile:
+            reportFile.write("{:>8} {:>10} {:>10} {:>10} {:>10}  {}\n".format(
+                'count', 'total (s)', 'mean (ms)', 'max (ms)', 'output', 'command'))
+            for template, count, total, maximum, outputSize, callers in self.aggregate():
+                reportFile.write("{:8d} {:10.3f} {:10.3f} {:10.3f} {:10d}  {}\n".format(
+                    count, total, total * 1000 / count, maximum * 1000, outputSize, template))
+                for caller, calls in sorted(callers.items(), key=lambda item: item[1], reverse=True):
+                    reportFile.write("{:>54}{} from {}\n".format('', calls, caller))
+
+    def logReport(self, count=5):
+        entries = self.aggregate()
+        total = sum(entry[2] for entry in entries)
+        logging.info("Shell commands: {} commands, {:.3f}s in total".format(
+            sum(entry[1] for entry in entries), total))
+        for template, calls, latency, maximum, outputSize, callers in entries[:count]:
+            logging.info("  {:.3f}s in {} x {}".format(latency, calls, template))
+
+# Recorder of the running emulation, set by minindn --record-commands
+recorder = None
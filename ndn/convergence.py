@@ -0,0 +1,101 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+import time
+
+from ndn import fan_out
+from ndn import fib
+
+DEFAULT_INTERVAL = 5
+
+STATUS_CMD = "nfd-status -b | grep /ndn/edu/"
+
+class ConvergenceWatcher(object):
+    '''Polls every unconverged node's FIB in parallel until each node has routes to every
+       other node's router name and /ndn/edu/<node> prefix, or the deadline passes.'''
+
+    def __init__(self, hosts, nodeNames, timeout, interval=DEFAULT_INTERVAL):
+        self.hosts = hosts
+        self.nodeNames = nodeNames
+        self.timeout = timeout
+        self.interval = interval
+
+        # Host name -> seconds from start() until its FIB was complete
+        self.convergenceTimes = {}
+
+    def expectedPrefixes(self, host):
+        "Every other node's router name and advertised prefix"
+        # NLSR installs no route to its own router name, only to other routers' names
+        expected = set("/ndn/edu/%C1.Router/cs/" + node for node in self.nodeNames if node != host.name)
+        expected.update("/ndn/edu/" + node for node in self.nodeNames if node != host.name)
+        return expected
+
+    def isHostConverged(self, host, status):
+        return len(fib.parse(status).missing(self.expectedPrefixes(host))) == 0
+
+    def run(self):
+        "Returns True if every node converged before the deadline"
+        start_time = time.time()
+        deadline = start_time + self.timeout
+        pending = list(self.hosts)
+
+        while True:
+            poll_time = time.time()
+            status = fan_out.run(pending, STATUS_CMD, timeout=max(deadline - poll_time, self.interval))
+
+            for host in list(pending):
+                if self.isHostConverged(host, status.get(host.name, '')):
+                    self.convergenceTimes[host.name] = time.time() - start_time
+                    pending.remove(host)
+
+            if len(pending) == 0 or time.time() >= deadline:
+                break
+
+            time.sleep(max(0, min(poll_time + self.interval, deadline) - time.time()))
+
+        self.logReport()
+        return len(pending) == 0
+
+    def isConverged(self, host):
+        return host.name in self.convergenceTimes
+
+    def writeResults(self):
+        for host in self.hosts:
+            with open(os.path.join(host.homeFolder, "convergence-result"), "w") as resultFile:
+                resultFile.write(str(self.isConverged(host)) + "\n")
+
+            if self.isConverged(host):
+                with open(os.path.join(host.homeFolder, "convergence-time"), "w") as timeFile:
+                    timeFile.write("{:.3f}\n".format(self.convergenceTimes[host.name]))
+
+    def logReport(self):
+        times = self.convergenceTimes.values()
+        if len(times) > 0:
+            logging.info("{}/{} node(s) converged; mean {:.1f}s, slowest {:.1f}s".format(
+                len(times), len(self.hosts), sum(times) / len(times), max(times)))
+
+        unconverged = [host.name for host in self.hosts if not self.isConverged(host)]
+        if len(unconverged) > 0:
+            logging.warning("Not converged after {}s: {}".format(self.timeout, ', '.join(unconverged)))
@@ -21,102 +21,239 @@
 # along with Mini-NDN, e.g., in COPYING.md file.
 # If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import time
-import sys
 from itertools import cycle
 
-import nfd
 from ndn import ExperimentManager
+from ndn import nfd
+from ndn import phases
+from ndn import ping_results
+from ndn import tracing
+from ndn.bring_up import BringUp
+from ndn.convergence import ConvergenceWatcher, DEFAULT_INTERVAL
+from ndn.route_recorder import RouteRecorder
+from ndn.apps import ndn_traffic
 from ndn.apps import ndnping
 from ndn.apps import ndnpingserver
 
+TRAFFIC_APP_NDNPING = 'ndnping'
+TRAFFIC_APP_NDN_TRAFFIC = 'ndn-traffic'
+TRAFFIC_APPS = [
+    TRAFFIC_APP_NDNPING,
+    TRAFFIC_APP_NDN_TRAFFIC
+]
+
 class Experiment:
 
+    class Error(Exception):
+        def __init__(self, what):
+            self.what = what
+        def __str__(self):
+            return repr(self.what)
+
     def __init__(self, args):
         self.net = args["net"]
         self.nodes = args["nodes"]
         self.convergenceTime = args["ctime"]
+        self.convergenceInterval = args.get("convergenceInterval", DEFAULT_INTERVAL)
         self.nPings = args["nPings"]
         self.strategy = args.get("strategy", nfd.STRATEGY_BEST_ROUTE)
         self.pctTraffic = float(args["pctTraffic"])
+        self.pingJitter = float(args.get("pingJitter", 0))
+        self.trafficApp = args.get("trafficApp", TRAFFIC_APP_NDNPING)
+        self.workDir = args.get("workDir", "/tmp")
+
+        # Set by experiments that change the topology, e.g. by failing nodes, to record
+        # how every node's FIB and RIB change while run() executes (see ndn.route_recorder)
+        self.recordRoutes = False
+        self.routeRecordInterval = float(args.get("routeRecordInterval", 1))
+        self.routeRecorder = None
+
+        # (host, destination hosts, log file) of every traffic client started
+        self.trafficClients = []
+
+        # Set with setProcessSampler() to sample the processes started by the experiment
+        self.processSampler = None
+        self.pingServerPids = {}
+
+        # (earliest, latest) start time of the ping clients of each schedulePings() call,
+        # also written to <workDir>/ping-data/launch-windows.txt for ndn.ping_results
+        self.pingLaunchWindows = []
 
         # Used to restart pings on the recovered node if any
         self.pingedDict = {}
 
+        # Host name -> seconds until the host's FIB was complete
+        self.convergenceTimes = {}
+
+        # Set once the per-host setup stages are scheduled, either by setup() or on a shared BringUp
+        self.isHostSetupDone = False
+
 
     def start(self):
         self.setup()
-        self.run()
 
-    def setup(self):
-        for host in self.net.hosts:
-            # Set strategy
-            host.nfd.setStrategy("/ndn/edu", self.strategy)
+        phases.enter(phases.TRAFFIC)
+        if self.recordRoutes:
+            self.startRouteRecorder()
 
-            # Start ping server
-            ndnpingserver.start(host, '/ndn/edu/{}'.format(host), log_file='ping-server')
+        try:
+            with tracing.span('traffic'):
+                self.run()
+        finally:
+            self.stopRouteRecorder()
 
-            # Create folder to store ping data
-            host.cmd("mkdir ping-data")
+        if len(self.trafficClients) > 0:
+            self.splitTrafficLogs()
 
-        # Wait for convergence time period
-        print "Waiting " + str(self.convergenceTime) + " seconds for convergence..."
-        time.sleep(self.convergenceTime)
-        print "...done"
+    def startRouteRecorder(self):
+        self.routeRecorder = RouteRecorder(os.path.join(self.workDir, 'route-history'),
+                                           self.routeRecordInterval, nfdVersion=nfd.VERSION)
+        self.routeRecorder.addHosts(self.net.hosts)
+        self.routeRecorder.sample()
+        self.routeRecorder.start()
+
+    def stopRouteRecorder(self):
+        if self.routeRecorder is not None:
+            self.routeRecorder.stop()
+            self.routeRecorder.logReport()
+            self.routeRecorder = None
 
-        # To check whether all the nodes of NLSR have converged
-        didNlsrConverge = True
+    def setupStrategy(self, host):
+        host.nfd.setStrategy("/ndn/edu", self.strategy)
+
+    def startPingServer(self, host):
+        ndnpingserver.start(host, '/ndn/edu/{}'.format(host), log_file='ping-server')
+        self.pingServerPids[host.name] = host.lastPid
+        self.monitorProcess(host.lastPid, '{}-ndnpingserver'.format(host.name))
 
-        # Checking for convergence
+    def setProcessSampler(self, processSampler):
+        self.processSampler = processSampler
+        for name, pid in self.pingServerPids.items():
+            self.monitorProcess(pid, '{}-ndnpingserver'.format(name))
+
+    def monitorProcess(self, processId, processName):
+        if self.processSampler is not None and processId is not None:
+            self.processSampler.add(processId, processName)
+
+    def makePingDataFolders(self):
         for host in self.net.hosts:
-            statusRouter = host.cmd("nfd-status -b | grep /ndn/edu/%C1.Router/cs/")
-            statusPrefix = host.cmd("nfd-status -b | grep /ndn/edu/")
-            didNodeConverge = True
-            for node in self.nodes.split(","):
-                    if ("/ndn/edu/%C1.Router/cs/" + node) not in statusRouter:
-                        didNodeConverge = False
-                        didNlsrConverge = False
-                    if str(host) != node and ("/ndn/edu/" + node) not in statusPrefix:
-                        didNodeConverge = False
-                        didNlsrConverge = False
-
-            host.cmd("echo " + str(didNodeConverge) + " > convergence-result &")
+            pingDataFolder = os.path.join(host.homeFolder, 'ping-data')
+            if not os.path.isdir(pingDataFolder):
+                os.mkdir(pingDataFolder)
+
+    def addSetupStages(self, bringUp):
+        # Create folders to store ping data
+        self.makePingDataFolders()
+
+        bringUp.addStage('strategy', self.setupStrategy, requires=('nlsr',))
+        bringUp.addStage('ndnpingserver', self.startPingServer, requires=('strategy',))
+        self.isHostSetupDone = True
+
+    def setup(self):
+        if self.isHostSetupDone is False:
+            bringUp = BringUp(self.net.hosts)
+            self.addSetupStages(bringUp)
+            bringUp.run()
+
+        # Wait until every node's FIB is complete, for at most the convergence time
+        phases.enter(phases.CONVERGENCE)
+        print "Waiting up to " + str(self.convergenceTime) + " seconds for convergence..."
+        watcher = ConvergenceWatcher(self.net.hosts, self.nodes.split(","),
+                                     self.convergenceTime, self.convergenceInterval)
+        with tracing.span('convergence'):
+            didNlsrConverge = watcher.run()
+        watcher.writeResults()
+        self.convergenceTimes = watcher.convergenceTimes
+        print "...done"
 
         if didNlsrConverge:
             print("NLSR has successfully converged.")
         else:
-            print("NLSR has not converged. Exiting...")
-            self.net.stop()
-            sys.exit(1)
+            raise Experiment.Error("NLSR has not converged after {} seconds".format(self.convergenceTime))
 
     def ping(self, source, dest, nPings):
-        # Use "&" to run in background and perform parallel pings
-        print "Scheduling ping(s) from %s to %s" % (source.name, dest.name)
-        ping_args = {
-            'print_timestamp': True,
-            'count': nPings,
-            'log_file': 'ping-data/{}.txt'.format(dest.name)
-        }
-        ndnping.ping(source, "/ndn/edu/{}".format(dest.name), **ping_args)
-        time.sleep(0.2)
+        self.schedulePings({source: [dest]}, nPings)
+
+    def schedulePings(self, destinations, nPings):
+        '''Start pings from every host in destinations (host -> list of hosts to ping)
+           with one batch of commands per host, all hosts concurrently'''
+        nPairs = sum(len(dests) for dests in destinations.values())
+        print "Scheduling %d ping(s) from %d node(s)" % (nPairs, len(destinations))
+
+        start_time = time.time()
+        if self.trafficApp == TRAFFIC_APP_NDN_TRAFFIC:
+            self.startTrafficClients(destinations, nPings)
+        else:
+            schedule = {}
+            for source, dests in destinations.items():
+                schedule[source] = [("/ndn/edu/{}".format(dest.name), 'ping-data/{}.txt'.format(dest.name))
+                                    for dest in dests]
+            results = ndnping.ping_all(schedule, jitter=self.pingJitter, print_timestamp=True, count=nPings)
+            for source, dests in destinations.items():
+                for dest, result in zip(dests, results[source.name]):
+                    self.monitorProcess(result.pid, '{}-ndnping-{}'.format(source.name, dest.name))
+        end_time = time.time()
+
+        # Clients start within [start_time, end_time + jitter]
+        self.pingLaunchWindows.append((start_time, end_time + self.pingJitter))
+        ping_results.write_launch_window(self.workDir, start_time, end_time + self.pingJitter)
+        print "...launched in %.3f seconds" % (end_time - start_time)
+
+    def startTrafficClients(self, destinations, nPings):
+        "Start a single ndn-traffic-client per source host for all of its destinations"
+        schedule = {}
+        for source, dests in destinations.items():
+            if len(dests) == 0:
+                continue
+
+            n = len([client for client in self.trafficClients if client[0] == source])
+            logFile = 'ping-data/traffic-{}.log'.format(n)
+            schedule[source] = (["/ndn/edu/{}".format(dest.name) for dest in dests],
+                                'traffic-client-{}.conf'.format(n), logFile)
+            self.trafficClients.append((source, dests, logFile))
+
+        try:
+            results = ndn_traffic.start_all(schedule, jitter=self.pingJitter, count=nPings)
+        except ValueError as e:
+            raise Experiment.Error(str(e))
+
+        for source in schedule:
+            self.monitorProcess(results[source.name][0].pid, '{}-ndn-traffic-client'.format(source.name))
+
+    def splitTrafficLogs(self):
+        "Write each traffic client's log lines to ping-data/<dest>-traffic.txt"
+        for source, dests, logFile in self.trafficClients:
+            outputFiles = [os.path.join(source.homeFolder, 'ping-data', '{}-traffic.txt'.format(dest.name))
+                           for dest in dests]
+            ndn_traffic.split_log(os.path.join(source.homeFolder, logFile), outputFiles)
 
     def startPings(self):
+        destinations = {}
         for host in self.net.hosts:
-            for other in self.net.hosts:
-                # Do not ping self
-                if host.name != other.name:
-                    self.ping(host, other, self.nPings)
+            # Do not ping self
+            destinations[host] = [other for other in self.net.hosts if host.name != other.name]
+
+        self.schedulePings(destinations, self.nPings)
 
     def failNode(self, host):
         print("Bringing %s down" % host.name)
+        phases.enter(phases.FAILURE)
+        tracing.instant('fail', track=host.name)
         host.nfd.stop()
 
     def recoverNode(self, host):
         print("Bringing %s up" % host.name)
+        phases.enter(phases.RECOVERY)
+        tracing.instant('recover', track=host.name)
         host.nfd.start()
         host.nlsr.start()
         host.nfd.setStrategy("/ndn/edu", self.strategy)
-        ndnpingserver.start(host, '/ndn/edu/{}'.format(host), log_file='ping-server')
+        self.startPingServer(host)
+
+        self.monitorProcess(host.nfd.processId, '{}-nfd'.format(host.name))
+        self.monitorProcess(host.nlsr.processId, '{}-nlsr'.format(host.name))
 
     def startPctPings(self):
         nNodesToPing = int(round(len(self.net.hosts)*self.pctTraffic))
@@ -139,7 +276,6 @@ class Experiment:
 
                 # Do not ping self
                 if host.name != other.name:
-                    self.ping(host, other, self.nPings)
                     nodesPingedList.append(other)
 
                 # Always increment because in 100% case a node should not ping itself
@@ -148,6 +284,8 @@ class Experiment:
             self.pingedDict[host] = nodesPingedList
             nodesPingedList = []
 
+        self.schedulePings(self.pingedDict, self.nPings)
+
     @staticmethod
     def register(name, experimentClass):
         ExperimentManager.register(name, experimentClass)
@@ -35,6 +35,8 @@ class FailureExperiment(Experiment):
         self.PING_COLLECTION_TIME_BEFORE_FAILURE = 60
         self.PING_COLLECTION_TIME_AFTER_RECOVERY = 120
 
+        self.recordRoutes = True
+
     def run(self):
         self.startPctPings()
 
@@ -55,9 +57,8 @@ class FailureExperiment(Experiment):
             if host.name == "csu":
                 self.recoverNode(host)
 
-                for other in self.net.hosts:
-                    if host.name != other.name:
-                        self.ping(host, other, self.PING_COLLECTION_TIME_AFTER_RECOVERY)
+                others = [other for other in self.net.hosts if host.name != other.name]
+                self.schedulePings({host: others}, self.PING_COLLECTION_TIME_AFTER_RECOVERY)
 
         # Collect pings for more seconds after CSU is up
         time.sleep(self.PING_COLLECTION_TIME_AFTER_RECOVERY)
@@ -35,6 +35,8 @@ class FailureExperiment(Experiment):
         self.PING_COLLECTION_TIME_BEFORE_FAILURE = 60
         self.PING_COLLECTION_TIME_AFTER_RECOVERY = 120
 
+        self.recordRoutes = True
+
     def getMostConnectedNode(self):
         mcn = max(self.net.hosts, key=lambda host: len(host.intfNames()))
         print "The most connected node is: %s" % mcn.name
@@ -58,8 +60,8 @@ class FailureExperiment(Experiment):
         self.recoverNode(mostConnectedNode)
 
         # Restart pings
-        for nodeToPing in self.pingedDict[mostConnectedNode]:
-            self.ping(mostConnectedNode, nodeToPing, self.PING_COLLECTION_TIME_AFTER_RECOVERY)
+        self.schedulePings({mostConnectedNode: self.pingedDict[mostConnectedNode]},
+                           self.PING_COLLECTION_TIME_AFTER_RECOVERY)
 
         # Collect pings for more seconds after MCN is up
         time.sleep(self.PING_COLLECTION_TIME_AFTER_RECOVERY)
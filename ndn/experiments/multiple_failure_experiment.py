@@ -43,6 +43,7 @@ class MultipleFailureExperiment(Experiment):
         args["nPings"] = nInitialPings
 
         Experiment.__init__(self, args)
+        self.recordRoutes = True
 
     def run(self):
         self.startPctPings()
@@ -73,8 +74,7 @@ class MultipleFailureExperiment(Experiment):
             print("Scheduling with %s remaining pings" % nPings)
 
             # Restart pings
-            for nodeToPing in self.pingedDict[host]:
-                self.ping(host, nodeToPing, nPings)
+            self.schedulePings({host: self.pingedDict[host]}, nPings)
 
             time.sleep(self.RECOVERY_INTERVAL - recovery_time)
 
@@ -0,0 +1,79 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import select
+import time
+
+def _command_for(host, command):
+    if callable(command):
+        return command(host)
+    elif isinstance(command, dict):
+        return command.get(host.name)
+    return command
+
+def run(hosts, command, timeout=None):
+    '''Run a command on every host concurrently and return the outputs keyed by host name.
+       command: a string for all hosts, a dict of host name -> string, or a callable taking
+       the host and returning its string. Hosts mapped to None are skipped.
+       timeout: seconds to wait before interrupting hosts that have not finished.'''
+    outputs = {}
+    pending = {}
+    poller = select.poll()
+
+    for host in hosts:
+        cmd = _command_for(host, command)
+        if cmd is None:
+            continue
+
+        host.sendCmd(cmd)
+        outputs[host.name] = ''
+        fd = host.stdout.fileno()
+        pending[fd] = host
+        poller.register(fd, select.POLLIN)
+
+    deadline = None if timeout is None else time.time() + timeout
+
+    while len(pending) > 0:
+        if deadline is None:
+            events = poller.poll()
+        else:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            events = poller.poll(remaining * 1000)
+
+        for fd, event in events:
+            host = pending[fd]
+            outputs[host.name] += host.monitor(timeoutms=0)
+            if not host.waiting:
+                poller.unregister(fd)
+                del pending[fd]
+
+    # Interrupt whatever did not finish in time so the shells can be reused
+    for host in pending.values():
+        logging.warning("Command on {} timed out after {}s".format(host.name, timeout))
+        host.sendInt()
+        outputs[host.name] += host.waitOutput()
+
+    return outputs
@@ -0,0 +1,76 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import re
+
+# FIB lines of `nfd-status -b` and `nfdc fib list`:
+#   /ndn/edu/%C1.Router/cs/b nexthops={faceid=262 (cost=10), faceid=263 (cost=20)}
+_ENTRY_RE = re.compile(r'^\s*(\S+)\s+nexthops=\{(.*)\}\s*$')
+_NEXTHOP_RE = re.compile(r'faceid=(\d+)\s+\(cost=(\d+)\)')
+
+class Fib(object):
+    "A node's FIB: name prefix -> {face id: cost}"
+
+    def __init__(self, entries=None):
+        self.entries = entries if entries is not None else {}
+
+    def __contains__(self, prefix):
+        return prefix in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __eq__(self, other):
+        return isinstance(other, Fib) and self.entries == other.entries
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return 'Fib({})'.format(self.entries)
+
+    def prefixes(self):
+        return set(self.entries)
+
+    def nexthops(self, prefix):
+        return self.entries.get(prefix, {})
+
+    def missing(self, expectedPrefixes):
+        "Return the expected prefixes that have no FIB entry"
+        return set(expectedPrefixes).difference(self.entries)
+
+
+def parse(output):
+    "Parse the FIB lines of nfd-status or nfdc output; other lines (e.g. RIB routes) are ignored"
+    entries = {}
+    for line in output.splitlines():
+        match = _ENTRY_RE.match(line)
+        if match is None:
+            continue
+
+        nexthops = {}
+        for face_id, cost in _NEXTHOP_RE.findall(match.group(2)):
+            nexthops[int(face_id)] = int(cost)
+        entries[match.group(1)] = nexthops
+
+    return Fib(entries)
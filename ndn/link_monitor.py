@@ -0,0 +1,231 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import glob
+import json
+import logging
+import os
+import struct
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ndn.sampler import DEFAULT_FLUSH_INTERVAL, PeriodicSampler, append_records
+
+# Cumulative counters of both directions of a link, stored as fixed-width little-endian
+# records in <link>.linkstat files; ab is from the link's first node to the second one
+RECORD_FIELDS = ['timestamp', 'ab_bytes', 'ab_packets', 'ab_drops', 'ba_bytes', 'ba_packets', 'ba_drops']
+RECORD_STRUCT = struct.Struct('<d6Q')
+FILE_SUFFIX = '.linkstat'
+LINKS_FILE = 'links.json'
+
+def parse_net_dev(netDev):
+    '''Parse /proc/<pid>/net/dev into a dict of interface ->
+       (rx bytes, rx packets, rx drops, tx bytes, tx packets, tx drops)'''
+    counters = {}
+    for line in netDev.splitlines()[2:]:
+        name, _, values = line.partition(':')
+        values = values.split()
+        if len(values) < 12:
+            continue
+        counters[name.strip()] = (int(values[0]), int(values[1]), int(values[3]),
+                                  int(values[8]), int(values[9]), int(values[11]))
+    return counters
+
+def link_name(node1, node2):
+    return "{}:{}".format(node1, node2)
+
+def find_links(net, links_conf):
+    '''Join the links of net with their LinkConfig (see minindn.config).
+       Returns a list of dicts with the link name, its nodes, interfaces and configured parameters.'''
+    configs = {}
+    for link_conf in links_conf:
+        configs.setdefault(frozenset((link_conf.host1, link_conf.host2)), []).append(link_conf)
+
+    links = []
+    for link in net.links:
+        node1, node2 = link.intf1.node, link.intf2.node
+        candidates = configs.get(frozenset((node1.name, node2.name)), [])
+        link_conf = candidates.pop(0) if len(candidates) > 0 else None
+
+        name = link_name(node1.name, node2.name)
+        if any(other['name'] == name for other in links):
+            name = "{}#{}".format(name, len([other for other in links if other['name'].startswith(name)]))
+
+        links.append({
+            'name': name,
+            'node1': node1.name,
+            'node2': node2.name,
+            'intf1': link.intf1.name,
+            'intf2': link.intf2.name,
+            'params': dict(link_conf.link_dict) if link_conf is not None else {}
+        })
+
+    return links
+
+def load_series(outputDir):
+    '''Load the samples written by LinkSampler as rates.
+       Returns a dict of link name -> dict of NumPy arrays: timestamp, and for each direction
+       (ab, ba) the bits, packets and drops per second and, if the link has a bandwidth,
+       the utilization (0 to 1) of the configured bandwidth.'''
+    if numpy is None:
+        raise ImportError("NumPy is required to load link samples")
+
+    with open(os.path.join(outputDir, LINKS_FILE)) as linksFile:
+        links = dict((link['name'], link) for link in json.load(linksFile))
+
+    dtype = numpy.dtype([('timestamp', '<f8')] + [(field, '<u8') for field in RECORD_FIELDS[1:]])
+    series = {}
+    for path in glob.glob(os.path.join(outputDir, '*' + FILE_SUFFIX)):
+        name = os.path.basename(path)[:-len(FILE_SUFFIX)]
+        records = numpy.fromfile(path, dtype=dtype)
+        if len(records) < 2:
+            continue
+
+        elapsed = numpy.diff(records['timestamp'])
+        rates = {'timestamp': records['timestamp'][1:]}
+        for direction in ('ab', 'ba'):
+            for counter in ('bytes', 'packets', 'drops'):
+                delta = numpy.diff(records['{}_{}'.format(direction, counter)].astype(numpy.int64))
+                rates['{}_{}'.format(direction, counter)] = delta / elapsed
+            rates['{}_bps'.format(direction)] = rates.pop('{}_bytes'.format(direction)) * 8
+
+            bw = links.get(name, {}).get('params', {}).get('bw')
+            if bw:
+                rates['{}_utilization'.format(direction)] = rates['{}_bps'.format(direction)] / (float(bw) * 1e6)
+
+        series[name] = rates
+
+    return series
+
+class LinkSampler(PeriodicSampler):
+    '''Samples the interface counters of both ends of every link from a single thread.
+       The counters of all the interfaces of a node are read at once from /proc/<pid>/net/dev,
+       which, unlike /sys/class/net, shows the interfaces of the node's network namespace.
+       Samples are appended to <outputDir>/<link>.linkstat as fixed-width records
+       (see RECORD_FIELDS); use load_series() to get the rates and utilization.'''
+
+    def __init__(self, outputDir, interval=1, flushInterval=DEFAULT_FLUSH_INTERVAL):
+        PeriodicSampler.__init__(self, outputDir, interval, flushInterval)
+
+        # Link descriptions, see find_links()
+        self.links = []
+        # node name -> pid of a process in the node's network namespace
+        self.nodePids = {}
+
+        # link name -> buffered records
+        self._buffers = {}
+        # link name -> (timestamp, counters) of the first and last samples
+        self._first = {}
+        self._last = {}
+        # link name -> highest (ab, ba) rate in bits per second
+        self._peaks = {}
+
+    def addLinks(self, net, links_conf):
+        for node in net.hosts + net.switches:
+            self.nodePids[node.name] = node.pid
+
+        with self._lock:
+            self.links = find_links(net, links_conf)
+
+        with open(os.path.join(self.outputDir, LINKS_FILE), "w") as linksFile:
+            json.dump(self.links, linksFile, indent=2, sort_keys=True)
+
+    def sample(self):
+        with self._lock:
+            links = list(self.links)
+
+        currentTime = time.time()
+        interfaces = {}
+        for nodeName in set([link['node1'] for link in links] + [link['node2'] for link in links]):
+            try:
+                with open("/proc/{}/net/dev".format(self.nodePids[nodeName])) as netDev:
+                    interfaces[nodeName] = parse_net_dev(netDev.read())
+            except (IOError, KeyError) as e:
+                logging.debug("Cannot read the interfaces of {}: {}".format(nodeName, e))
+
+        samples = []
+        for link in links:
+            end1 = interfaces.get(link['node1'], {}).get(link['intf1'])
+            end2 = interfaces.get(link['node2'], {}).get(link['intf2'])
+            if end1 is None or end2 is None:
+                continue
+
+            # Sent by one end; dropped when sent by one end or when received by the other
+            counters = (end1[3], end1[4], end1[5] + end2[2], end2[3], end2[4], end2[5] + end1[2])
+            samples.append((link['name'], counters))
+
+        with self._lock:
+            for name, counters in samples:
+                self._buffers.setdefault(name, bytearray()).extend(RECORD_STRUCT.pack(currentTime, *counters))
+                self._first.setdefault(name, (currentTime, counters))
+
+                last = self._last.get(name)
+                self._last[name] = (currentTime, counters)
+                if last is not None and currentTime > last[0]:
+                    rates = [(counters[i] - last[1][i]) * 8 / (currentTime - last[0]) for i in (0, 3)]
+                    peaks = self._peaks.get(name, (0, 0))
+                    self._peaks[name] = (max(peaks[0], rates[0]), max(peaks[1], rates[1]))
+
+    def flush(self):
+        with self._lock:
+            buffers = self._buffers
+            self._buffers = {}
+
+        for name, records in buffers.items():
+            append_records("{}/{}{}".format(self.outputDir, name, FILE_SUFFIX), records)
+
+    def summary(self):
+        '''Return link name -> peak rate (bits per second) and peak utilization (None without
+           a configured bandwidth) in the busiest direction, and drops in both directions'''
+        with self._lock:
+            summary = {}
+            for link in self.links:
+                name = link['name']
+                if name not in self._last:
+                    continue
+
+                peak = max(self._peaks.get(name, (0, 0)))
+                drops = [self._last[name][1][i] - self._first[name][1][i] for i in (2, 5)]
+                bw = link['params'].get('bw')
+                summary[name] = {
+                    'peak_bps': peak,
+                    'peak_utilization': peak / (float(bw) * 1e6) if bw else None,
+                    'drops': sum(drops)
+                }
+            return summary
+
+    def logReport(self, count=5):
+        summary = self.summary()
+        if len(summary) == 0:
+            return
+
+        busiest = sorted(summary.items(), key=lambda item: (item[1]['peak_utilization'], item[1]['peak_bps']),
+                         reverse=True)[:count]
+        for name, link in busiest:
+            utilization = "" if link['peak_utilization'] is None else " ({:.0%})".format(link['peak_utilization'])
+            logging.info("Link {}: peak {:.2f} Mbps{}, {} drops".format(
+                name, link['peak_bps'] / 1e6, utilization, link['drops']))
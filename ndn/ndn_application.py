@@ -38,7 +38,13 @@ class NdnApplication:
 
         if self.isRunning is False:
             self.node.cmd(command)
-            self.processId = self.node.cmd("echo $!")[:-1]
+
+            # Mininet reports the PID of a command ending in '&' in the same round trip
+            lastPid = getattr(self.node, 'lastPid', None)
+            if lastPid is not None:
+                self.processId = str(lastPid)
+            else:
+                self.processId = self.node.cmd("echo $!")[:-1]
 
             self.isRunning = True
 
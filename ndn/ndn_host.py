@@ -58,7 +58,12 @@
 #   advertising or publicity pertaining to the Software or any derivatives
 #   without specific, written prior permission.
 
+import logging
+import os
+
 from mininet.node import CPULimitedHost, Host, Node
+from mininet.util import ipStr, ipParse
+from ndn import command_batch, command_log
 from ndn.nfd import Nfd
 
 class AppsManager(object):
@@ -69,27 +74,104 @@ class AppsManager(object):
         }
         return apps[app_name]
 
+def make_home_folders(work_dir, host_names):
+    "Create every node's home folder from the orchestrator before the hosts are built"
+    for name in host_names:
+        home_folder = "%s/%s" % (work_dir, name)
+        if not os.path.isdir(home_folder):
+            os.makedirs(home_folder)
+
+def assign_ips(net, base="1.0.0.0"):
+    '''Give both ends of every host-to-host link an address of their own /30 subnet
+       so that neighbor nodes can communicate. This is one way of giving connectivity,
+       another way could be to insert a switch between each pair of neighbors.'''
+    switches = set(net.switches)
+    assigned = set()
+    for host in net.hosts:
+        for intf in host.intfList():
+            link = intf.link
+            node1, node2 = link.intf1.node, link.intf2.node
+
+            if node1 in switches or node2 in switches:
+                continue
+
+            if link.intf1 not in assigned and link.intf2 not in assigned:
+                assigned.add(link.intf1)
+                assigned.add(link.intf2)
+                node1.setIP(ipStr(ipParse(base) + 1) + '/30', intf=link.intf1)
+                node2.setIP(ipStr(ipParse(base) + 2) + '/30', intf=link.intf2)
+                base = ipStr(ipParse(base) + 4)
+
+def log_cmd_report(hosts):
+    counts = [(host.name, host.cmdCount) for host in hosts]
+    if len(counts) == 0:
+        return
+
+    total = sum(count for name, count in counts)
+    busiest = max(counts, key=lambda entry: entry[1])
+    logging.info("Shell commands: {} total, {:.1f} per host, at most {} ({})".format(
+        total, float(total) / len(counts), busiest[1], busiest[0]))
+
 class NdnHostCommon(object):
     "Common methods of NdnHost and CpuLimitedNdnHost"
 
     def __init__(self, name, **kwargs):
-        Host.__init__(self, name, **kwargs)
-        self.NodeClass = Node
-
-        # Create home directory for a node
-        self.homeFolder = "%s/%s" % (self.params['workdir'], self.name)
-        self.cmd("mkdir -p %s" % self.homeFolder)
-        self.cmd("cd %s" % self.homeFolder)
-
-        apps = kwargs.get('apps', [])
-        for app_params in apps:
+        # The home directory is normally created in bulk by make_home_folders(); it must
+        # exist before Host.__init__ since the shell is spawned in it (see _popen)
+        self.homeFolder = "%s/%s" % (kwargs['workdir'], name)
+        if not os.path.isdir(self.homeFolder):
+            os.makedirs(self.homeFolder)
+
+        # Number of commands sent to this node's shell (cmd() and sendCmd())
+        self.cmdCount = 0
+        # Command being recorded by command_log.recorder until the shell returns the prompt
+        self.pendingCmd = None
+
+        # CPULimitedHost.__init__ creates the node's cgroup
+        self.NodeClass.__init__(self, name, **kwargs)
+
+        # Apps are created here but started by the bring-up engine (see ndn.bring_up)
+        self.apps = []
+        for app_params in kwargs.get('apps', []):
             AppClass = AppsManager.get(app_params.name)
             app = AppClass(self)
-            setattr(self, app_params.name, app_params)
-            app.start()
+            setattr(self, app_params.name, app)
+            self.apps.append(app)
 
         self.peerList = {}
 
+    def _popen(self, cmd, **params):
+        "Spawn processes, including the node's shell, in the home folder with HOME set to it"
+        params.setdefault('cwd', self.homeFolder)
+        env = dict(params.get('env') or os.environ)
+        env['HOME'] = self.homeFolder
+        params['env'] = env
+        return self.NodeClass._popen(self, cmd, **params)
+
+    def sendCmd(self, *args, **kwargs):
+        self.cmdCount += 1
+        if command_log.recorder is not None:
+            # As in Mininet's Node.sendCmd(), a single list argument is the command's words
+            words = args[0] if len(args) == 1 and isinstance(args[0], list) else args
+            command = words if isinstance(words, str) else ' '.join(str(word) for word in words)
+            self.pendingCmd = command_log.recorder.begin(self.name, command)
+        return self.NodeClass.sendCmd(self, *args, **kwargs)
+
+    def monitor(self, *args, **kwargs):
+        "Read the shell's output; cmd() and waitOutput() as well as fan_out.run() go through here"
+        data = self.NodeClass.monitor(self, *args, **kwargs)
+        if self.pendingCmd is not None:
+            self.pendingCmd.outputSize += len(data)
+            if not self.waiting:
+                self.pendingCmd.finish()
+                self.pendingCmd = None
+        return data
+
+    def batch(self, commands):
+        '''Run many commands in as few shell round trips as possible.
+           Returns a list of command_batch.CommandResult (output, status, pid) in order.'''
+        return command_batch.run(self, commands)
+
     def config(self, app=None, cache=None, **params):
 
         r = self.NodeClass.config(self, **params)
@@ -101,8 +183,9 @@ class NdnHostCommon(object):
 
     def terminate(self):
         "Stop node."
-        self.nfd.stop()
-        Host.terminate(self)
+        for app in self.apps:
+            app.stop()
+        self.NodeClass.terminate(self)
 
     def buildPeerIp(self):
         for iface in self.intfList():
@@ -115,19 +198,18 @@ class NdnHostCommon(object):
                     self.peerList[node1.name] = link.intf1.node.IP(link.intf1)
 
 
-class NdnHost(Host, NdnHostCommon):
+class NdnHost(NdnHostCommon, Host):
     "NDNHost is a Host that always runs NFD"
+    NodeClass = Node
+
     def __init__(self, name, **kwargs):
-        Host.__init__(self, name, **kwargs)
         NdnHostCommon.__init__(self, name, **kwargs)
-        self.NodeClass = Node
 
 
-class CpuLimitedNdnHost(CPULimitedHost, NdnHostCommon):
+class CpuLimitedNdnHost(NdnHostCommon, CPULimitedHost):
     '''CPULimitedNDNHost is a Host that always runs NFD and extends CPULimitedHost.
        It should be used when one wants to limit the resources of NDN routers and hosts '''
+    NodeClass = CPULimitedHost
+
     def __init__(self, name, **kwargs):
-        Host.__init__(self, name, **kwargs)
         NdnHostCommon.__init__(self, name, **kwargs)
-        self.NodeClass = CPULimitedHost
-
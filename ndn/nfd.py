@@ -21,9 +21,11 @@
 # along with Mini-NDN, e.g., in COPYING.md file.
 # If not, see <http://www.gnu.org/licenses/>.
 
+import logging
 import os
 import re
 import shutil
+import socket
 import subprocess
 import time
 
@@ -33,6 +35,11 @@ from ndn.ndn_application import NdnApplication
 NFD_CONF_DIR = os.path.abspath('/usr/local/etc/ndn/')
 CONF_FILE = os.path.join(NFD_CONF_DIR, 'nfd.conf')
 SAMPLE_CONF_FILE = os.path.join(NFD_CONF_DIR, 'nfd.conf.sample')
+CLIENT_CONF_SAMPLE_FILE = os.path.join(MINI_NDN_INSTALL_DIR, 'client.conf.sample')
+
+# Upper bound on how long to wait for a forwarder to accept connections on its socket
+START_TIMEOUT = 10
+START_POLL_INTERVAL = 0.05
 
 STRATEGY_ACCESS         = 'access'
 STRATEGY_ASF            = 'asf'
@@ -50,9 +57,15 @@ STRATEGIES = [
 ]
 
 def _get_version():
-    output = subprocess.check_output('nfd --version', shell=True)
+    "Return the version of the installed NFD, or None if it cannot be run"
+    try:
+        with open(os.devnull, 'w') as devnull:
+            output = subprocess.check_output('nfd --version', shell=True, stderr=devnull)
+    except subprocess.CalledProcessError:
+        return None
+
     matches = re.match('([0-9]+\.[0-9]+\.[0-9]+)\-', output)
-    return matches.group(1)
+    return matches.group(1) if matches else None
 
 VERSION = _get_version()
 
@@ -74,13 +87,48 @@ def _create_conf_template_string():
 
 
 def setup():
+    if VERSION is None:
+        raise IOError("NFD cannot be found, is it installed and in the PATH?")
+
     _create_conf_template_string()
 
+def _is_socket_ready(sock_file):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(sock_file)
+        return True
+    except socket.error:
+        return False
+    finally:
+        sock.close()
+
+def log_startup_report(hosts):
+    times = [(host.name, host.nfd.startupTime) for host in hosts if host.nfd.startupTime is not None]
+    if len(times) == 0:
+        return
+
+    for name, startup_time in sorted(times, key=lambda entry: entry[1], reverse=True):
+        logging.debug("NFD startup on {}: {:.3f}s".format(name, startup_time))
+
+    slowest = max(times, key=lambda entry: entry[1])
+    total = sum(startup_time for name, startup_time in times)
+    logging.info("NFD startup: {} node(s), mean {:.3f}s, slowest {:.3f}s ({})".format(
+        len(times), total / len(times), slowest[1], slowest[0]))
+
+    failed = [host.name for host in hosts if host.nfd.isReady is False]
+    if len(failed) > 0:
+        logging.warning("NFD did not become ready on: {}".format(', '.join(failed)))
+
 class Nfd(NdnApplication):
     def __init__(self, node):
         NdnApplication.__init__(self, node)
 
         self.logLevel = node.params["params"].get("nfd-log-level", "NONE")
+        self.startTimeout = float(node.params["params"].get("nfd-start-timeout", START_TIMEOUT))
+
+        # Filled in by start(): seconds until the socket accepted a connection
+        self.startupTime = None
+        self.isReady = None
 
         self.confFile   = os.path.join(node.homeFolder, '{}.conf'.format(node.name))
         self.logFile    = os.path.join(node.homeFolder, '{}.log'.format(node.name))
@@ -103,20 +151,40 @@ class Nfd(NdnApplication):
             pass
 
         # Create client.conf file
-        with open('/usr/local/etc/mini-ndn/client.conf.sample', 'r') as client_conf_file:
+        with open(CLIENT_CONF_SAMPLE_FILE, 'r') as client_conf_file:
             client_conf_str = client_conf_file.read()
             client_conf_str = client_conf_str.replace('nfd.sock', '{}.sock'.format(node.name))
 
         with open(self.clientConf, 'w') as client_conf_file:
             client_conf_file.write(client_conf_str)
 
-        # Change home folder
-        node.cmd("export HOME=%s" % node.homeFolder)
-
     def start(self):
+        start_time = time.time()
         NdnApplication.start(self, "nfd --config %s 2>> %s &" % (self.confFile, self.logFile))
-        time.sleep(2)
+
+        self.isReady = self.waitUntilReady()
+        self.startupTime = time.time() - start_time
+
+        if self.isReady is False:
+            logging.warning("NFD on {} not ready after {:.1f}s".format(self.node.name, self.startupTime))
+
+    def waitUntilReady(self):
+        "Poll the forwarder's Unix socket until it accepts connections or the timeout expires"
+        deadline = time.time() + self.startTimeout
+        while True:
+            if _is_socket_ready(self.sockFile):
+                return True
+
+            # Give up early if the forwarder already exited
+            try:
+                os.kill(int(self.processId), 0)
+            except (OSError, ValueError):
+                return False
+
+            if time.time() >= deadline:
+                return False
+
+            time.sleep(START_POLL_INTERVAL)
 
     def setStrategy(self, name, strategy):
         self.node.cmd("nfdc set-strategy %s ndn:/localhost/nfd/strategy/%s" % (name, strategy))
-        time.sleep(0.5)
@@ -0,0 +1,197 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import glob
+import logging
+import os
+import re
+import struct
+import subprocess
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ndn.sampler import DEFAULT_FLUSH_INTERVAL, PeriodicSampler, append_records
+
+# Cumulative forwarder counters, stored as fixed-width little-endian records in <node>.nfdstat
+GENERAL_COUNTERS = ['nInInterests', 'nOutInterests', 'nInData', 'nOutData', 'nInNacks', 'nOutNacks',
+                    'nHits', 'nMisses']
+GENERAL_STRUCT = struct.Struct('<d8Q')
+GENERAL_SUFFIX = '.nfdstat'
+
+# Cumulative counters of every face, stored in <node>-faces.nfdstat with the face id
+FACE_COUNTERS = ['in_interests', 'in_data', 'in_nacks', 'in_bytes',
+                 'out_interests', 'out_data', 'out_nacks', 'out_bytes']
+FACE_STRUCT = struct.Struct('<dQ8Q')
+FACES_SUFFIX = '-faces.nfdstat'
+
+_COUNTER_RE = re.compile(r'\b(' + '|'.join(GENERAL_COUNTERS) + r')=(\d+)')
+_FACE_RE = re.compile(r'faceid=(\d+)\b.*counters=\{in=\{([^}]*)\} out=\{([^}]*)\}')
+_FACE_COUNTER_RE = re.compile(r'(\d+)([idnB])')
+
+def status_command(version):
+    "Command printing the general status and the faces of a forwarder of the given NFD version"
+    if version is not None and tuple(int(part) for part in version.split('.')[:2]) >= (0, 6):
+        return ['nfdc', 'status', 'report']
+    return ['nfd-status']
+
+def _parse_face_counters(counters):
+    values = dict((suffix, int(value)) for value, suffix in _FACE_COUNTER_RE.findall(counters))
+    return (values.get('i', 0), values.get('d', 0), values.get('n', 0), values.get('B', 0))
+
+def parse_status(output):
+    '''Parse the output of nfd-status or `nfdc status report` into
+       ({GENERAL_COUNTERS name: value}, {face id: FACE_COUNTERS values})'''
+    general = dict((name, int(value)) for name, value in _COUNTER_RE.findall(output))
+    faces = {}
+    for line in output.splitlines():
+        match = _FACE_RE.search(line)
+        if match is not None:
+            faces[int(match.group(1))] = _parse_face_counters(match.group(2)) + _parse_face_counters(match.group(3))
+    return general, faces
+
+def _rates(records, counters):
+    "Per second rates of cumulative counters; a counter going back means the forwarder restarted"
+    elapsed = numpy.diff(records['timestamp'])
+    rates = {'timestamp': records['timestamp'][1:]}
+    for counter in counters:
+        values = records[counter].astype(numpy.int64)
+        delta = numpy.diff(values)
+        rates[counter] = numpy.where(delta < 0, values[1:], delta) / elapsed
+    return rates
+
+def load_rates(outputDir):
+    '''Load the counters written by NfdCounterSampler as rates per second.
+       Returns ({node: {'timestamp': array, counter: array}},
+                {(node, face id): {'timestamp': array, counter: array}})'''
+    if numpy is None:
+        raise ImportError("NumPy is required to load NFD counters")
+
+    generalType = numpy.dtype([('timestamp', '<f8')] + [(counter, '<u8') for counter in GENERAL_COUNTERS])
+    faceType = numpy.dtype([('timestamp', '<f8'), ('faceid', '<u8')] + [(counter, '<u8') for counter in FACE_COUNTERS])
+
+    nodes = {}
+    faces = {}
+    for path in glob.glob(os.path.join(outputDir, '*' + GENERAL_SUFFIX)):
+        if path.endswith(FACES_SUFFIX):
+            node = os.path.basename(path)[:-len(FACES_SUFFIX)]
+            records = numpy.fromfile(path, dtype=faceType)
+            for faceId in numpy.unique(records['faceid']):
+                faceRecords = records[records['faceid'] == faceId]
+                if len(faceRecords) >= 2:
+                    faces[(node, int(faceId))] = _rates(faceRecords, FACE_COUNTERS)
+        else:
+            records = numpy.fromfile(path, dtype=generalType)
+            if len(records) >= 2:
+                nodes[os.path.basename(path)[:-len(GENERAL_SUFFIX)]] = _rates(records, GENERAL_COUNTERS)
+
+    return nodes, faces
+
+class NfdCounterSampler(PeriodicSampler):
+    '''Polls the forwarder counters of every node in parallel: Interests, Data and Nacks in
+       and out, CS hits and misses (NFD 0.6 and later) and the counters of every face. The status
+       command talks to each node's NFD through its Unix socket, so it runs directly with the
+       node's HOME (and thus its client.conf) rather than through the node's shell.
+       Samples are appended to <outputDir>/<node>.nfdstat and <node>-faces.nfdstat as
+       fixed-width records; use load_rates() to get rates per second.'''
+
+    def __init__(self, outputDir, interval=1, flushInterval=DEFAULT_FLUSH_INTERVAL, nfdVersion=None):
+        PeriodicSampler.__init__(self, outputDir, interval, flushInterval)
+        self.command = status_command(nfdVersion)
+
+        # node name -> home folder
+        self.homeFolders = {}
+
+        # file name -> buffered records
+        self._buffers = {}
+        # node name -> (first, last) (timestamp, general counters)
+        self._stats = {}
+
+    def addHosts(self, hosts):
+        with self._lock:
+            for host in hosts:
+                self.homeFolders[host.name] = host.homeFolder
+
+    def sample(self):
+        with self._lock:
+            homeFolders = self.homeFolders.items()
+
+        processes = []
+        for hostName, homeFolder in homeFolders:
+            env = dict(os.environ)
+            env['HOME'] = homeFolder
+            try:
+                processes.append((hostName, subprocess.Popen(self.command, stdout=subprocess.PIPE,
+                                                             stderr=subprocess.PIPE, env=env)))
+            except OSError as e:
+                logging.debug("Cannot read the NFD counters of {}: {}".format(hostName, e))
+
+        samples = []
+        for hostName, process in processes:
+            output, _ = process.communicate()
+            # The forwarder of a failed node is not running
+            if process.returncode == 0:
+                samples.append((hostName, time.time(), parse_status(output)))
+
+        with self._lock:
+            for hostName, timestamp, (general, faces) in samples:
+                counters = tuple(general.get(counter, 0) for counter in GENERAL_COUNTERS)
+                self._buffers.setdefault(hostName + GENERAL_SUFFIX, bytearray()).extend(
+                    GENERAL_STRUCT.pack(timestamp, *counters))
+
+                records = self._buffers.setdefault(hostName + FACES_SUFFIX, bytearray())
+                for faceId in sorted(faces):
+                    records.extend(FACE_STRUCT.pack(timestamp, faceId, *faces[faceId]))
+
+                first = self._stats.get(hostName, (None, None))[0] or (timestamp, counters)
+                self._stats[hostName] = (first, (timestamp, counters))
+
+    def flush(self):
+        with self._lock:
+            buffers = self._buffers
+            self._buffers = {}
+
+        for fileName, records in buffers.items():
+            append_records(os.path.join(self.outputDir, fileName), records)
+
+    def summary(self):
+        "Return node -> mean rate per second of every GENERAL_COUNTERS counter since the first sample"
+        with self._lock:
+            summary = {}
+            for hostName, (first, last) in self._stats.items():
+                elapsed = last[0] - first[0]
+                if elapsed <= 0:
+                    continue
+                summary[hostName] = dict((counter, max(0, last[1][i] - first[1][i]) / elapsed)
+                                         for i, counter in enumerate(GENERAL_COUNTERS))
+            return summary
+
+    def logReport(self, count=5):
+        summary = self.summary()
+        busiest = sorted(summary.items(), key=lambda item: item[1]['nOutInterests'], reverse=True)[:count]
+        for hostName, rates in busiest:
+            logging.info("NFD on {}: {:.1f} Interests/s in, {:.1f} out, {:.1f} Data/s in, {:.1f} out".format(
+                hostName, rates['nInInterests'], rates['nOutInterests'], rates['nInData'], rates['nOutData']))
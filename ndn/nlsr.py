@@ -23,22 +23,49 @@
 
 from mininet.clean import sh
 
+from minindn.common import MINI_NDN_INSTALL_DIR
+from ndn.bring_up import BringUp, DEFAULT_MAX_WORKERS
+from ndn import tracing
 from ndn.ndn_application import NdnApplication
 
 import os
+import re
 import shutil
 import textwrap
+import threading
 
-def setup(net, hosts_conf, work_dir, nlsr_opts):
+CONF_TEMPLATE_FILE = os.path.join(MINI_NDN_INSTALL_DIR, 'nlsr.conf')
+
+# The root key is in the PIB of the root namespace's user, whose sqlite database can be
+# locked by a concurrent ndnsec-certgen: the hosts' certificates are signed one at a time
+_ROOT_SIGNING_LOCK = threading.Lock()
+
+# nlsr.conf template pre-split into [literal, section name, literal, section name, ..., literal]
+_CONF_TEMPLATE = None
+def load_conf_template(template_file=CONF_TEMPLATE_FILE):
+    global _CONF_TEMPLATE
+    with open(template_file, 'r') as conf_file:
+        _CONF_TEMPLATE = re.split(r'\$([A-Z]+_SECTION)', conf_file.read())
+
+    return _CONF_TEMPLATE
+
+def _get_conf_template():
+    if _CONF_TEMPLATE is None:
+        load_conf_template()
+
+    return _CONF_TEMPLATE
+
+def setup(net, hosts_conf, work_dir, nlsr_opts, max_workers=DEFAULT_MAX_WORKERS):
+  bring_up = BringUp(net.hosts, max_workers)
+  bring_up.addStage('nfd', lambda host: host.nfd.start())
+  add_stages(bring_up, net, hosts_conf, work_dir, nlsr_opts)
+  bring_up.run()
+
+def add_stages(bring_up, net, hosts_conf, work_dir, nlsr_opts):
   is_security_enabled = nlsr_opts.get('security', False)
   max_faces_per_prefix = nlsr_opts.get('max-faces-per-prefix', 3)
   hyperbolic_state = nlsr_opts.get('hyperbolic_state', 'off')
 
-  # NLSR Security
-  if is_security_enabled:
-      Nlsr.createKeysAndCertificates(net, work_dir)
-
-  # NLSR initialization
   for host in net.hosts:
       conf = next(x for x in hosts_conf if x.name == host.name)
 
@@ -46,6 +73,16 @@ def setup(net, hosts_conf, work_dir, nlsr_opts):
       host.nlsrParameters["max-faces-per-prefix"] = max_faces_per_prefix
       host.nlsrParameters["hyperbolic-state"] = hyperbolic_state
 
+  # Read the nlsr.conf template once for all hosts
+  _get_conf_template()
+
+  # NLSR Security
+  if is_security_enabled:
+      with tracing.span('root certificate'):
+          Nlsr.createRootCertificate(work_dir)
+      bring_up.addStage('nlsr-security', lambda host: Nlsr.createHostCertificates(host, work_dir))
+
+  def start_nlsr(host):
       # Generate NLSR configuration file
       configGenerator = NlsrConfigGenerator(host, is_security_enabled)
       configGenerator.createConfigFile()
@@ -54,6 +91,8 @@ def setup(net, hosts_conf, work_dir, nlsr_opts):
       host.nlsr = Nlsr(host)
       host.nlsr.start()
 
+  bring_up.addStage('nlsr', start_nlsr, requires=('nfd', 'nlsr-security'))
+
 
 class Nlsr(NdnApplication):
     def __init__(self, node):
@@ -61,15 +100,11 @@ class Nlsr(NdnApplication):
         self.routerName = "/%sC1.Router/cs/%s" % ('%', node.name)
         self.confFile = "%s/nlsr.conf" % node.homeFolder
 
-        # Make directory for log file
+        # Make directory for log file; router name, log-dir and seq-dir are
+        # already set in nlsr.conf by NlsrConfigGenerator
         self.logDir = "%s/log" % node.homeFolder
-        node.cmd("mkdir %s" % self.logDir)
-
-        # Configure basic router information in nlsr.conf based on host name
-        node.cmd("sudo sed -i 's|router .*|router %s|g' %s" % (self.routerName, self.confFile))
-        node.cmd("sudo sed -i 's|log-dir .*|log-dir %s|g' %s" % (self.logDir, self.confFile))
-        node.cmd("sudo sed -i 's|seq-dir .*|seq-dir %s|g' %s" % (self.logDir, self.confFile))
-        node.cmd("sudo sed -i 's|prefix .*netlab|prefix /ndn/edu/%s|g' %s" % (node.name, self.confFile))
+        if not os.path.isdir(self.logDir):
+            os.mkdir(self.logDir)
 
     def start(self):
         NdnApplication.start(self, "nlsr -d -f {} &".format(self.confFile))
@@ -87,6 +122,13 @@ class Nlsr(NdnApplication):
 
     @staticmethod
     def createKeysAndCertificates(net, workDir):
+        Nlsr.createRootCertificate(workDir)
+
+        for host in net.hosts:
+            Nlsr.createHostCertificates(host, workDir)
+
+    @staticmethod
+    def createRootCertificate(workDir):
         securityDir = "{}/security".format(workDir)
 
         if not os.path.exists(securityDir):
@@ -97,38 +139,42 @@ class Nlsr(NdnApplication):
         sh("ndnsec-keygen {} > {}/root.keys".format(rootName, securityDir))
         sh("ndnsec-certgen -N {} -p {} {}/root.keys > {}/root.cert".format(rootName, rootName, securityDir, securityDir))
 
-        # Create necessary certificates for each site
-        for host in net.hosts:
-            nodeSecurityFolder = "{}/security".format(host.homeFolder)
+    @staticmethod
+    def createHostCertificates(host, workDir):
+        "Create the site, operator and router certificates of a host; the root certificate must exist"
+        securityDir = "{}/security".format(workDir)
+        rootName = "/ndn"
+        nodeSecurityFolder = "{}/security".format(host.homeFolder)
 
-            if not os.path.exists(nodeSecurityFolder):
-                os.mkdir(nodeSecurityFolder)
+        if not os.path.exists(nodeSecurityFolder):
+            os.mkdir(nodeSecurityFolder)
 
-            shutil.copyfile("{}/root.cert".format(securityDir), "{}/root.cert".format(nodeSecurityFolder))
+        shutil.copyfile("{}/root.cert".format(securityDir), "{}/root.cert".format(nodeSecurityFolder))
 
-            # Create site certificate
-            siteName = "/ndn/edu"
-            siteKeyFile = "{}/site.keys".format(nodeSecurityFolder)
-            siteCertFile = "{}/site.cert".format(nodeSecurityFolder)
-            Nlsr.createKey(host, siteName, siteKeyFile)
+        # Create site certificate
+        siteName = "/ndn/edu"
+        siteKeyFile = "{}/site.keys".format(nodeSecurityFolder)
+        siteCertFile = "{}/site.cert".format(nodeSecurityFolder)
+        Nlsr.createKey(host, siteName, siteKeyFile)
 
-            # Root key is in root namespace, must sign site key and then install on host
+        # Root key is in root namespace, must sign site key and then install on host
+        with _ROOT_SIGNING_LOCK:
             sh("ndnsec-certgen -N {} -s {} -p {} {} > {}".format(siteName, rootName, siteName, siteKeyFile, siteCertFile))
-            host.cmd("ndnsec-cert-install -f {}".format(siteCertFile))
-
-            # Create operator certificate
-            opName = "{}/%C1.Operator/op".format(siteName)
-            opKeyFile = "{}/op.keys".format(nodeSecurityFolder)
-            opCertFile = "{}/op.cert".format(nodeSecurityFolder)
-            Nlsr.createKey(host, opName, opKeyFile)
-            Nlsr.createCertificate(host, opName, opName, opKeyFile, opCertFile, signer=siteName)
-
-            # Create router certificate
-            routerName = "{}/%C1.Router/cs/{}".format(siteName, host.name)
-            routerKeyFile = "{}/router.keys".format(nodeSecurityFolder)
-            routerCertFile = "{}/router.cert".format(nodeSecurityFolder)
-            Nlsr.createKey(host, routerName, routerKeyFile)
-            Nlsr.createCertificate(host, routerName, routerName, routerKeyFile, routerCertFile, signer=opName)
+        host.cmd("ndnsec-cert-install -f {}".format(siteCertFile))
+
+        # Create operator certificate
+        opName = "{}/%C1.Operator/op".format(siteName)
+        opKeyFile = "{}/op.keys".format(nodeSecurityFolder)
+        opCertFile = "{}/op.cert".format(nodeSecurityFolder)
+        Nlsr.createKey(host, opName, opKeyFile)
+        Nlsr.createCertificate(host, opName, opName, opKeyFile, opCertFile, signer=siteName)
+
+        # Create router certificate
+        routerName = "{}/%C1.Router/cs/{}".format(siteName, host.name)
+        routerKeyFile = "{}/router.keys".format(nodeSecurityFolder)
+        routerCertFile = "{}/router.cert".format(nodeSecurityFolder)
+        Nlsr.createKey(host, routerName, routerKeyFile)
+        Nlsr.createCertificate(host, routerName, routerName, routerKeyFile, routerCertFile, signer=opName)
 
 class NlsrConfigGenerator:
 
@@ -136,7 +182,6 @@ class NlsrConfigGenerator:
     ROUTING_HYPERBOLIC = "hr"
 
     def __init__(self, node, isSecurityEnabled):
-        node.cmd("sudo cp /usr/local/etc/mini-ndn/nlsr.conf nlsr.conf")
         self.node = node
         self.isSecurityEnabled = isSecurityEnabled
 
@@ -152,20 +197,30 @@ class NlsrConfigGenerator:
 
         filePath = "%s/nlsr.conf" % self.node.homeFolder
 
-        configFile = open(filePath, 'r')
-        oldContent = configFile.read()
-        configFile.close()
-
-        newContent = oldContent.replace("$GENERAL_SECTION", self.__getGeneralSection())
-        newContent = newContent.replace("$NEIGHBORS_SECTION", self.__getNeighborsSection())
-        newContent = newContent.replace("$HYPERBOLIC_SECTION", self.__getHyperbolicSection())
-        newContent = newContent.replace("$FIB_SECTION", self.__getFibSection())
-        newContent = newContent.replace("$ADVERTISING_SECTION", self.__getAdvertisingSection())
-        newContent = newContent.replace("$SECURITY_SECTION", self.__getSecuritySection())
-
-        configFile = open(filePath, 'w')
-        configFile.write(newContent)
-        configFile.close()
+        with open(filePath, 'w') as configFile:
+            configFile.write(self.render())
+
+    def render(self):
+        sections = {
+            "GENERAL_SECTION": self.__getGeneralSection,
+            "NEIGHBORS_SECTION": self.__getNeighborsSection,
+            "HYPERBOLIC_SECTION": self.__getHyperbolicSection,
+            "FIB_SECTION": self.__getFibSection,
+            "ADVERTISING_SECTION": self.__getAdvertisingSection,
+            "SECURITY_SECTION": self.__getSecuritySection
+        }
+
+        # Odd entries of the split template are section names, even entries are literal text
+        parts = []
+        for i, part in enumerate(_get_conf_template()):
+            if i % 2 == 0:
+                parts.append(part)
+            elif part in sections:
+                parts.append(sections[part]())
+            else:
+                parts.append("$" + part)
+
+        return "".join(parts)
 
     def __getConfig(self):
 
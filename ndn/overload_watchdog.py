@@ -0,0 +1,208 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+import time
+
+from ndn import cgroup_accountant
+from ndn.sampler import DEFAULT_FLUSH_INTERVAL, PeriodicSampler
+
+INTERVALS_FILE = 'fidelity-compromised.txt'
+SAMPLES_FILE = 'overload.txt'
+
+# Default thresholds beyond which the emulation no longer reflects protocol behaviour
+MAX_STEAL = 0.05
+MIN_IDLE = 0.05
+MAX_SOFTIRQ = 0.2
+MAX_RUN_QUEUE = 1.5
+MAX_THROTTLED = 0.1
+
+# Order of the columns of the cpu line of /proc/stat
+_USER, _NICE, _SYSTEM, _IDLE, _IOWAIT, _IRQ, _SOFTIRQ, _STEAL = range(8)
+
+def parse_proc_stat(stat):
+    '''Parse /proc/stat into (aggregated cpu times, number of CPUs, running processes).
+       The cpu times are user, nice, system, idle, iowait, irq, softirq and steal.'''
+    times = None
+    nCpus = 0
+    running = 0
+    for line in stat.splitlines():
+        fields = line.split()
+        if len(fields) == 0:
+            continue
+        if fields[0] == 'cpu':
+            times = [int(value) for value in fields[1:9]]
+            times += [0] * (8 - len(times))
+        elif fields[0].startswith('cpu'):
+            nCpus += 1
+        elif fields[0] == 'procs_running':
+            running = int(fields[1])
+    return times, max(1, nCpus), running
+
+def read_intervals(fileName):
+    "Read the (start, end, reasons) intervals written by OverloadWatchdog"
+    intervals = []
+    with open(fileName) as intervalsFile:
+        for line in intervalsFile:
+            fields = line.split()
+            if len(fields) == 3:
+                intervals.append((float(fields[0]), float(fields[1]), fields[2].split(',')))
+    return intervals
+
+def is_compromised(intervals, timestamp):
+    return any(start <= timestamp <= end for start, end, reasons in intervals)
+
+class OverloadWatchdog(PeriodicSampler):
+    '''Detects when the machine running the emulation is saturated, i.e. when RTTs and
+       convergence times measure CPU starvation rather than NDN. Every tick, the machine-wide
+       CPU steal, idle and softirq shares, the run queue length per CPU and the share of time
+       each CPU-limited host was throttled are checked against thresholds. Ticks over any
+       threshold are merged into "fidelity compromised" intervals, written with their reasons
+       to <outputDir>/fidelity-compromised.txt; the raw metrics go to <outputDir>/overload.txt.'''
+
+    def __init__(self, outputDir, interval=1, flushInterval=DEFAULT_FLUSH_INTERVAL,
+                 maxSteal=MAX_STEAL, minIdle=MIN_IDLE, maxSoftirq=MAX_SOFTIRQ,
+                 maxRunQueue=MAX_RUN_QUEUE, maxThrottled=MAX_THROTTLED):
+        PeriodicSampler.__init__(self, outputDir, interval, flushInterval)
+        self.maxSteal = maxSteal
+        self.minIdle = minIdle
+        self.maxSoftirq = maxSoftirq
+        self.maxRunQueue = maxRunQueue
+        self.maxThrottled = maxThrottled
+
+        # host name -> HostCgroup of the hosts whose throttling is tracked
+        self.cgroups = {}
+        # [start, end, reasons] of the compromised intervals
+        self.intervals = []
+
+        self._previous = None
+        self._previousThrottled = {}
+        self._samples = []
+
+    def add(self, hostName, cgroup):
+        with self._lock:
+            self.cgroups[hostName] = cgroup
+
+    def attach(self, hosts):
+        "Track the throttling of the hosts that have a cgroup of their own, i.e. CpuLimitedNdnHost"
+        mounts = cgroup_accountant.parse_mounts(cgroup_accountant._read('/proc/mounts'))
+        ownPaths = cgroup_accountant.parse_proc_cgroup(cgroup_accountant._read('/proc/self/cgroup'))
+        for host in hosts:
+            try:
+                cgroup = cgroup_accountant.resolve_host_cgroup(host.name, host.pid, mounts, ownPaths)
+            except (OSError, IOError) as e:
+                logging.debug("Cannot find the cgroup of {}: {}".format(host.name, e))
+                continue
+            if cgroup is not None:
+                self.add(host.name, cgroup)
+
+    def check(self, times, previousTimes, nCpus, running, throttled):
+        '''Return the reasons why the tick with the given /proc/stat deltas is compromised;
+           throttled maps host name to the share of the tick it was throttled'''
+        delta = [max(0, value - old) for value, old in zip(times, previousTimes)]
+        total = float(sum(delta))
+        reasons = []
+        if total > 0:
+            if delta[_STEAL] / total > self.maxSteal:
+                reasons.append('steal')
+            if (delta[_IDLE] + delta[_IOWAIT]) / total < self.minIdle:
+                reasons.append('idle')
+            if delta[_SOFTIRQ] / total > self.maxSoftirq:
+                reasons.append('softirq')
+        if float(running) / nCpus > self.maxRunQueue:
+            reasons.append('run-queue')
+        for hostName in sorted(throttled):
+            if throttled[hostName] > self.maxThrottled:
+                reasons.append('throttled:' + hostName)
+        return reasons
+
+    def sample(self):
+        with open('/proc/stat') as statFile:
+            times, nCpus, running = parse_proc_stat(statFile.read())
+        currentTime = time.time()
+
+        with self._lock:
+            cgroups = self.cgroups.items()
+
+        throttled = {}
+        for hostName, cgroup in cgroups:
+            try:
+                throttledUsec = cgroup.read()[4]
+            except (OSError, IOError):
+                continue
+            previous = self._previousThrottled.get(hostName)
+            self._previousThrottled[hostName] = (currentTime, throttledUsec)
+            if previous is not None and currentTime > previous[0]:
+                throttled[hostName] = (throttledUsec - previous[1]) / 1e6 / (currentTime - previous[0])
+
+        previous = self._previous
+        self._previous = (currentTime, times)
+        if previous is None:
+            return
+
+        reasons = self.check(times, previous[1], nCpus, running, throttled)
+        delta = [max(0, value - old) for value, old in zip(times, previous[1])]
+        total = float(sum(delta)) or 1.0
+
+        with self._lock:
+            self._samples.append("{:.3f} {:.3f} {:.3f} {:.3f} {:.2f} {}\n".format(
+                currentTime, (delta[_IDLE] + delta[_IOWAIT]) / total, delta[_STEAL] / total,
+                delta[_SOFTIRQ] / total, float(running) / nCpus,
+                ','.join(hostName for hostName, share in sorted(throttled.items())
+                         if share > self.maxThrottled) or '-'))
+
+            if len(reasons) == 0:
+                return
+
+            # A tick covers the time since the previous one; contiguous ticks form one interval
+            if len(self.intervals) > 0 and self.intervals[-1][1] == previous[0]:
+                self.intervals[-1][1] = currentTime
+                self.intervals[-1][2].update(reasons)
+            else:
+                self.intervals.append([previous[0], currentTime, set(reasons)])
+
+    def flush(self):
+        with self._lock:
+            samples = self._samples
+            self._samples = []
+            intervals = [(start, end, sorted(reasons)) for start, end, reasons in self.intervals]
+
+        with open(os.path.join(self.outputDir, SAMPLES_FILE), "a") as samplesFile:
+            samplesFile.write("".join(samples))
+
+        with open(os.path.join(self.outputDir, INTERVALS_FILE), "w") as intervalsFile:
+            for start, end, reasons in intervals:
+                intervalsFile.write("{:.3f} {:.3f} {}\n".format(start, end, ','.join(reasons)))
+
+    def compromisedTime(self):
+        with self._lock:
+            return sum(end - start for start, end, reasons in self.intervals)
+
+    def logReport(self):
+        if len(self.intervals) == 0:
+            logging.info("Emulation fidelity: no overload detected")
+            return
+
+        logging.warning("Emulation fidelity compromised for {:.1f} seconds in {} interval(s); see {}".format(
+            self.compromisedTime(), len(self.intervals), INTERVALS_FILE))
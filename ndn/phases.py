@@ -0,0 +1,118 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import time
+
+SETUP = 'setup'
+# Mininet host construction and network start, part of the setup
+HOSTS = 'hosts'
+# Bring-up of nfd and nlsr, and of the experiment services started along with them
+NLSR = 'nlsr'
+CONVERGENCE = 'convergence'
+TRAFFIC = 'traffic'
+FAILURE = 'failure'
+RECOVERY = 'recovery'
+
+class PhaseTimeline(object):
+    '''Records which experiment phase (setup, hosts, nlsr, convergence, traffic, failure, recovery)
+       the emulation is in, so that samplers can attribute their measurements to a phase.'''
+
+    def __init__(self):
+        # [name, start, end] of every phase entered, end is None while the phase lasts
+        self.phases = []
+        # Called with the name of the new phase, or None when the phase ends
+        self.listeners = []
+        self._lock = threading.Lock()
+
+    def enter(self, name, timestamp=None):
+        "End the current phase, if any, and start phase name; entering the current phase again has no effect"
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            if len(self.phases) > 0 and self.phases[-1][2] is None:
+                if self.phases[-1][0] == name:
+                    return
+                self.phases[-1][2] = timestamp
+
+            self.phases.append([name, timestamp, None])
+
+        for listener in self.listeners:
+            listener(name)
+
+    def end(self, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            if len(self.phases) == 0 or self.phases[-1][2] is not None:
+                return
+            self.phases[-1][2] = timestamp
+
+        for listener in self.listeners:
+            listener(None)
+
+    def current(self):
+        with self._lock:
+            if len(self.phases) > 0 and self.phases[-1][2] is None:
+                return self.phases[-1][0]
+            return None
+
+    def at(self, timestamp):
+        "Return the name of the phase the emulation was in at timestamp, or None"
+        with self._lock:
+            for name, start, end in reversed(self.phases):
+                if start <= timestamp and (end is None or timestamp < end):
+                    return name
+            return None
+
+    def write(self, fileName):
+        "Write one '<name> <start> <end>' line per phase"
+        with self._lock:
+            phases = list(self.phases)
+
+        with open(fileName, "w") as phaseFile:
+            for name, start, end in phases:
+                phaseFile.write("{} {:.3f} {}\n".format(name, start, "-" if end is None else "{:.3f}".format(end)))
+
+def read(fileName):
+    "Read a timeline written by PhaseTimeline.write()"
+    timeline = PhaseTimeline()
+    with open(fileName) as phaseFile:
+        for line in phaseFile:
+            name, start, end = line.split()
+            timeline.phases.append([name, float(start), None if end == "-" else float(end)])
+    return timeline
+
+# Timeline of the running emulation
+timeline = PhaseTimeline()
+
+def enter(name):
+    timeline.enter(name)
+
+def end():
+    timeline.end()
+
+def current():
+    return timeline.current()
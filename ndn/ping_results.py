@@ -0,0 +1,326 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+import re
+from array import array
+from multiprocessing import Pool
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ndnping -t output, e.g.
+#   1473787440123 milliseconds - content from /ndn/edu/b: seq=9573 time=12.34 ms
+#   1473787441.123 - timeout from /ndn/edu/b: seq=9574
+#   1473787442.123 - nack from /ndn/edu/b: seq=9575 reason=NoRoute
+_LINE_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(milliseconds|ms)?\s*-\s*'
+                      r'(content|timeout|nack) from \S+: seq=(\d+)(?: time=([\d.]+) ms)?')
+
+# ndn-traffic-client output, split per destination by ndn.apps.ndn_traffic.split_log, e.g.
+#   1473787440.123 - Sending Interest   - PatternType=1, GlobalID=7, LocalID=3, Name=/ndn/edu/b/ping/3
+#   1473787440.135 - Data Received      - PatternType=1, GlobalID=7, LocalID=3, Name=/ndn/edu/b/ping/3
+#   1473787444.123 - Interest Timed Out - PatternType=1, GlobalID=8, LocalID=4, Name=/ndn/edu/b/ping/4
+# The timestamp is not printed on every line by all versions
+_TRAFFIC_LINE_RE = re.compile(r'^\s*(?:(\d+(?:\.\d+)?)\s*(milliseconds|ms)?\s*-\s*)?'
+                              r"(Sending Interest|Data Received|Interest Timed Out|Interest Nack'd)\s*-\s*"
+                              r'PatternType=\d+, GlobalID=\d+, LocalID=(\d+)')
+
+# Suffix of the per-destination ndn-traffic-client logs, <dst>-traffic.txt
+TRAFFIC_SUFFIX = '-traffic.txt'
+
+# Written by Experiment.schedulePings(), relative to the work dir: one "<start> <end>" line
+# per launch of ping clients, every client of the launch starting within the window
+LAUNCH_WINDOWS_FILE = os.path.join('ping-data', 'launch-windows.txt')
+
+COLUMNS = ['timestamp', 'src', 'dst', 'seq', 'rtt', 'timeout']
+
+# array typecodes used while parsing; converted to NumPy dtypes when saved
+_TYPECODES = {
+    'timestamp': 'd',
+    'src': 'i',
+    'dst': 'i',
+    'seq': 'L',
+    'rtt': 'f',
+    'timeout': 'B'
+}
+
+def write_launch_window(work_dir, start, end):
+    "Append a launch window to the work dir's launch windows file"
+    fileName = os.path.join(work_dir, LAUNCH_WINDOWS_FILE)
+    if not os.path.isdir(os.path.dirname(fileName)):
+        os.makedirs(os.path.dirname(fileName))
+    with open(fileName, 'a') as windowsFile:
+        windowsFile.write("{:.6f} {:.6f}\n".format(start, end))
+
+def read_launch_windows(fileName):
+    "Read the (start, end) launch windows of a file; there are none if it does not exist"
+    windows = []
+    if not os.path.isfile(fileName):
+        return windows
+    with open(fileName) as windowsFile:
+        for line in windowsFile:
+            fields = line.split()
+            if len(fields) == 2:
+                windows.append((float(fields[0]), float(fields[1])))
+    return windows
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("NumPy is required to store and summarize ping results")
+
+def _parse_timestamp(value, unit):
+    timestamp = float(value)
+    # Timestamps printed as a duration are in milliseconds
+    if unit is not None or timestamp > 1e11:
+        timestamp /= 1000.0
+    return timestamp
+
+def parse_line(line):
+    '''Parse one line of `ndnping -t` output.
+       Returns (timestamp in seconds, seq, rtt in ms or NaN, timed out) or None.'''
+    match = _LINE_RE.match(line)
+    if match is None:
+        return None
+
+    timestamp = _parse_timestamp(match.group(1), match.group(2))
+    if match.group(3) == 'content':
+        return (timestamp, int(match.group(4)), float(match.group(5)), False)
+    else:
+        return (timestamp, int(match.group(4)), float('nan'), True)
+
+def parse_file(path):
+    "Stream the parsed records of an ndnping log file"
+    with open(path, 'r') as log:
+        for line in log:
+            record = parse_line(line)
+            if record is not None:
+                yield record
+
+def parse_traffic_file(path):
+    '''Stream the records of the ndn-traffic-client log of one destination, as parse_file():
+       the sequence number is the pattern's LocalID and the RTT is the time between the
+       Interest and its Data, or NaN if the client did not print both times'''
+    sent = {}
+    with open(path, 'r') as log:
+        for line in log:
+            match = _TRAFFIC_LINE_RE.match(line)
+            if match is None:
+                continue
+
+            timestamp = _parse_timestamp(match.group(1), match.group(2)) if match.group(1) is not None else None
+            event, seq = match.group(3), int(match.group(4))
+            if event == 'Sending Interest':
+                sent[seq] = timestamp
+                continue
+
+            sentTime = sent.pop(seq, None)
+            if timestamp is None:
+                timestamp = sentTime
+            if timestamp is None:
+                continue
+
+            if event == 'Data Received':
+                rtt = (timestamp - sentTime) * 1000 if sentTime is not None else float('nan')
+                yield (timestamp, seq, rtt, False)
+            else:
+                yield (timestamp, seq, float('nan'), True)
+
+def _ingest_file(job):
+    "Parse one file into compact arrays; run in a worker process"
+    path, src, dst = job
+    columns = dict((name, array(_TYPECODES[name])) for name in COLUMNS)
+
+    records = parse_traffic_file(path) if path.endswith(TRAFFIC_SUFFIX) else parse_file(path)
+    for timestamp, seq, rtt, timeout in records:
+        columns['timestamp'].append(timestamp)
+        columns['src'].append(src)
+        columns['dst'].append(dst)
+        columns['seq'].append(seq)
+        columns['rtt'].append(rtt)
+        columns['timeout'].append(timeout)
+
+    return columns
+
+def find_files(work_dir):
+    '''Find every <work_dir>/<src>/ping-data/<dst>.txt (ndnping) and <dst>-traffic.txt
+       (ndn-traffic-client) file. Returns (node names, list of (path, src index, dst index)).'''
+    logs = []
+    for src in sorted(os.listdir(work_dir)):
+        ping_dir = os.path.join(work_dir, src, 'ping-data')
+        if not os.path.isdir(ping_dir):
+            continue
+        for filename in sorted(os.listdir(ping_dir)):
+            if filename.endswith(TRAFFIC_SUFFIX):
+                logs.append((os.path.join(ping_dir, filename), src, filename[:-len(TRAFFIC_SUFFIX)]))
+            elif filename.endswith('.txt'):
+                logs.append((os.path.join(ping_dir, filename), src, filename[:-len('.txt')]))
+
+    nodes = sorted(set([src for path, src, dst in logs] + [dst for path, src, dst in logs]))
+    index = dict((node, i) for i, node in enumerate(nodes))
+
+    return nodes, [(path, index[src], index[dst]) for path, src, dst in logs]
+
+def ingest(work_dir, output_dir, processes=None):
+    '''Parse every ping-data log under work_dir with a process pool and store the records
+       column-wise in output_dir. Returns the loaded PingResults.'''
+    _require_numpy()
+    nodes, jobs = find_files(work_dir)
+
+    columns = dict((name, array(_TYPECODES[name])) for name in COLUMNS)
+    pool = Pool(processes)
+    try:
+        for file_columns in pool.imap_unordered(_ingest_file, jobs):
+            for name in COLUMNS:
+                columns[name].extend(file_columns[name])
+    finally:
+        pool.close()
+        pool.join()
+
+    results = PingResults(nodes, dict((name, numpy.frombuffer(columns[name], dtype=columns[name].typecode))
+                                      for name in COLUMNS),
+                          read_launch_windows(os.path.join(work_dir, LAUNCH_WINDOWS_FILE)))
+    results.save(output_dir)
+    logging.info("Stored {} ping record(s) from {} file(s) in {}".format(len(results), len(jobs), output_dir))
+
+    return results
+
+def load(output_dir, mmap=True):
+    "Load results stored by ingest(); columns are memory-mapped unless mmap is False"
+    _require_numpy()
+    with open(os.path.join(output_dir, 'nodes.json'), 'r') as nodes_file:
+        nodes = json.load(nodes_file)
+
+    mode = 'r' if mmap else None
+    columns = dict((name, numpy.load(os.path.join(output_dir, name + '.npy'), mmap_mode=mode))
+                   for name in COLUMNS)
+
+    return PingResults(nodes, columns, read_launch_windows(os.path.join(output_dir, 'launch-windows.txt')))
+
+
+class PingResults(object):
+    '''Ping records as columns of equal length; src and dst index into nodes.
+       launchWindows are the (start, end) windows in which the ping clients were launched.'''
+
+    def __init__(self, nodes, columns, launchWindows=None):
+        self.nodes = nodes
+        self.launchWindows = launchWindows if launchWindows is not None else []
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def save(self, output_dir):
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+
+        with open(os.path.join(output_dir, 'nodes.json'), 'w') as nodes_file:
+            json.dump(self.nodes, nodes_file)
+
+        for name in COLUMNS:
+            numpy.save(os.path.join(output_dir, name + '.npy'), getattr(self, name))
+
+        with open(os.path.join(output_dir, 'launch-windows.txt'), 'w') as windowsFile:
+            for start, end in self.launchWindows:
+                windowsFile.write("{:.6f} {:.6f}\n".format(start, end))
+
+    def _mask(self, src=None, dst=None):
+        mask = numpy.ones(len(self), dtype=bool)
+        if src is not None:
+            mask &= self.src == self.nodes.index(src)
+        if dst is not None:
+            mask &= self.dst == self.nodes.index(dst)
+        return mask
+
+    def inIntervals(self, intervals):
+        '''Mask of the records sent within any of the (start, end, ...) intervals,
+           e.g. those of ndn.overload_watchdog.read_intervals()'''
+        mask = numpy.zeros(len(self), dtype=bool)
+        for interval in intervals:
+            mask |= (self.timestamp >= interval[0]) & (self.timestamp <= interval[1])
+        return mask
+
+    def excluding(self, intervals):
+        "Return the records sent outside of the (start, end, ...) intervals"
+        mask = ~self.inIntervals(intervals)
+        return PingResults(self.nodes, dict((name, getattr(self, name)[mask]) for name in COLUMNS),
+                           self.launchWindows)
+
+    def loss(self, src=None, dst=None):
+        "Fraction of pings that timed out or were nacked, optionally for one source/destination"
+        timeout = self.timeout[self._mask(src, dst)]
+        if len(timeout) == 0:
+            return float('nan')
+        return float(numpy.count_nonzero(timeout)) / len(timeout)
+
+    def lossMatrix(self):
+        "Loss of every (src, dst) pair as a len(nodes) x len(nodes) array; NaN where nothing was sent"
+        n = len(self.nodes)
+        pair = self.src.astype(numpy.int64) * n + self.dst
+        sent = numpy.bincount(pair, minlength=n * n)
+        lost = numpy.bincount(pair, weights=self.timeout, minlength=n * n)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return (lost / sent).reshape(n, n)
+
+    def rttPercentiles(self, percentiles=(50, 90, 99), src=None, dst=None):
+        "RTT percentiles (ms) of the pings that received content"
+        rtt = self.rtt[self._mask(src, dst) & (self.timeout == 0)]
+        if len(rtt) == 0:
+            return [float('nan')] * len(percentiles)
+        return list(numpy.percentile(rtt, percentiles))
+
+    def availability(self, src=None, dst=None):
+        '''Per-second availability: returns (start second, fraction of pings answered in each
+           second since start)'''
+        mask = self._mask(src, dst)
+        seconds = numpy.floor(self.timestamp[mask]).astype(numpy.int64)
+        if len(seconds) == 0:
+            return 0, numpy.zeros(0)
+
+        start = seconds.min()
+        sent = numpy.bincount(seconds - start)
+        answered = numpy.bincount(seconds - start, weights=(self.timeout[mask] == 0), minlength=len(sent))
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return start, answered / sent
+
+    def pairStarts(self):
+        '''First record of every (src, dst) pair, aligned on the launch window it was scheduled in.
+           Returns (src, dst, first timestamp, seconds since the start of its launch window) arrays;
+           the offset is NaN when no launch window started before the first record.'''
+        n = len(self.nodes)
+        pair = self.src.astype(numpy.int64) * n + self.dst
+        pairs, inverse = numpy.unique(pair, return_inverse=True)
+        first = numpy.full(len(pairs), numpy.inf)
+        numpy.minimum.at(first, inverse, self.timestamp)
+
+        starts = numpy.array(sorted(start for start, end in self.launchWindows), dtype=float)
+        window = numpy.searchsorted(starts, first, side='right') - 1
+        offset = numpy.full(len(pairs), numpy.nan)
+        launched = window >= 0
+        offset[launched] = first[launched] - starts[window[launched]]
+
+        return pairs // n, pairs % n, first, offset
@@ -21,33 +21,140 @@
 # along with Mini-NDN, e.g., in COPYING.md file.
 # If not, see <http://www.gnu.org/licenses/>.
 
+import errno
+import glob
+import logging
+import os
+import re
+import struct
 import time
 
-from subprocess import call
-from threading import Timer
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-class ProcessMonitor:
-    def __init__(self, processId, processName, outputDir, interval=1):
-        self._processId = processId.strip()
-        self._processName = processName
-        self._statFile = "/proc/{}/stat".format(self._processId)
-        self._logFile = "{}/{}-{}-stat.txt".format(outputDir, self._processName, self._processId)
-        self._interval = interval
-
-    def _recordStats(self):
-        try:
-            with open(self._statFile, "r") as stat:
-                currentTime = int(time.time())
-                with open(self._logFile, "a") as log:
-                    for line in stat:
-                        log.write("{} {}".format(currentTime, line))
-        except IOError as e:
-            print "I/O error({0}): {1}".format(e.errno, e.strerror)
-            print "No process with PID={}".format(self._processId)
+from ndn.sampler import DEFAULT_FLUSH_INTERVAL, PeriodicSampler, append_records
+
+# Samples are stored as fixed-width little-endian records in <name>-<pid>.pstat files
+RECORD_FIELDS = ['timestamp', 'utime', 'stime', 'rss', 'vsize', 'num_threads',
+                 'voluntary_ctxt_switches', 'nonvoluntary_ctxt_switches']
+RECORD_STRUCT = struct.Struct('<d7Q')
+FILE_SUFFIX = '.pstat'
+
+_CTXT_RE = re.compile(r'^(voluntary_ctxt_switches|nonvoluntary_ctxt_switches):\s*(\d+)', re.M)
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+def parse_stat(stat):
+    '''Parse /proc/<pid>/stat into (utime, stime, rss, vsize, num_threads);
+       utime and stime are in clock ticks, rss and vsize in bytes'''
+    # The command name may contain spaces, so fields are counted from its closing parenthesis
+    fields = stat[stat.rindex(')') + 2:].split()
+    return (int(fields[11]), int(fields[12]), int(fields[21]) * _PAGE_SIZE,
+            int(fields[20]), int(fields[17]))
+
+def parse_status(status):
+    "Parse /proc/<pid>/status into (voluntary, nonvoluntary) context switches"
+    switches = dict(_CTXT_RE.findall(status))
+    return (int(switches.get('voluntary_ctxt_switches', 0)),
+            int(switches.get('nonvoluntary_ctxt_switches', 0)))
+
+def _read(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
+
+def load_samples(outputDir):
+    '''Load the samples written by ProcessSampler.
+       Returns a dict of (process name, pid) -> memory-mapped NumPy record array
+       with the RECORD_FIELDS columns.'''
+    if numpy is None:
+        raise ImportError("NumPy is required to load process samples")
+
+    dtype = numpy.dtype([('timestamp', '<f8')] + [(field, '<u8') for field in RECORD_FIELDS[1:]])
+    samples = {}
+    for path in glob.glob(os.path.join(outputDir, '*' + FILE_SUFFIX)):
+        name, pid = os.path.basename(path)[:-len(FILE_SUFFIX)].rsplit('-', 1)
+        if os.path.getsize(path) == 0:
+            samples[(name, int(pid))] = numpy.zeros(0, dtype=dtype)
+        else:
+            samples[(name, int(pid))] = numpy.memmap(path, dtype=dtype, mode='r')
+
+    return samples
+
+class ProcessSampler(PeriodicSampler):
+    '''Samples /proc/<pid>/stat and /proc/<pid>/status of many processes from a single thread.
+       Samples are parsed into fixed-width records (see RECORD_FIELDS), buffered in memory and
+       appended to <outputDir>/<name>-<pid>.pstat in bulk every flushInterval seconds and when
+       the sampler stops. Use load_samples() to read them back.'''
+
+    def __init__(self, outputDir, interval=1, flushInterval=DEFAULT_FLUSH_INTERVAL):
+        PeriodicSampler.__init__(self, outputDir, interval, flushInterval)
+
+        # pid -> name of the processes being sampled
+        self._processes = {}
+        # (name, pid) -> buffered records
+        self._buffers = {}
+
+    def add(self, processId, processName):
+        processId = str(processId).strip()
+        if processId == "":
             return
 
-        self.start() # Reschedule event
+        with self._lock:
+            self._processes[processId] = processName
+
+    def remove(self, processId):
+        with self._lock:
+            self._processes.pop(str(processId).strip(), None)
+
+    def sample(self):
+        with self._lock:
+            processes = self._processes.items()
+
+        currentTime = time.time()
+        exited = []
+        samples = []
+        for processId, processName in processes:
+            try:
+                stat = parse_stat(_read("/proc/{}/stat".format(processId)))
+                switches = parse_status(_read("/proc/{}/status".format(processId)))
+            except (OSError, IOError) as e:
+                if e.errno in (errno.ENOENT, errno.ESRCH):
+                    exited.append(processId)
+                    continue
+                raise
+
+            samples.append(((processName, processId), RECORD_STRUCT.pack(currentTime, *(stat + switches))))
+
+        with self._lock:
+            for key, record in samples:
+                self._buffers.setdefault(key, bytearray()).extend(record)
+            for processId in exited:
+                logging.debug("Process {} ({}) exited; no longer sampled".format(
+                    processId, self._processes.get(processId)))
+                self._processes.pop(processId, None)
+
+    def flush(self):
+        with self._lock:
+            buffers = self._buffers
+            self._buffers = {}
+
+        for (processName, processId), records in buffers.items():
+            logFile = "{}/{}-{}{}".format(self.outputDir, processName, processId, FILE_SUFFIX)
+            append_records(logFile, records)
+
+
+class ProcessMonitor:
+    "Samples a single process; kept for compatibility, use ProcessSampler for many processes"
+    def __init__(self, processId, processName, outputDir, interval=1):
+        self._sampler = ProcessSampler(outputDir, interval)
+        self._sampler.add(processId, processName)
 
     def start(self):
-        self._timer = Timer(self._interval, self._recordStats)
-        self._timer.start()
+        self._sampler.start()
+
+    def stop(self):
+        self._sampler.stop()
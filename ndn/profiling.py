@@ -0,0 +1,207 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import cProfile
+import logging
+import os
+import pstats
+import threading
+from contextlib import contextmanager
+
+from ndn import phases
+
+# Profile of the time after the last phase ended: the CLI and the teardown
+TEARDOWN = 'teardown'
+
+# Functions in which the orchestrator waits for the nodes or the clock,
+# e.g. Mininet's pty reads in Node.cmd() or the sleeps of the experiments
+BLOCKING_FUNCTIONS = frozenset(['sleep', 'read', 'select', 'poll', 'waitOutput', 'monitor',
+                                'communicate', 'wait', 'join', 'acquire'])
+
+def function_name(function):
+    "Format a pstats (file, line, name) key as file:line(name)"
+    if function is None:
+        return '?'
+    fileName, line, name = function
+    if fileName == '~':
+        return name
+    return "{}:{}({})".format(fileName, line, name)
+
+def is_blocking(function):
+    name = function[2]
+    # Built-ins are named like <time.sleep> or <method 'read' of 'file' objects>
+    if name.startswith('<'):
+        name = name.strip('<>').split("'")[1] if "'" in name else name.strip('<>').split('.')[-1]
+    return name in BLOCKING_FUNCTIONS
+
+def hot_call_sites(stats, count=20, blockingOnly=False):
+    '''Return the caller -> callee edges of pstats.Stats stats with the most cumulative time spent
+       in the callee on behalf of the caller, as (cumulative time, calls, caller, callee) tuples;
+       caller is None when cProfile did not see the caller's frame'''
+    sites = []
+    for callee, (primitiveCalls, calls, totalTime, cumulativeTime, callers) in stats.stats.items():
+        if blockingOnly and not is_blocking(callee):
+            continue
+        # Callers whose frame was entered before the profile was enabled, e.g. execute()
+        # when the phase changes, are not known to cProfile
+        if len(callers) == 0:
+            sites.append((cumulativeTime, calls, None, callee))
+        for caller, callerStats in callers.items():
+            # cProfile gives (primitive calls, calls, total time, cumulative time) per caller
+            sites.append((callerStats[3], callerStats[1], caller, callee))
+
+    sites.sort(key=lambda site: site[0], reverse=True)
+    return sites[:count]
+
+class PhaseProfiler(object):
+    '''Profiles the orchestrator with cProfile, with one profile per experiment phase.
+       The profiler follows the phases of timeline (see ndn.phases) in the thread that started it;
+       other threads doing work for the orchestrator, like the bring-up workers, are profiled
+       with thread() and added to the phase they ran in. Sampler threads are not profiled.'''
+
+    def __init__(self, outputDir, timeline=phases.timeline):
+        self.outputDir = outputDir
+        self.timeline = timeline
+        # Phase name -> profiles of the threads that ran in it
+        self.profiles = {}
+        self._profile = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _phase(self, name=None):
+        return TEARDOWN if name is None else name
+
+    def _newProfile(self, phase):
+        profile = cProfile.Profile()
+        with self._lock:
+            self.profiles.setdefault(phase, []).append(profile)
+        return profile
+
+    def _switch(self, name):
+        # cProfile only profiles the thread that enabled it
+        if threading.current_thread() is not self._thread:
+            return
+
+        if self._profile is not None:
+            self._profile.disable()
+        self._profile = self._newProfile(self._phase(name))
+        self._profile.enable()
+
+    def start(self):
+        self._thread = threading.current_thread()
+        self.timeline.listeners.append(self._switch)
+        self._switch(self.timeline.current())
+
+    def stop(self):
+        if self._switch in self.timeline.listeners:
+            self.timeline.listeners.remove(self._switch)
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile = None
+
+    @contextmanager
+    def thread(self):
+        "Profile the calling thread until the end of the block, as part of the current phase"
+        profile = self._newProfile(self._phase(self.timeline.current()))
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def stats(self, phase):
+        with self._lock:
+            profiles = [profile for profile in self.profiles.get(phase, [])
+                        if len(profile.getstats()) > 0]
+        if len(profiles) == 0:
+            return None
+
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def write(self, count=20):
+        '''Write <phase>.pstats for every phase, to be loaded with pstats or snakeviz, and
+           summary.txt with the hottest functions and (blocking) call sites of every phase'''
+        if not os.path.isdir(self.outputDir):
+            os.makedirs(self.outputDir)
+
+        with self._lock:
+            names = list(self.profiles)
+
+        # Phases in the order they were first entered, then the teardown
+        order = []
+        for name, start, end in self.timeline.phases:
+            if name not in order:
+                order.append(name)
+        names.sort(key=lambda name: order.index(name) if name in order else len(order))
+
+        with open(os.path.join(self.outputDir, 'summary.txt'), 'w') as summaryFile:
+            for name in names:
+                stats = self.stats(name)
+                if stats is None:
+                    continue
+
+                stats.dump_stats(os.path.join(self.outputDir, '{}.pstats'.format(name)))
+
+                summaryFile.write("== {}: {:.3f}s profiled\n\n".format(name, stats.total_tt))
+                summaryFile.write("Functions by own time:\n")
+                functions = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+                for function, (primitiveCalls, calls, totalTime, cumulativeTime, callers) in functions[:count]:
+                    summaryFile.write("  {:10.3f}s {:10.3f}s cum {:8d} calls  {}\n"
+                                      .format(totalTime, cumulativeTime, calls, function_name(function)))
+
+                summaryFile.write("\nBlocking call sites:\n")
+                for cumulativeTime, calls, caller, callee in hot_call_sites(stats, count, blockingOnly=True):
+                    summaryFile.write("  {:10.3f}s {:8d} calls  {} -> {}\n"
+                                      .format(cumulativeTime, calls, function_name(caller), function_name(callee)))
+                summaryFile.write("\n")
+
+    def logReport(self):
+        with self._lock:
+            names = list(self.profiles)
+        for name in names:
+            stats = self.stats(name)
+            if stats is None:
+                continue
+            sites = hot_call_sites(stats, 1, blockingOnly=True)
+            if len(sites) > 0:
+                logging.info("Profile of {}: {:.3f}s, most time blocked in {} -> {} ({:.3f}s)"
+                             .format(name, stats.total_tt, function_name(sites[0][2]),
+                                     function_name(sites[0][3]), sites[0][0]))
+            else:
+                logging.info("Profile of {}: {:.3f}s".format(name, stats.total_tt))
+
+# Profiler of the running emulation, set by minindn --profile
+profiler = None
+
+def thread():
+    "Profile the calling thread for the duration of the block if the emulation is profiled"
+    if profiler is None:
+        return _noProfile()
+    return profiler.thread()
+
+@contextmanager
+def _noProfile():
+    yield
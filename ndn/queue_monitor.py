@@ -0,0 +1,236 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import glob
+import json
+import logging
+import os
+import re
+import struct
+import subprocess
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ndn import link_monitor
+from ndn.sampler import DEFAULT_FLUSH_INTERVAL, PeriodicSampler, append_records
+
+# Counters of one qdisc, stored as fixed-width little-endian records in
+# <node>-<intf>-<kind>-<handle>.qstat files; backlog_* are gauges, the others cumulative
+RECORD_FIELDS = ['timestamp', 'sent_bytes', 'sent_packets', 'dropped', 'overlimits', 'requeues',
+                 'backlog_bytes', 'backlog_packets']
+RECORD_STRUCT = struct.Struct('<d7Q')
+FILE_SUFFIX = '.qstat'
+QDISCS_FILE = 'qdiscs.json'
+
+# Parameters that make Mininet build a link as a TCLink with shaping qdiscs
+SHAPING_PARAMS = ['bw', 'delay', 'jitter', 'loss', 'max_queue_size']
+
+_QDISC_RE = re.compile(r'^qdisc (\S+) (\S+): (?:dev (\S+) )?')
+_SENT_RE = re.compile(r'Sent (\d+) bytes (\d+) pkt \(dropped (\d+), overlimits (\d+) requeues (\d+)\)')
+_BACKLOG_RE = re.compile(r'backlog (\d+)(b|Kb|Mb) (\d+)p')
+_SIZE_UNITS = {'b': 1, 'Kb': 1024, 'Mb': 1024 * 1024}
+
+def parse_qdiscs(output, dev=None):
+    '''Parse `tc -s qdisc show [dev <dev>]` into a list of dicts with the dev, kind and
+       handle of every qdisc and its RECORD_FIELDS counters (but the timestamp)'''
+    qdiscs = []
+    qdisc = None
+    for line in output.splitlines():
+        match = _QDISC_RE.match(line)
+        if match is not None:
+            qdisc = {'kind': match.group(1), 'handle': match.group(2), 'dev': match.group(3) or dev}
+            qdisc.update((field, 0) for field in RECORD_FIELDS[1:])
+            qdiscs.append(qdisc)
+            continue
+        if qdisc is None:
+            continue
+
+        match = _SENT_RE.search(line)
+        if match is not None:
+            (qdisc['sent_bytes'], qdisc['sent_packets'], qdisc['dropped'],
+             qdisc['overlimits'], qdisc['requeues']) = [int(value) for value in match.groups()]
+
+        match = _BACKLOG_RE.search(line)
+        if match is not None:
+            qdisc['backlog_bytes'] = int(match.group(1)) * _SIZE_UNITS[match.group(2)]
+            qdisc['backlog_packets'] = int(match.group(3))
+
+    return qdiscs
+
+def qdisc_name(node, qdisc):
+    return "{}-{}-{}-{}".format(node, qdisc['dev'], qdisc['kind'], qdisc['handle'])
+
+def shaped_interfaces(links):
+    '''Return node name -> {interface: link name} for the interfaces of the links
+       (see ndn.link_monitor.find_links) that have shaping parameters'''
+    interfaces = {}
+    for link in links:
+        if not any(link['params'].get(param) not in (None, '') for param in SHAPING_PARAMS):
+            continue
+        interfaces.setdefault(link['node1'], {})[link['intf1']] = link['name']
+        interfaces.setdefault(link['node2'], {})[link['intf2']] = link['name']
+    return interfaces
+
+def load_series(outputDir):
+    '''Load the samples written by QueueSampler.
+       Returns a dict of qdisc name -> dict with the qdisc's 'link', 'node', 'dev', 'kind' and
+       NumPy arrays: timestamp, backlog_bytes and backlog_packets at every sample, and
+       sent_bps, dropped, overlimits and requeues per second since the previous sample.'''
+    if numpy is None:
+        raise ImportError("NumPy is required to load queue samples")
+
+    with open(os.path.join(outputDir, QDISCS_FILE)) as qdiscsFile:
+        qdiscs = json.load(qdiscsFile)
+
+    dtype = numpy.dtype([('timestamp', '<f8')] + [(field, '<u8') for field in RECORD_FIELDS[1:]])
+    series = {}
+    for path in glob.glob(os.path.join(outputDir, '*' + FILE_SUFFIX)):
+        name = os.path.basename(path)[:-len(FILE_SUFFIX)]
+        records = numpy.fromfile(path, dtype=dtype)
+        if len(records) < 2:
+            continue
+
+        elapsed = numpy.diff(records['timestamp'])
+        qdisc = dict(qdiscs.get(name, {}))
+        qdisc['timestamp'] = records['timestamp'][1:]
+        qdisc['backlog_bytes'] = records['backlog_bytes'][1:]
+        qdisc['backlog_packets'] = records['backlog_packets'][1:]
+        qdisc['sent_bps'] = numpy.diff(records['sent_bytes'].astype(numpy.int64)) * 8 / elapsed
+        for counter in ('dropped', 'overlimits', 'requeues'):
+            qdisc[counter] = numpy.diff(records[counter].astype(numpy.int64)) / elapsed
+        series[name] = qdisc
+
+    return series
+
+class QueueSampler(PeriodicSampler):
+    '''Samples the qdisc statistics (backlog, drops, overlimits) of every shaped (TCLink)
+       interface. Every tick, `tc -s qdisc show` runs in the network namespace of every node
+       with a shaped interface, all nodes at once and without going through the nodes' shells.
+       Samples are appended to <outputDir>/<node>-<intf>-<kind>-<handle>.qstat as fixed-width
+       records (see RECORD_FIELDS); qdiscs.json maps them to their link.'''
+
+    def __init__(self, outputDir, interval=1, flushInterval=DEFAULT_FLUSH_INTERVAL):
+        PeriodicSampler.__init__(self, outputDir, interval, flushInterval)
+
+        # node name -> {interface: link name} of the shaped interfaces
+        self.interfaces = {}
+        # node name -> pid of a process in the node's network namespace
+        self.nodePids = {}
+        # qdisc name -> description, written to qdiscs.json
+        self.qdiscs = {}
+
+        # qdisc name -> buffered records
+        self._buffers = {}
+        # qdisc name -> (first counters, last counters, peak backlog in packets)
+        self._stats = {}
+
+    def addLinks(self, net, links_conf):
+        with self._lock:
+            self.interfaces = shaped_interfaces(link_monitor.find_links(net, links_conf))
+            for node in net.hosts + net.switches:
+                if node.name in self.interfaces:
+                    self.nodePids[node.name] = node.pid
+
+    def command(self, nodeName):
+        "Command printing the qdisc statistics of a node"
+        return ['mnexec', '-a', str(self.nodePids[nodeName]), 'tc', '-s', 'qdisc', 'show']
+
+    def sample(self):
+        with self._lock:
+            nodes = list(self.nodePids)
+
+        currentTime = time.time()
+        processes = []
+        for nodeName in nodes:
+            try:
+                processes.append((nodeName, subprocess.Popen(self.command(nodeName), stdout=subprocess.PIPE,
+                                                             stderr=subprocess.PIPE)))
+            except OSError as e:
+                logging.debug("Cannot read the qdiscs of {}: {}".format(nodeName, e))
+
+        samples = []
+        for nodeName, process in processes:
+            output, _ = process.communicate()
+            if process.returncode != 0:
+                continue
+
+            interfaces = self.interfaces[nodeName]
+            for qdisc in parse_qdiscs(output):
+                if qdisc['dev'] in interfaces:
+                    samples.append((nodeName, interfaces[qdisc['dev']], qdisc))
+
+        with self._lock:
+            newQdiscs = False
+            for nodeName, linkName, qdisc in samples:
+                name = qdisc_name(nodeName, qdisc)
+                if name not in self.qdiscs:
+                    self.qdiscs[name] = {'link': linkName, 'node': nodeName, 'dev': qdisc['dev'],
+                                         'kind': qdisc['kind'], 'handle': qdisc['handle']}
+                    newQdiscs = True
+
+                counters = [qdisc[field] for field in RECORD_FIELDS[1:]]
+                self._buffers.setdefault(name, bytearray()).extend(RECORD_STRUCT.pack(currentTime, *counters))
+
+                first, last, peak = self._stats.get(name, (counters, counters, 0))
+                self._stats[name] = (first, counters, max(peak, qdisc['backlog_packets']))
+
+            if newQdiscs:
+                with open(os.path.join(self.outputDir, QDISCS_FILE), "w") as qdiscsFile:
+                    json.dump(self.qdiscs, qdiscsFile, indent=2, sort_keys=True)
+
+    def flush(self):
+        with self._lock:
+            buffers = self._buffers
+            self._buffers = {}
+
+        for name, records in buffers.items():
+            append_records("{}/{}{}".format(self.outputDir, name, FILE_SUFFIX), records)
+
+    def summary(self):
+        "Return qdisc name -> link, peak backlog (packets), drops and overlimits since the first sample"
+        dropped = RECORD_FIELDS.index('dropped') - 1
+        overlimits = RECORD_FIELDS.index('overlimits') - 1
+        with self._lock:
+            summary = {}
+            for name, (first, last, peak) in self._stats.items():
+                summary[name] = {
+                    'link': self.qdiscs[name]['link'],
+                    'peak_backlog_packets': peak,
+                    'dropped': last[dropped] - first[dropped],
+                    'overlimits': last[overlimits] - first[overlimits]
+                }
+            return summary
+
+    def logReport(self, count=5):
+        congested = [(name, qdisc) for name, qdisc in self.summary().items() if qdisc['dropped'] > 0]
+        if len(congested) == 0:
+            logging.info("No packet dropped by the shaped links' queues")
+            return
+
+        for name, qdisc in sorted(congested, key=lambda item: item[1]['dropped'], reverse=True)[:count]:
+            logging.info("Queue {} of link {}: {} drops, {} overlimits, peak backlog {} packets".format(
+                name, qdisc['link'], qdisc['dropped'], qdisc['overlimits'], qdisc['peak_backlog_packets']))
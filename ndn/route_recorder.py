@@ -0,0 +1,217 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import glob
+import logging
+import os
+import re
+import subprocess
+import time
+
+from ndn import fib
+from ndn.nfd_counters import status_command
+from ndn.sampler import DEFAULT_FLUSH_INTERVAL, PeriodicSampler
+
+FIB = 'fib'
+RIB = 'rib'
+FILE_SUFFIX = '.routes'
+
+ADD = '+'
+REMOVE = '-'
+COST = '~'
+
+# RIB lines of `nfd-status -r`:
+#   /ndn/edu/b route={faceid=262 (origin=128 cost=10 flags=ChildInherit), faceid=263 (origin=128 cost=20 ...)}
+# and of `nfdc route list`:
+#   prefix=/ndn/edu/b nexthop=262 origin=nlsr cost=10 flags=child-inherit expires=never
+_ROUTES_RE = re.compile(r'^\s*(\S+)\s+routes?=\{(.*)\}\s*$')
+_ROUTE_RE = re.compile(r'faceid=(\d+)\s+\([^)]*cost=(\d+)')
+_ROUTE_LINE_RE = re.compile(r'^\s*prefix=(\S+)\s+nexthop=(\d+)\s+.*\bcost=(\d+)')
+
+def snapshot_commands(version):
+    "Commands printing the FIB and the RIB of a forwarder of the given NFD version"
+    if status_command(version)[0] == 'nfdc':
+        return {FIB: ['nfdc', 'fib', 'list'], RIB: ['nfdc', 'route', 'list']}
+    return {FIB: ['nfd-status', '-b'], RIB: ['nfd-status', '-r']}
+
+def parse_rib(output):
+    '''Parse the RIB of nfd-status or nfdc output into a fib.Fib (name prefix -> {face id: cost});
+       a face registered by several origins keeps its lowest cost'''
+    entries = {}
+    for line in output.splitlines():
+        routes = []
+        match = _ROUTES_RE.match(line)
+        if match is not None:
+            routes = [(match.group(1), face, cost) for face, cost in _ROUTE_RE.findall(match.group(2))]
+        else:
+            match = _ROUTE_LINE_RE.match(line)
+            if match is not None:
+                routes = [match.groups()]
+
+        for prefix, face, cost in routes:
+            nexthops = entries.setdefault(prefix, {})
+            nexthops[int(face)] = min(int(cost), nexthops.get(int(face), int(cost)))
+
+    return fib.Fib(entries)
+
+PARSERS = {FIB: fib.parse, RIB: parse_rib}
+
+def diff(old, new):
+    "Return the (operation, prefix, face id, cost) changes turning the old table into the new one"
+    changes = []
+    for prefix in sorted(old.prefixes() | new.prefixes()):
+        oldNexthops = old.nexthops(prefix)
+        newNexthops = new.nexthops(prefix)
+        for face in sorted(set(oldNexthops) | set(newNexthops)):
+            if face not in newNexthops:
+                changes.append((REMOVE, prefix, face, None))
+            elif face not in oldNexthops:
+                changes.append((ADD, prefix, face, newNexthops[face]))
+            elif oldNexthops[face] != newNexthops[face]:
+                changes.append((COST, prefix, face, newNexthops[face]))
+    return changes
+
+def apply_changes(entries, changes):
+    "Apply (operation, prefix, face id, cost) changes to a dict of prefix -> {face id: cost}"
+    for operation, prefix, face, cost in changes:
+        if operation == REMOVE:
+            nexthops = entries.get(prefix, {})
+            nexthops.pop(face, None)
+            if len(nexthops) == 0:
+                entries.pop(prefix, None)
+        else:
+            entries.setdefault(prefix, {})[face] = cost
+
+def format_change(timestamp, table, change):
+    operation, prefix, face, cost = change
+    return "{:.3f} {} {} {} {} {}\n".format(timestamp, table, operation, prefix, face, "-" if cost is None else cost)
+
+def parse_change(line):
+    "Parse a line written by format_change() into (timestamp, table, (operation, prefix, face id, cost))"
+    timestamp, table, operation, prefix, face, cost = line.split()
+    return float(timestamp), table, (operation, prefix, int(face), None if cost == "-" else int(cost))
+
+class RouteHistory(object):
+    '''Reads the changes written by RouteRecorder and reconstructs the FIB or RIB
+       of any node at any time'''
+
+    def __init__(self, outputDir):
+        # node name -> [(timestamp, table, change)] in time order
+        self.changes = {}
+        for path in glob.glob(os.path.join(outputDir, '*' + FILE_SUFFIX)):
+            with open(path) as routesFile:
+                self.changes[os.path.basename(path)[:-len(FILE_SUFFIX)]] = [parse_change(line) for line in routesFile]
+
+    def nodes(self):
+        return sorted(self.changes)
+
+    def tableAt(self, node, timestamp, table=FIB):
+        "Return the node's table (a fib.Fib) as it was last seen at or before timestamp"
+        entries = {}
+        apply_changes(entries, [change for changeTime, changeTable, change in self.changes.get(node, [])
+                                if changeTable == table and changeTime <= timestamp])
+        return fib.Fib(entries)
+
+    def changeTimes(self, node, table=FIB):
+        "Timestamps at which the node's table was seen changing"
+        return sorted(set(changeTime for changeTime, changeTable, change in self.changes.get(node, [])
+                          if changeTable == table))
+
+class RouteRecorder(PeriodicSampler):
+    '''Snapshots the FIB and RIB of every node periodically, all nodes in parallel, and appends
+       only the changes from the previous snapshot (nexthops added or removed and cost changes)
+       to <outputDir>/<node>.routes. The first snapshot of a node is recorded as additions.
+       Use RouteHistory to reconstruct the tables.'''
+
+    def __init__(self, outputDir, interval=1, flushInterval=DEFAULT_FLUSH_INTERVAL, nfdVersion=None):
+        PeriodicSampler.__init__(self, outputDir, interval, flushInterval)
+        self.commands = snapshot_commands(nfdVersion)
+
+        # node name -> home folder
+        self.homeFolders = {}
+        # (node name, table) -> last fib.Fib seen
+        self.tables = {}
+
+        # node name -> buffered lines
+        self._buffers = {}
+        # node name -> (number of changes, last change time)
+        self._stats = {}
+
+    def addHosts(self, hosts):
+        with self._lock:
+            for host in hosts:
+                self.homeFolders[host.name] = host.homeFolder
+
+    def sample(self):
+        with self._lock:
+            homeFolders = self.homeFolders.items()
+
+        # The commands talk to each node's NFD through its Unix socket, see ndn.nfd_counters
+        processes = []
+        for hostName, homeFolder in homeFolders:
+            env = dict(os.environ)
+            env['HOME'] = homeFolder
+            for table, command in self.commands.items():
+                try:
+                    processes.append((hostName, table, subprocess.Popen(command, stdout=subprocess.PIPE,
+                                                                        stderr=subprocess.PIPE, env=env)))
+                except OSError as e:
+                    logging.debug("Cannot read the {} of {}: {}".format(table, hostName, e))
+
+        snapshots = []
+        for hostName, table, process in processes:
+            output, _ = process.communicate()
+            # The forwarder of a failed node is not running; its tables are unknown rather than empty
+            if process.returncode == 0:
+                snapshots.append((hostName, table, time.time(), PARSERS[table](output)))
+
+        with self._lock:
+            for hostName, table, timestamp, snapshot in snapshots:
+                changes = diff(self.tables.get((hostName, table), fib.Fib()), snapshot)
+                self.tables[(hostName, table)] = snapshot
+                if len(changes) == 0:
+                    continue
+
+                self._buffers.setdefault(hostName, []).extend(format_change(timestamp, table, change)
+                                                              for change in changes)
+                count = self._stats.get(hostName, (0, None))[0]
+                self._stats[hostName] = (count + len(changes), timestamp)
+
+    def flush(self):
+        with self._lock:
+            buffers = self._buffers
+            self._buffers = {}
+
+        for hostName, lines in buffers.items():
+            with open(os.path.join(self.outputDir, hostName + FILE_SUFFIX), "a") as routesFile:
+                routesFile.write("".join(lines))
+
+    def logReport(self):
+        with self._lock:
+            stats = dict(self._stats)
+        if len(stats) == 0:
+            return
+
+        lastChange = max(stats.items(), key=lambda item: item[1][1])
+        logging.info("Routes: {} change(s) on {} node(s), last one on {} at {:.3f}".format(
+            sum(count for count, timestamp in stats.values()), len(stats), lastChange[0], lastChange[1][1]))
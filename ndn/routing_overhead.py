@@ -0,0 +1,343 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+import signal
+import struct
+import time
+from multiprocessing import Pool
+
+from ndn import phases
+
+NDN_PORT = 6363
+SNAPLEN = 512
+CAPTURE_FILE = 'routing-overhead.pcap'
+CAPTURE_LOG = 'tcpdump.log'
+# Seconds after which a tcpdump that exited is reported as failed
+START_CHECK_DELAY = 1
+SUMMARY_FILE = 'summary.json'
+
+# NLSR namespaces, identified by the component following the NLSR component of a name:
+#   hello: /<router>/NLSR/INFO/<neighbor>, lsa: /localhop/<network>/NLSR/LSA/...,
+#   sync: /localhop/<network>/NLSR/sync/... (ChronoSync) or .../nlsr/sync/... (PSync)
+NAMESPACES = {'INFO': 'hello', 'LSA': 'lsa', 'sync': 'sync'}
+
+_TLV_INTEREST = 0x05
+_TLV_DATA = 0x06
+_TLV_NAME = 0x07
+_TLV_LP_PACKET = 0x64
+_TLV_LP_FRAGMENT = 0x50
+_TLV_LP_NACK = 0x0320
+
+_LINKTYPE_ETHERNET = 1
+_LINKTYPE_LINUX_SLL = 113
+# Written by tcpdump 4.99 and later for `-i any`
+_LINKTYPE_LINUX_SLL2 = 276
+_LINKTYPES = (_LINKTYPE_ETHERNET, _LINKTYPE_LINUX_SLL, _LINKTYPE_LINUX_SLL2)
+_SLL_OUTGOING = 4
+_ETHERTYPE_IPV4 = 0x0800
+_ETHERTYPE_IPV6 = 0x86DD
+_ETHERTYPE_NDN = 0x8624
+
+def _read_number(buf, offset):
+    "Read a TLV variable-length number; returns (value, next offset)"
+    first = buf[offset]
+    if first < 253:
+        return first, offset + 1
+    size = {253: 2, 254: 4, 255: 8}[first]
+    value = 0
+    for byte in buf[offset + 1:offset + 1 + size]:
+        value = (value << 8) | byte
+    return value, offset + 1 + size
+
+def _read_tlvs(buf, offset, end):
+    "Yield the (type, value start, value end) of the TLV elements in buf[offset:end]; ends at truncation"
+    end = min(end, len(buf))
+    while offset < end:
+        try:
+            tlvType, offset = _read_number(buf, offset)
+            length, offset = _read_number(buf, offset)
+        except (IndexError, KeyError):
+            return
+        yield tlvType, offset, offset + length
+        offset += length
+
+def parse_ndn_packet(payload):
+    '''Parse an NDN packet, possibly in an NDNLPv2 LpPacket, into (kind, name components);
+       kind is 'interest', 'data' or 'nack'. Returns None for other packets (e.g. IDLE LpPackets).
+       Names cut by a short capture are returned up to the last complete component.'''
+    buf = bytearray(payload)
+    element = next(_read_tlvs(buf, 0, len(buf)), None)
+    if element is None:
+        return None
+    tlvType, start, end = element
+
+    if tlvType == _TLV_LP_PACKET:
+        isNack = False
+        for fieldType, fieldStart, fieldEnd in _read_tlvs(buf, start, end):
+            if fieldType == _TLV_LP_NACK:
+                isNack = True
+            elif fieldType == _TLV_LP_FRAGMENT:
+                packet = parse_ndn_packet(buf[fieldStart:fieldEnd])
+                if packet is not None and isNack:
+                    return 'nack', packet[1]
+                return packet
+        return None
+
+    if tlvType == _TLV_INTEREST:
+        kind = 'interest'
+    elif tlvType == _TLV_DATA:
+        kind = 'data'
+    else:
+        return None
+
+    # The name is the first element of both Interests and Data
+    components = []
+    field = next(_read_tlvs(buf, start, end), None)
+    if field is not None and field[0] == _TLV_NAME:
+        for componentType, componentStart, componentEnd in _read_tlvs(buf, field[1], field[2]):
+            if componentEnd > len(buf):
+                break
+            components.append(str(buf[componentStart:componentEnd]))
+    return kind, components
+
+def classify(components):
+    "Return the NLSR namespace (hello, lsa or sync) of a name, or None"
+    for i, component in enumerate(components[:-1]):
+        if component in ('NLSR', 'nlsr'):
+            return NAMESPACES.get(components[i + 1])
+    return None
+
+def read_pcap(path):
+    '''Yield (timestamp, outgoing, NDN payload, NDN packet size) of the NDN packets of a pcap file.
+       outgoing is None when the capture does not say (not a `-i any` capture).'''
+    with open(path, 'rb') as pcap:
+        header = pcap.read(24)
+        if len(header) < 24:
+            return
+
+        magic = struct.unpack('<I', header[:4])[0]
+        endian = '<' if magic in (0xa1b2c3d4, 0xa1b23c4d) else '>'
+        resolution = 1e-9 if magic in (0xa1b23c4d, 0x4d3cb2a1) else 1e-6
+        linkType = struct.unpack(endian + 'I', header[20:24])[0]
+        if linkType not in _LINKTYPES:
+            logging.warning("Cannot decode {}: unknown link type {}".format(path, linkType))
+            return
+        recordHeader = struct.Struct(endian + 'IIII')
+
+        while True:
+            record = pcap.read(recordHeader.size)
+            if len(record) < recordHeader.size:
+                return
+            seconds, fraction, capturedLength, length = recordHeader.unpack(record)
+            data = bytearray(pcap.read(capturedLength))
+
+            try:
+                outgoing, payloadOffset, size = _parse_headers(data, linkType, length)
+            except IndexError:
+                # Truncated headers
+                continue
+            if payloadOffset is not None:
+                yield seconds + fraction * resolution, outgoing, data[payloadOffset:], size
+
+def _parse_headers(data, linkType, length):
+    '''Return (outgoing, offset of the NDN packet, NDN packet size) of a captured frame;
+       the offset is None if the frame does not carry an NDN packet over Ethernet or UDP'''
+    outgoing = None
+    if linkType == _LINKTYPE_LINUX_SLL:
+        outgoing = ((data[0] << 8) | data[1]) == _SLL_OUTGOING
+        etherType, offset = (data[14] << 8) | data[15], 16
+    elif linkType == _LINKTYPE_LINUX_SLL2:
+        outgoing = data[10] == _SLL_OUTGOING
+        etherType, offset = (data[0] << 8) | data[1], 20
+    elif linkType == _LINKTYPE_ETHERNET:
+        etherType, offset = (data[12] << 8) | data[13], 14
+    else:
+        return outgoing, None, 0
+
+    if etherType == _ETHERTYPE_NDN:
+        return outgoing, offset, length - offset
+
+    if etherType == _ETHERTYPE_IPV4:
+        protocol, offset = data[offset + 9], offset + (data[offset] & 0x0f) * 4
+    elif etherType == _ETHERTYPE_IPV6:
+        protocol, offset = data[offset + 6], offset + 40
+    else:
+        return outgoing, None, 0
+
+    if protocol != 17:
+        return outgoing, None, 0
+    return outgoing, offset + 8, ((data[offset + 4] << 8) | data[offset + 5]) - 8
+
+def count_file(job):
+    '''Count the NLSR packets and bytes of a capture per second; run in a worker process.
+       Returns {(second, namespace, kind, outgoing): [packets, bytes]}.'''
+    path = job
+    counts = {}
+    for timestamp, outgoing, payload, size in read_pcap(path):
+        packet = parse_ndn_packet(payload)
+        if packet is None:
+            continue
+        namespace = classify(packet[1])
+        if namespace is None:
+            continue
+
+        count = counts.setdefault((int(timestamp), namespace, packet[0], outgoing), [0, 0])
+        count[0] += 1
+        count[1] += size
+    return counts
+
+def summarize(counts, timeline):
+    '''Aggregate the per-second counts of every node by phase.
+       counts maps node -> count_file() result. Returns phase -> {'hosts': {node: usage},
+       'total': usage}, where usage maps every namespace and 'all' to packets and bytes
+       sent per second over the phase.'''
+    durations = {}
+    for name, start, end in timeline.phases:
+        if end is not None:
+            durations[name] = durations.get(name, 0.0) + end - start
+
+    summary = {}
+    for node, nodeCounts in counts.items():
+        for (second, namespace, kind, outgoing), (packets, size) in nodeCounts.items():
+            # Every packet is sent by one node and received by another; count what is sent
+            if outgoing is False:
+                continue
+            phase = timeline.at(second + 0.5)
+            if phase is None or phase not in durations:
+                continue
+
+            phaseSummary = summary.setdefault(phase, {'hosts': {}, 'total': {}})
+            for usage in (phaseSummary['hosts'].setdefault(node, {}), phaseSummary['total']):
+                for key in (namespace, 'all'):
+                    entry = usage.setdefault(key, {'packets': 0, 'bytes': 0, 'interest': 0, 'data': 0, 'nack': 0})
+                    entry['packets'] += packets
+                    entry['bytes'] += size
+                    entry[kind] += packets
+
+    for phase, phaseSummary in summary.items():
+        for usage in phaseSummary['hosts'].values() + [phaseSummary['total']]:
+            for entry in usage.values():
+                entry['packets_per_second'] = entry['packets'] / durations[phase]
+                entry['bytes_per_second'] = entry['bytes'] / durations[phase]
+
+    return summary
+
+class RoutingOverheadMeter(object):
+    '''Measures NLSR's control-plane traffic (sync, LSA and hello Interests, Data and Nacks)
+       on every node. NFD has no per-name counters and NLSR's logs have no sizes, so every
+       node runs a small-snaplen tcpdump on its NDN traffic; the captures are decoded after
+       the experiment and aggregated per second and per experiment phase (see ndn.phases).'''
+
+    def __init__(self, outputDir, parameters=None, timeline=None):
+        self.outputDir = outputDir
+        # Run parameters, e.g. the NLSR options, stored with the summary to compare runs
+        self.parameters = parameters if parameters is not None else {}
+        self.timeline = phases.timeline if timeline is None else timeline
+
+        # host name -> (capture file, tcpdump process)
+        self.captures = {}
+
+        if not os.path.isdir(self.outputDir):
+            os.makedirs(self.outputDir)
+
+    def captureFile(self, hostName):
+        return os.path.join(self.outputDir, '{}-{}'.format(hostName, CAPTURE_FILE))
+
+    def captureLog(self, hostName):
+        return os.path.join(self.outputDir, '{}-{}'.format(hostName, CAPTURE_LOG))
+
+    def start(self, hosts):
+        "Start a capture on every node; returns the names of the nodes whose capture failed to start"
+        for host in hosts:
+            captureFile = self.captureFile(host.name)
+            # -Z root: tcpdump would otherwise drop to the tcpdump user, e.g. on Debian and Ubuntu,
+            # before it opens the capture file and fail to create it in the root-owned directory
+            command = ['tcpdump', '-i', 'any', '-s', str(SNAPLEN), '-U', '-Z', 'root', '-w', captureFile,
+                       'udp port {} or ether proto 0x{:04x}'.format(NDN_PORT, _ETHERTYPE_NDN)]
+            with open(os.devnull, 'w') as devnull, open(self.captureLog(host.name), 'w') as logFile:
+                # Keep the capture out of CpuLimitedNdnHost's CPU budget
+                process = host.popen(command, stdout=devnull, stderr=logFile,
+                                     mncmd=['mnexec', '-da', str(host.pid)])
+            self.captures[host.name] = (captureFile, process)
+
+        time.sleep(START_CHECK_DELAY)
+        failed = sorted(name for name, (captureFile, process) in self.captures.items() if process.poll() is not None)
+        for name in failed:
+            with open(self.captureLog(name)) as logFile:
+                error = logFile.read().strip()
+            logging.error("Routing overhead capture on {} failed: {}".format(name, error))
+        return failed
+
+    def stop(self):
+        for captureFile, process in self.captures.values():
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+        for captureFile, process in self.captures.values():
+            process.wait()
+
+    def analyze(self, processes=None):
+        '''Decode the captures with a process pool, write every node's per-second counts to
+           <node>-routing-overhead.txt and the per-phase summary to summary.json.
+           Returns the summary.'''
+        hostNames = sorted(name for name, (captureFile, process) in self.captures.items()
+                           if os.path.isfile(captureFile))
+        missing = sorted(set(self.captures).difference(hostNames))
+        if len(missing) > 0:
+            logging.warning("No routing overhead capture of {}; see their {} in {}".format(
+                ', '.join(missing), CAPTURE_LOG, self.outputDir))
+
+        pool = Pool(processes)
+        try:
+            counts = dict(zip(hostNames, pool.map(count_file, [self.captureFile(name) for name in hostNames])))
+        finally:
+            pool.close()
+            pool.join()
+
+        for hostName, nodeCounts in counts.items():
+            with open(os.path.join(self.outputDir, '{}-routing-overhead.txt'.format(hostName)), 'w') as countsFile:
+                for key in sorted(nodeCounts):
+                    second, namespace, kind, outgoing = key
+                    direction = {True: 'out', False: 'in', None: '-'}[outgoing]
+                    countsFile.write("{} {} {} {} {} {}\n".format(second, namespace, kind, direction,
+                                                                  nodeCounts[key][0], nodeCounts[key][1]))
+
+        summary = summarize(counts, self.timeline)
+        with open(os.path.join(self.outputDir, SUMMARY_FILE), 'w') as summaryFile:
+            json.dump({'parameters': self.parameters, 'phases': summary, 'missing_captures': missing},
+                      summaryFile, indent=2, sort_keys=True)
+
+        logged = set()
+        for phase in [name for name, start, end in self.timeline.phases]:
+            if phase not in summary or phase in logged:
+                continue
+            logged.add(phase)
+            total = summary[phase]['total']
+            logging.info("Routing overhead during {}: {}".format(phase, ", ".join(
+                "{} {:.1f} pkt/s {:.1f} KB/s".format(namespace, total[namespace]['packets_per_second'],
+                                                     total[namespace]['bytes_per_second'] / 1024.0)
+                for namespace in sorted(total))))
+
+        return summary
@@ -0,0 +1,95 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+import threading
+import time
+
+MIN_INTERVAL = 0.1
+DEFAULT_FLUSH_INTERVAL = 10
+
+class PeriodicSampler(object):
+    '''Base class of the experiment samplers. sample() is called from a single thread at a
+       fixed rate and flush() every flushInterval seconds and once more when the sampler stops.
+       Subclasses override sample(), or pass the function to call instead, buffer their
+       samples in memory under self._lock and write them in flush().'''
+
+    def __init__(self, outputDir, interval=1, flushInterval=DEFAULT_FLUSH_INTERVAL, sampleFunction=None):
+        if sampleFunction is None and type(self).sample.__func__ is PeriodicSampler.sample.__func__:
+            raise ValueError("{} neither overrides sample() nor has a sample function".format(type(self).__name__))
+
+        self.outputDir = outputDir
+        self.interval = max(MIN_INTERVAL, float(interval))
+        self.flushInterval = flushInterval
+        self.sampleFunction = sampleFunction
+
+        self._lock = threading.Lock()
+        self._stopEvent = threading.Event()
+        self._thread = None
+
+        if not os.path.isdir(self.outputDir):
+            os.makedirs(self.outputDir)
+
+    def start(self):
+        self._stopEvent.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopEvent.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        next_sample = time.time()
+        last_flush = next_sample
+        while True:
+            # Keep a fixed rate: the next tick does not drift by the time spent sampling
+            next_sample += self.interval
+            if self._stopEvent.wait(max(0, next_sample - time.time())):
+                return
+
+            # A failed sample is lost, not the samples that follow it
+            try:
+                self.sample()
+            except Exception:
+                logging.exception("{} failed to sample".format(type(self).__name__))
+
+            if time.time() - last_flush >= self.flushInterval:
+                self.flush()
+                last_flush = time.time()
+
+    def sample(self):
+        self.sampleFunction()
+
+    def flush(self):
+        pass
+
+def append_records(logFile, records):
+    "Append a buffer of binary records to logFile"
+    with open(logFile, "ab") as log:
+        log.write(records)
@@ -0,0 +1,129 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+MAIN_TRACK = 'main'
+PHASES_TRACK = 'phases'
+
+class Tracer(object):
+    '''Records timing spans of the orchestrator, e.g. Topology build or a host's NLSR start.
+       A span belongs to a track, shown as one row in the trace viewer: the main track for the
+       pipeline and one track per host for per-host work. Spans of a track nest by time.
+       export() writes the Chrome trace-event format (chrome://tracing, Perfetto).'''
+
+    def __init__(self):
+        # [name, track, start, end, args]; end is None while the span is open
+        self.spans = []
+        # (name, track, timestamp, args)
+        self.instants = []
+        self._lock = threading.Lock()
+
+    def begin(self, name, track=MAIN_TRACK, **args):
+        span = [name, track, time.time(), None, args]
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def end(self, span):
+        span[3] = time.time()
+
+    @contextmanager
+    def span(self, name, track=MAIN_TRACK, **args):
+        span = self.begin(name, track, **args)
+        try:
+            yield span
+        finally:
+            self.end(span)
+
+    def instant(self, name, track=MAIN_TRACK, **args):
+        "Record an event without duration, e.g. a node failure"
+        with self._lock:
+            self.instants.append((name, track, time.time(), args))
+
+    def duration(self, name, track=MAIN_TRACK):
+        "Total duration of the closed spans with the given name on a track"
+        with self._lock:
+            return sum(end - start for spanName, spanTrack, start, end, args in self.spans
+                       if spanName == name and spanTrack == track and end is not None)
+
+    def events(self, timeline=None):
+        '''Return the spans and instants as Chrome trace events; the phases of timeline
+           (see ndn.phases), if given, are added as spans of the phases track'''
+        with self._lock:
+            spans = [list(span) for span in self.spans]
+            instants = list(self.instants)
+
+        if timeline is not None:
+            spans += [[name, PHASES_TRACK, start, end, {}] for name, start, end in timeline.phases]
+
+        # The main and phases tracks come first, then the hosts in name order
+        tracks = [MAIN_TRACK, PHASES_TRACK] + sorted(set(span[1] for span in spans + instants)
+                                                     .difference([MAIN_TRACK, PHASES_TRACK]))
+        tids = dict((track, i) for i, track in enumerate(tracks))
+
+        now = time.time()
+        events = []
+        for track in tracks:
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 0, 'tid': tids[track], 'args': {'name': track}})
+            events.append({'name': 'thread_sort_index', 'ph': 'M', 'pid': 0, 'tid': tids[track],
+                           'args': {'sort_index': tids[track]}})
+
+        for name, track, start, end, args in spans:
+            events.append({'name': name, 'cat': track, 'ph': 'X', 'pid': 0, 'tid': tids[track],
+                           'ts': int(start * 1e6), 'dur': int(((now if end is None else end) - start) * 1e6),
+                           'args': args})
+        for name, track, timestamp, args in instants:
+            events.append({'name': name, 'cat': track, 'ph': 'i', 's': 'g', 'pid': 0, 'tid': tids[track],
+                           'ts': int(timestamp * 1e6), 'args': args})
+
+        return events
+
+    def export(self, fileName, timeline=None):
+        with open(fileName, 'w') as traceFile:
+            json.dump({'traceEvents': self.events(timeline), 'displayTimeUnit': 'ms'}, traceFile)
+
+    def logReport(self):
+        "Log the duration of the spans of the main track"
+        with self._lock:
+            spans = [span for span in self.spans if span[1] == MAIN_TRACK and span[3] is not None]
+        for name, track, start, end, args in spans:
+            logging.info("{}: {:.3f}s".format(name, end - start))
+
+def read(fileName):
+    "Read the events of a trace written by Tracer.export()"
+    with open(fileName) as traceFile:
+        return json.load(traceFile)['traceEvents']
+
+# Tracer of the running emulation
+tracer = Tracer()
+
+def span(name, track=MAIN_TRACK, **args):
+    return tracer.span(name, track, **args)
+
+def instant(name, track=MAIN_TRACK, **args):
+    tracer.instant(name, track, **args)
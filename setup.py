@@ -8,9 +8,15 @@ setup(
     name = "Mini-NDN",
     version = VERSION_NUMBER,
     packages = find_packages(),
+    extras_require = {
+        # The monitors' load_samples() and ping_results need NumPy
+        'analysis': ['numpy'],
+    },
+    tests_require = ['mock', 'pytest'],
     entry_points={
         'console_scripts': [
             'minindn = bin.main:main',
+            'minindn-ping-results = bin.ping_results:main',
         ],
         'gui_scripts': [
             'minindnedit = bin.minindnedit:main',
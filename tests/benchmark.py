@@ -0,0 +1,253 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+'''Benchmark of the orchestration of Mini-NDN on synthetic topologies.
+
+Runs the configuration parsing, the Topology, the host construction, the IP assignment,
+the NFD and NLSR bring-up and the scheduling of an experiment's ping servers and clients
+on MockNdnHost nodes running ndn.nfd.Nfd (see tests/mock.py), so that it needs neither
+root nor Mininet.
+For every topology size and phase it reports the wall time, the peak memory of the
+process and the number of shell commands (and sudo commands) sent to the nodes.
+
+    python -m tests.benchmark --sizes 10,100,1000 --output baseline.json
+    python -m tests.benchmark --sizes 10,100,1000 --baseline baseline.json
+'''
+
+from __future__ import absolute_import
+
+import json
+import logging
+import multiprocessing
+import optparse
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import minindn.config
+from minindn.topology import Topology
+from ndn import nlsr
+from ndn.bring_up import BringUp
+from ndn.experiments.experiment import Experiment
+from ndn.ndn_host import assign_ips, make_home_folders
+from tests.mock import MockMininet, patch_nfd
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+PHASES = ['config', 'topology', 'hosts', 'ips', 'nlsr', 'experiment']
+
+# Neighbors of every node in addition to the ring, and ping destinations per node
+EXTRA_LINKS_PER_NODE = 1
+PINGS_PER_NODE = 10
+
+NLSR_CONF_TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'ndn_utils', 'nlsr.conf')
+
+def write_topology(fileName, nNodes, seed=0):
+    "Write a Mini-NDN 1.0 topology of a ring of nNodes nodes with random chords"
+    rand = random.Random(seed)
+    names = ['n{}'.format(i) for i in range(nNodes)]
+
+    links = set()
+    for i in range(nNodes):
+        if nNodes > 1:
+            links.add(tuple(sorted((i, (i + 1) % nNodes))))
+        for j in range(EXTRA_LINKS_PER_NODE):
+            other = rand.randrange(nNodes)
+            if other != i:
+                links.add(tuple(sorted((i, other))))
+
+    with open(fileName, 'w') as topologyFile:
+        topologyFile.write('[nodes]\n')
+        for name in names:
+            topologyFile.write('{}: _\n'.format(name))
+        topologyFile.write('[links]\n')
+        for i, j in sorted(links):
+            topologyFile.write('{}:{} delay={}ms\n'.format(names[i], names[j], rand.randint(5, 50)))
+
+def _count_commands(hosts):
+    commands = sum(len(host.cmds) for host in hosts)
+    sudo = sum(1 for host in hosts for cmd in host.cmds if 'sudo ' in cmd)
+    return commands, sudo
+
+def _peak_memory():
+    # Linux reports ru_maxrss in kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def run(nNodes, workDir):
+    '''Run every phase on a topology of nNodes nodes in workDir.
+       Returns {phase: {'time', 'peak_memory_kb', 'commands', 'sudo'}}'''
+    patchers = patch_nfd()
+    for patcher in patchers:
+        patcher.start()
+    try:
+        return _run(nNodes, workDir)
+    finally:
+        for patcher in patchers:
+            patcher.stop()
+
+def _run(nNodes, workDir):
+    topologyFile = os.path.join(workDir, 'benchmark.conf')
+    write_topology(topologyFile, nNodes)
+    nlsr.load_conf_template(NLSR_CONF_TEMPLATE)
+
+    results = {}
+    state = {'hosts': []}
+
+    def phase(name, function):
+        before = _count_commands(state['hosts'])
+        start = time.time()
+        value = function()
+        elapsed = time.time() - start
+        after = _count_commands(state['hosts'])
+        results[name] = {
+            'time': elapsed,
+            'peak_memory_kb': _peak_memory(),
+            'commands': after[0] - before[0],
+            'sudo': after[1] - before[1]
+        }
+        return value
+
+    config = phase('config', lambda: minindn.config.parse(topologyFile))
+    topo = phase('topology', lambda: Topology(config, workDir))
+
+    def build():
+        make_home_folders(workDir, [host.name for host in topo.hosts_conf])
+        net = MockMininet(topo)
+        # The commands sent while the hosts are built are counted from an empty net
+        state['hosts'] = net.hosts
+        return net
+    net = phase('hosts', build)
+
+    phase('ips', lambda: assign_ips(net))
+
+    def bring_up_nlsr():
+        bringUp = BringUp(net.hosts)
+        bringUp.addStage('nfd', lambda host: host.nfd.start())
+        nlsr.add_stages(bringUp, net, topo.hosts_conf, workDir, {})
+        bringUp.run()
+    phase('nlsr', bring_up_nlsr)
+
+    def schedule_experiment():
+        experiment = Experiment({
+            'net': net,
+            'nodes': ','.join(host.name for host in net.hosts),
+            'ctime': 60,
+            'nPings': 300,
+            'pctTraffic': min(1.0, float(PINGS_PER_NODE) / nNodes),
+            'workDir': workDir
+        })
+        bringUp = BringUp(net.hosts)
+        experiment.addSetupStages(bringUp)
+        bringUp.run()
+        experiment.startPctPings()
+    phase('experiment', schedule_experiment)
+
+    return results
+
+def _run_in_child(nNodes, queue):
+    # The experiments print their progress
+    sys.stdout = open(os.devnull, 'w')
+    logging.getLogger().setLevel(logging.WARNING)
+
+    # Every node holds a pipe to its shell while it runs a command
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    workDir = tempfile.mkdtemp()
+    try:
+        queue.put(run(nNodes, workDir))
+    except Exception as e:
+        logging.exception(e)
+        queue.put(None)
+    finally:
+        shutil.rmtree(workDir)
+
+def run_isolated(nNodes):
+    "Run the benchmark of nNodes nodes in a new process so that its peak memory is its own"
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_in_child, args=(nNodes, queue))
+    process.start()
+    results = queue.get()
+    process.join()
+    return results
+
+def format_results(results, baseline=None):
+    lines = ["{:>6} {:<11} {:>10} {:>12} {:>10} {:>6}".format(
+        'nodes', 'phase', 'time (s)', 'memory (MB)', 'commands', 'sudo')]
+    for size in sorted(results, key=int):
+        for name in PHASES:
+            entry = results[size][name]
+            line = "{:>6} {:<11} {:>10.3f} {:>12.1f} {:>10d} {:>6d}".format(
+                size, name, entry['time'], entry['peak_memory_kb'] / 1024.0, entry['commands'], entry['sudo'])
+
+            previous = (baseline or {}).get(size, {}).get(name)
+            if previous is not None:
+                line += "   {:+.0%} time, {:+d} commands".format(
+                    entry['time'] / previous['time'] - 1 if previous['time'] > 0 else 0,
+                    entry['commands'] - previous['commands'])
+            lines.append(line)
+    return '\n'.join(lines)
+
+def parse_args():
+    parser = optparse.OptionParser(usage="python -m tests.benchmark [options]")
+    parser.add_option("--sizes", dest="sizes", default=','.join(str(size) for size in DEFAULT_SIZES),
+                      help="Comma-separated numbers of nodes (Default: %default)")
+    parser.add_option("--output", dest="output", default=None,
+                      help="Save the results as a JSON baseline")
+    parser.add_option("--baseline", dest="baseline", default=None,
+                      help="Compare the results with a JSON baseline saved with --output")
+    (options, args) = parser.parse_args()
+    options.sizes = [int(size) for size in options.sizes.split(',')]
+    return options
+
+def main():
+    options = parse_args()
+
+    baseline = None
+    if options.baseline is not None:
+        with open(options.baseline) as baselineFile:
+            baseline = json.load(baselineFile)['results']
+
+    results = {}
+    for size in options.sizes:
+        result = run_isolated(size)
+        if result is None:
+            sys.exit("Benchmark of {} nodes failed".format(size))
+        results[str(size)] = result
+
+    print format_results(results, baseline)
+
+    if options.output is not None:
+        with open(options.output, 'w') as outputFile:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'date': time.strftime('%Y-%m-%d %H:%M:%S'), 'results': results},
+                      outputFile, indent=2, sort_keys=True)
+
+if __name__ == '__main__':
+    main()
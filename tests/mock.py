@@ -21,10 +21,212 @@
 # along with Mini-NDN, e.g., in COPYING.md file.
 # If not, see <http://www.gnu.org/licenses/>.
 
+# tests.ndn would shadow the ndn package otherwise
+from __future__ import absolute_import
+
+import os
+import re
+import threading
+from mock import patch
+
+from ndn.ndn_host import NdnHostCommon
+from ndn.nfd import Nfd
+
 class MockHost(object):
-    def __init__(self):
+    def __init__(self, name='host'):
+        self.name = name
         self.cmds = []
+        self.lastPid = None
 
     def cmd(self, cmd_input):
         self.cmds.append(cmd_input)
 
+        # Like Mininet, report the PID of a backgrounded command
+        self.lastPid = 1000 + len(self.cmds) if cmd_input.endswith('&') else None
+
+
+class MockShellHost(MockHost):
+    "Answers sendCmd() through a pipe after a delay, like a node's shell"
+    def __init__(self, name='host', delay=0, reply=None):
+        MockHost.__init__(self, name)
+        self.delay = delay
+        self.reply = reply if reply is not None else (lambda host, cmd: '{} ran {}\n'.format(host.name, cmd))
+        self.waiting = False
+        read_fd, self._write_fd = os.pipe()
+        self.stdout = os.fdopen(read_fd, 'r')
+
+    def sendCmd(self, cmd_input):
+        self.cmds.append(cmd_input)
+        self.waiting = True
+        output = self.reply(self, cmd_input) + chr(127)
+        threading.Timer(self.delay, os.write, (self._write_fd, output)).start()
+
+    def monitor(self, timeoutms=None):
+        data = os.read(self.stdout.fileno(), 1024)
+        if chr(127) in data:
+            self.waiting = False
+            data = data.replace(chr(127), '')
+        return data
+
+
+class MockNode(object):
+    "A node of MockNet; pid is a process in the node's network namespace"
+    def __init__(self, name, pid=None):
+        self.name = name
+        self.pid = pid
+
+
+class MockIntf(object):
+    def __init__(self, name, node, params=None):
+        self.name = name
+        self.node = node
+        self.params = params if params is not None else {}
+        self.link = None
+
+    def __str__(self):
+        return self.name
+
+
+class MockLink(object):
+    def __init__(self, node1, intf1, node2, intf2, params=None):
+        self.intf1 = MockIntf(intf1, node1, params)
+        self.intf2 = MockIntf(intf2, node2, params)
+        self.intf1.link = self
+        self.intf2.link = self
+
+
+class MockNet(object):
+    def __init__(self, hosts, links, switches=None):
+        self.hosts = hosts
+        self.switches = switches if switches is not None else []
+        self.links = links
+
+
+# Batch commands (see ndn.command_batch) end with printf '\002<index> <status> [<pid>]\n' <index> $?|$!;
+_MARKER_RE = re.compile(r"printf '\\002%d (?:0 %d|%d)\\n' (\d+) \$([!?]);")
+
+class MockShell(MockHost):
+    '''Stands in for mininet.node.Node: a shell that answers every command at once.
+       The answer is read through a pipe, so cmd(), sendCmd()/waitOutput() and fan_out.run()
+       work as with a node; background and batch commands get a PID like with Mininet.'''
+    def __init__(self, name, **params):
+        MockHost.__init__(self, name)
+        self.params = params
+        self.intfs = []
+        self.ips = {}
+        self.waiting = False
+        self.stdout = None
+
+    def sendCmd(self, *args, **kwargs):
+        # Like Mininet, a single list argument is the command's words
+        words = args[0] if len(args) == 1 and isinstance(args[0], list) else args
+        cmd_input = words if isinstance(words, str) else ' '.join(str(word) for word in words)
+        self.cmds.append(cmd_input)
+        self.lastPid = 1000 + len(self.cmds) if cmd_input.endswith('&') else None
+
+        output = ''
+        for index, variable in _MARKER_RE.findall(cmd_input):
+            if variable == '!':
+                output += '\x02{} 0 {}\n'.format(index, 1000 + len(self.cmds) + int(index))
+            else:
+                output += '\x02{} 0\n'.format(index)
+
+        # The output stays in the pipe after the write end is closed; the read end
+        # is closed with the prompt, so idle shells do not hold file descriptors
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, output + chr(127))
+        os.close(write_fd)
+        self.stdout = os.fdopen(read_fd, 'r')
+        self.waiting = True
+
+    def monitor(self, timeoutms=None, findPid=True):
+        data = os.read(self.stdout.fileno(), 1024)
+        if chr(127) in data:
+            self.waiting = False
+            self.stdout.close()
+            data = data.replace(chr(127), '')
+        return data
+
+    def waitOutput(self, verbose=False, findPid=True):
+        output = ''
+        while self.waiting:
+            output += self.monitor()
+        return output
+
+    def cmd(self, *args, **kwargs):
+        self.sendCmd(*args, **kwargs)
+        return self.waitOutput()
+
+    def intfList(self):
+        return self.intfs
+
+    def setIP(self, ip, prefixLen=8, intf=None):
+        # Like mininet.link.Intf.setIP()
+        self.cmd('ifconfig {} {} up'.format(intf, ip))
+        self.ips[str(intf)] = ip.split('/')[0]
+
+    def IP(self, intf=None):
+        if intf is None:
+            intf = self.intfs[0] if len(self.intfs) > 0 else None
+        return self.ips.get(str(intf))
+
+
+# nfd.conf is not part of the source tree, its relevant sections are enough for Nfd
+NFD_CONF_TEMPLATE = """log
+{
+  default_level INFO
+}
+face_system
+{
+  unix
+  {
+    path /var/run/nfd.sock
+  }
+}
+"""
+
+CLIENT_CONF_SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'ndn_utils', 'client.conf.sample')
+
+def patch_nfd():
+    '''Patchers letting ndn.nfd.Nfd run on a MockNdnHost: the configuration templates come from
+       the source tree and start() does not wait for a forwarder. Start them before the hosts are built.'''
+    return [
+        patch('ndn.nfd._CONF_TEMPLATE_STRING', NFD_CONF_TEMPLATE),
+        patch('ndn.nfd.CLIENT_CONF_SAMPLE_FILE', CLIENT_CONF_SAMPLE),
+        patch.object(Nfd, 'waitUntilReady', return_value=True)
+    ]
+
+
+class MockNdnHost(NdnHostCommon, MockShell):
+    "An NdnHost on a MockShell; with the patchers of patch_nfd(), its NFD is an ndn.nfd.Nfd"
+    NodeClass = MockShell
+
+    def __init__(self, name, **kwargs):
+        NdnHostCommon.__init__(self, name, **kwargs)
+
+
+class MockMininet(MockNet):
+    "Stands in for mininet.net.Mininet: builds the hosts and links of a Topology"
+    def __init__(self, topo, host=MockNdnHost):
+        hosts = []
+        hostsByName = {}
+        for name in topo.hosts():
+            hostsByName[name] = host(name, **topo.nodeInfo(name))
+            hosts.append(hostsByName[name])
+
+        links = []
+        for name1, name2, info in topo.links(withInfo=True):
+            node1, node2 = hostsByName.get(info['node1']), hostsByName.get(info['node2'])
+            if node1 is None or node2 is None:
+                continue
+
+            params = dict((key, value) for key, value in info.items()
+                          if key not in ('node1', 'node2', 'port1', 'port2'))
+            link = MockLink(node1, '{}-eth{}'.format(node1.name, info['port1']),
+                            node2, '{}-eth{}'.format(node2.name, info['port2']), params)
+            node1.intfs.append(link.intf1)
+            node2.intfs.append(link.intf2)
+            links.append(link)
+
+        MockNet.__init__(self, hosts, links, [MockNode(name) for name in topo.switches()])
@@ -0,0 +1,82 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ndn.apps import ndn_traffic
+from tests.mock import MockHost
+
+class TestNdnTraffic(unittest.TestCase):
+    def setUp(self):
+        self.host = MockHost('a')
+        self.host.homeFolder = tempfile.mkdtemp()
+        self.prefixes = ['/ndn/edu/b', '/ndn/edu/c', '/ndn/edu/d', '/ndn/edu/e']
+
+    def tearDown(self):
+        shutil.rmtree(self.host.homeFolder)
+
+    def test_start(self):
+        ndn_traffic.start(self.host, self.prefixes, count=300, interval=1000, timeout=2000,
+                          log_file='ping-data/traffic.log')
+
+        # Same per-destination count and rate as one ndnping per destination
+        expected_cmd = "ndn-traffic-client -c 1200 -i 250 traffic-client.conf >> ping-data/traffic.log &"
+        self.assertEqual(self.host.cmds, [expected_cmd])
+
+        with open(os.path.join(self.host.homeFolder, 'traffic-client.conf')) as conf_file:
+            patterns = conf_file.read().split(ndn_traffic.CONF_SEPARATOR)
+
+        self.assertEqual(len(patterns), 4)
+        self.assertTrue('TrafficPercentage=25.0\n' in patterns[0])
+        self.assertTrue('Name=/ndn/edu/b/ping\n' in patterns[0])
+        self.assertTrue('InterestLifetime=2000\n' in patterns[0])
+        self.assertTrue('Name=/ndn/edu/e/ping\n' in patterns[3])
+
+    def test_invalid_configurations(self):
+        # ndn-traffic-client takes whole milliseconds: 1000 ms cannot be shared by 3 destinations
+        client = ndn_traffic.NdnTrafficClient(self.host, interval=1000)
+        self.assertRaises(ValueError, client.getCommand, self.prefixes[:3])
+        self.assertRaises(ValueError, ndn_traffic.NdnTrafficClient(self.host, interval=2).getCommand, self.prefixes)
+        self.assertRaises(ValueError, client.getConfig, [])
+
+        self.assertRaises(ValueError, ndn_traffic.NdnTrafficClient, self.host, count=0)
+        self.assertRaises(ValueError, ndn_traffic.NdnTrafficClient, self.host, timeout=0)
+
+    def test_split_log(self):
+        log_file = os.path.join(self.host.homeFolder, 'traffic.log')
+        with open(log_file, 'w') as log:
+            log.write("Sending Interest - PatternType=1, GlobalID=1, LocalID=1, Name=/ndn/edu/b/ping/1\n")
+            log.write("Sending Interest - PatternType=2, GlobalID=2, LocalID=1, Name=/ndn/edu/c/ping/1\n")
+            log.write("Data Received - PatternType=1, GlobalID=1, LocalID=1, Name=/ndn/edu/b/ping/1\n")
+            log.write("Total Traffic Pattern Types = 2\n")
+
+        outputs = [os.path.join(self.host.homeFolder, name) for name in ('b.txt', 'c.txt')]
+        ndn_traffic.split_log(log_file, outputs)
+
+        with open(outputs[0]) as output:
+            self.assertEqual(len(output.readlines()), 2)
+        with open(outputs[1]) as output:
+            self.assertEqual(len(output.readlines()), 1)
@@ -24,7 +24,7 @@
 import unittest
 
 from ndn.apps import ndnping
-from tests.mock import MockHost
+from tests.mock import MockHost, MockShellHost
 
 class TestNdnPing(unittest.TestCase):
     def setUp(self):
@@ -54,3 +54,25 @@ class TestNdnPing(unittest.TestCase):
         expected_cmd = "ndnping -i 100 -o 1000 -c 10 -n 1234 -p test -a -t {} >> ping-log.txt &".format(self.name_prefix)
         self.assertEqual(self.host.cmds[0], expected_cmd)
 
+    def test_ping_all(self):
+        hosts = [MockShellHost('a'), MockShellHost('b')]
+        schedule = {
+            hosts[0]: [('/ndn/edu/b', 'ping-data/b.txt'), ('/ndn/edu/c', 'ping-data/c.txt')],
+            hosts[1]: [('/ndn/edu/a', 'ping-data/a.txt')]
+        }
+
+        results = ndnping.ping_all(schedule, count=10)
+
+        # One shell write per host regardless of the number of destinations
+        self.assertEqual(len(hosts[0].cmds), 1)
+        self.assertEqual(len(hosts[1].cmds), 1)
+        self.assertTrue("ndnping -c 10 /ndn/edu/b >> ping-data/b.txt &" in hosts[0].cmds[0])
+        self.assertTrue("ndnping -c 10 /ndn/edu/c >> ping-data/c.txt &" in hosts[0].cmds[0])
+        self.assertEqual(len(results['a']), 2)
+        self.assertEqual(len(results['b']), 1)
+
+    def test_ping_all_jitter(self):
+        host = MockShellHost('a')
+        ndnping.ping_all({host: [('/ndn/edu/b', 'ping-data/b.txt')]}, jitter=0.5)
+
+        self.assertRegexpMatches(host.cmds[0], r"^\(sleep 0\.\d{3}; exec ndnping /ndn/edu/b >> ping-data/b.txt\) &")
@@ -0,0 +1,90 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import unittest
+
+from ndn.bring_up import BringUp
+from tests.mock import MockHost
+
+class TestBringUp(unittest.TestCase):
+    def setUp(self):
+        self.hosts = [MockHost('h{}'.format(i)) for i in range(8)]
+
+    def test_dependency_order(self):
+        bring_up = BringUp(self.hosts, maxWorkers=4)
+        bring_up.addStage('ndnpingserver', lambda host: host.cmd('ndnpingserver'), requires=('strategy',))
+        bring_up.addStage('strategy', lambda host: host.cmd('strategy'), requires=('nlsr',))
+        bring_up.addStage('nlsr', lambda host: host.cmd('nlsr'), requires=('nfd',))
+        bring_up.addStage('nfd', lambda host: host.cmd('nfd'))
+        bring_up.run()
+
+        for host in self.hosts:
+            self.assertEqual(host.cmds, ['nfd', 'nlsr', 'strategy', 'ndnpingserver'])
+        self.assertEqual(len(bring_up.timings), len(self.hosts))
+
+    def test_unregistered_requirement_is_satisfied(self):
+        bring_up = BringUp(self.hosts)
+        bring_up.addStage('nlsr', lambda host: host.cmd('nlsr'), requires=('nfd', 'nlsr-security'))
+        bring_up.run()
+
+        for host in self.hosts:
+            self.assertEqual(host.cmds, ['nlsr'])
+
+    def test_cycle(self):
+        bring_up = BringUp(self.hosts)
+        bring_up.addStage('a', lambda host: None, requires=('b',))
+        bring_up.addStage('b', lambda host: None, requires=('a',))
+        self.assertRaises(BringUp.Error, bring_up.run)
+
+    def test_failure_stops_host_chain(self):
+        def fail_on_h3(host):
+            if host.name == 'h3':
+                raise RuntimeError('nfd did not start')
+            host.cmd('nfd')
+
+        bring_up = BringUp(self.hosts, maxWorkers=3)
+        bring_up.addStage('nfd', fail_on_h3)
+        bring_up.addStage('nlsr', lambda host: host.cmd('nlsr'), requires=('nfd',))
+        self.assertRaises(BringUp.Error, bring_up.run)
+
+        self.assertEqual(list(bring_up.failures), ['h3'])
+        self.assertEqual(self.hosts[3].cmds, [])
+        self.assertEqual(self.hosts[4].cmds, ['nfd', 'nlsr'])
+
+    def test_hosts_run_concurrently(self):
+        barrier = {'count': 0}
+        lock = threading.Lock()
+        all_arrived = threading.Event()
+
+        def wait_for_all(host):
+            with lock:
+                barrier['count'] += 1
+                if barrier['count'] == len(self.hosts):
+                    all_arrived.set()
+            # Only succeeds if every host is in this stage at the same time
+            self.assertTrue(all_arrived.wait(5))
+
+        bring_up = BringUp(self.hosts, maxWorkers=len(self.hosts))
+        bring_up.addStage('nfd', wait_for_all)
+        bring_up.run()
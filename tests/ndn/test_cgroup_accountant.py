@@ -0,0 +1,179 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ndn import cgroup_accountant
+from ndn.cgroup_accountant import CgroupAccountant, HostCgroup, CGROUP_V1, CGROUP_V2
+from ndn.phases import PhaseTimeline
+
+MOUNTS = """sysfs /sys sysfs rw,nosuid,nodev,noexec,relatime 0 0
+cgroup2 /sys/fs/cgroup/unified cgroup2 rw,nosuid,nodev,noexec,relatime 0 0
+cgroup /sys/fs/cgroup/cpu,cpuacct cgroup rw,nosuid,nodev,noexec,relatime,cpu,cpuacct 0 0
+cgroup /sys/fs/cgroup/memory cgroup rw,nosuid,nodev,noexec,relatime,memory 0 0
+cgroup /sys/fs/cgroup/blkio cgroup rw,nosuid,nodev,noexec,relatime,blkio 0 0
+"""
+
+PROC_CGROUP = """12:blkio:/
+6:memory:/
+4:cpu,cpuacct:/a
+1:name=systemd:/user.slice
+0::/user.slice
+"""
+
+def write_files(directory, files):
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    for name, content in files.items():
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write(content)
+
+class FakeCgroup(object):
+    def __init__(self, samples):
+        self.samples = samples
+
+    def read(self):
+        return self.samples.pop(0)
+
+class TestCgroupAccountant(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_parse(self):
+        self.assertEqual(cgroup_accountant.parse_mounts(MOUNTS), {
+            '': '/sys/fs/cgroup/unified',
+            'cpu': '/sys/fs/cgroup/cpu,cpuacct',
+            'cpuacct': '/sys/fs/cgroup/cpu,cpuacct',
+            'memory': '/sys/fs/cgroup/memory',
+            'blkio': '/sys/fs/cgroup/blkio'
+        })
+
+        paths = cgroup_accountant.parse_proc_cgroup(PROC_CGROUP)
+        self.assertEqual(paths['cpuacct'], '/a')
+        self.assertEqual(paths['memory'], '/')
+        self.assertEqual(paths[''], '/user.slice')
+
+        self.assertEqual(cgroup_accountant.parse_blkio("8:0 Read 100\n8:0 Write 20\n8:16 Read 5\nTotal 125\n"), (105, 20))
+        self.assertEqual(cgroup_accountant.parse_io_stat("8:0 rbytes=10 wbytes=2 rios=1\n8:16 rbytes=5 wbytes=0\n"), (15, 2))
+
+    def test_read_v1(self):
+        cpu = os.path.join(self.work_dir, 'cpu,cpuacct', 'a')
+        write_files(cpu, {
+            'cpuacct.usage': '2500000000\n',
+            'cpuacct.stat': 'user 150\nsystem 50\n',
+            'cpu.stat': 'nr_periods 10\nnr_throttled 3\nthrottled_time 7000000\n'
+        })
+        memory = os.path.join(self.work_dir, 'memory', 'a')
+        write_files(memory, {'memory.usage_in_bytes': '4096\n'})
+
+        values = HostCgroup({'cpu': cpu, 'memory': memory, 'io': None}, CGROUP_V1).read()
+        ticks = os.sysconf('SC_CLK_TCK')
+        self.assertEqual(values, (2500000, 150 * 1000000 // ticks, 50 * 1000000 // ticks, 3, 7000, 4096, 0, 0))
+
+    def test_read_v2(self):
+        directory = os.path.join(self.work_dir, 'minindn', 'a')
+        write_files(directory, {
+            'cpu.stat': 'usage_usec 300\nuser_usec 200\nsystem_usec 100\nnr_periods 0\nnr_throttled 1\nthrottled_usec 9\n',
+            'memory.current': '8192\n',
+            'io.stat': '8:0 rbytes=10 wbytes=20 rios=1 wios=2\n'
+        })
+
+        values = HostCgroup({'cpu': directory, 'memory': directory, 'io': directory}, CGROUP_V2).read()
+        self.assertEqual(values, (300, 200, 100, 1, 9, 8192, 10, 20))
+
+        # Controllers that are not enabled are reported as 0
+        os.remove(os.path.join(directory, 'memory.current'))
+        self.assertEqual(HostCgroup({'cpu': directory, 'memory': directory, 'io': directory}, CGROUP_V2).read()[5], 0)
+
+    def test_phases(self):
+        timeline = PhaseTimeline()
+        accountant = CgroupAccountant(self.work_dir, timeline=timeline)
+        accountant.add('a', FakeCgroup([(0, 0, 0, 0, 0, 100, 0, 0),
+                                        (1000000, 600000, 400000, 0, 0, 300, 10, 0),
+                                        (1500000, 900000, 600000, 1, 50, 200, 10, 5)]))
+        accountant.add('b', FakeCgroup([(0, 0, 0, 0, 0, 1000, 0, 0),
+                                        (0, 0, 0, 0, 0, 1000, 0, 0),
+                                        (2000000, 1000000, 1000000, 0, 0, 1000, 0, 0)]))
+
+        timeline.enter('setup')
+        accountant.sample()
+        accountant.sample()
+        timeline.enter('traffic')
+        accountant.sample()
+        accountant.flush()
+
+        summary = accountant.summary()
+        self.assertEqual(sorted(summary), ['setup', 'traffic'])
+
+        setup = summary['setup']['hosts']['a']
+        self.assertEqual(setup['cpu_seconds'], 1.0)
+        self.assertEqual(setup['memory_peak_bytes'], 300)
+        self.assertEqual(setup['io_read_bytes'], 10)
+
+        traffic = summary['traffic']
+        self.assertEqual(traffic['hosts']['a']['cpu_seconds'], 0.5)
+        self.assertEqual(traffic['hosts']['a']['throttled_seconds'], 0.00005)
+        self.assertEqual(traffic['hosts']['b']['cpu_seconds'], 2.0)
+        self.assertEqual(traffic['total']['cpu_seconds'], 2.5)
+        self.assertEqual(traffic['total']['memory_peak_bytes'], 1200)
+        self.assertEqual(traffic['total']['io_write_bytes'], 5)
+
+        with open(os.path.join(self.work_dir, 'a' + cgroup_accountant.FILE_SUFFIX), 'rb') as f:
+            self.assertEqual(len(f.read()), 3 * cgroup_accountant.RECORD_STRUCT.size)
+
+        accountant.writeSummary()
+        self.assertTrue(os.path.isfile(os.path.join(self.work_dir, cgroup_accountant.SUMMARY_FILE)))
+
+    def test_resolve_v1(self):
+        mounts = {}
+        for controller in ('cpuacct', 'memory', 'blkio'):
+            mounts[controller] = os.path.join(self.work_dir, controller)
+            os.mkdir(mounts[controller])
+
+        # A CpuLimitedNdnHost has its own cpuacct group but shares the others with the orchestrator
+        os.mkdir(os.path.join(mounts['cpuacct'], 'a'))
+        own = {'cpuacct': '/', 'memory': '/', 'blkio': '/'}
+
+        read = cgroup_accountant._read
+        moved = []
+        cgroup_accountant._read = lambda path: PROC_CGROUP if path == '/proc/1234/cgroup' else read(path)
+        move = cgroup_accountant._move
+        cgroup_accountant._move = lambda pid, directory: moved.append((pid, directory))
+        try:
+            created = []
+            cgroup = cgroup_accountant.resolve_host_cgroup('a', 1234, mounts, own, created)
+        finally:
+            cgroup_accountant._read = read
+            cgroup_accountant._move = move
+
+        self.assertEqual(cgroup.version, CGROUP_V1)
+        self.assertEqual(cgroup.directories['cpu'], mounts['cpuacct'] + '/a')
+        self.assertEqual(cgroup.directories['memory'], os.path.join(mounts['memory'], 'a'))
+        self.assertEqual(sorted(created), sorted([os.path.join(mounts['memory'], 'a'), os.path.join(mounts['blkio'], 'a')]))
+        self.assertEqual(len(moved), 2)
@@ -0,0 +1,69 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import subprocess
+import unittest
+
+from ndn import command_batch
+from tests.mock import MockHost
+
+class BashHost(MockHost):
+    "Runs each command line in a fresh bash, like a node's shell would"
+    def cmd(self, cmd_input):
+        MockHost.cmd(self, cmd_input)
+        return subprocess.check_output(['bash', '-c', cmd_input])
+
+class TestCommandBatch(unittest.TestCase):
+    def test_results(self):
+        host = BashHost()
+        commands = ['echo hello', 'false', 'sleep 0.1 &', 'echo "a;b" | tr a x']
+        results = command_batch.run(host, commands)
+
+        self.assertEqual(len(host.cmds), 1)
+        self.assertEqual([result.cmd for result in results], commands)
+        self.assertEqual(results[0].output, 'hello\n')
+        self.assertEqual(results[0].status, 0)
+        self.assertEqual(results[1].status, 1)
+        self.assertEqual(results[2].status, 0)
+        self.assertTrue(results[2].pid > 0)
+        self.assertEqual(results[3].output, 'x;b\n')
+        self.assertEqual(results[3].pid, None)
+
+    def test_long_batches_are_split(self):
+        host = BashHost()
+        commands = ['echo {}'.format(i) for i in range(1000)]
+        results = command_batch.run(host, commands)
+
+        self.assertTrue(1 < len(host.cmds) < len(commands))
+        for line in host.cmds:
+            self.assertTrue(len(line) <= command_batch.MAX_LINE_LENGTH)
+        self.assertEqual([result.output for result in results], ['{}\n'.format(i) for i in range(1000)])
+        self.assertTrue(all(result.status == 0 for result in results))
+
+    def test_pty_output(self):
+        output = 'hi\r\n\x020 0\r\n[1] 4321\r\n\x021 0 4321\r\n'
+        results = command_batch.parse_output(['echo hi', 'nfd &'], output)
+
+        self.assertEqual(results[0].output, 'hi\n')
+        self.assertEqual(results[1].output, '')
+        self.assertEqual(results[1].pid, 4321)
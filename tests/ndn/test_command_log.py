@@ -0,0 +1,99 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ndn import command_log, phases
+from ndn.command_log import CommandRecorder
+from ndn.phases import PhaseTimeline
+
+class TestCommandTemplate(unittest.TestCase):
+    def test_template(self):
+        template = command_log.command_template
+        self.assertEqual(template('nfdc face create udp://1.0.0.2'), 'nfdc face create <uri>')
+        self.assertEqual(template("sed -i 's/a/b/' /tmp/a/nlsr.conf"), "sed -i '...' <path>")
+        self.assertEqual(template('nfdc route add /ndn/edu/ucla udp://1.0.0.2 cost 10'),
+                         'nfdc route add <path> <uri> cost N')
+        self.assertEqual(template('nlsr -f /tmp/a/nlsr.conf 2>> a.log &', 'a'), 'nlsr -f <path> N>> <host>.log &')
+        self.assertEqual(template('ifconfig a-eth0 1.0.0.1/30 up', 'a'), 'ifconfig <host>-eth0 N/N up')
+        # The same command on two nodes has the same template
+        self.assertEqual(template('mkdir -p /tmp/a/log', 'a'), template('mkdir  -p /tmp/b/log', 'b'))
+
+    def test_long_command(self):
+        self.assertEqual(command_log.command_template('ndnping -t -i 1000 -c 300 -p 10 /ndn/b > b.txt &'),
+                         'ndnping -t -i N -c N -p N ...')
+
+class TestCommandRecorder(unittest.TestCase):
+    def setUp(self):
+        self.timeline = PhaseTimeline()
+        self.recorder = CommandRecorder(self.timeline)
+
+    def record(self, host, command, latency, output=''):
+        record = self.recorder.begin(host, command)
+        record.outputSize = len(output)
+        record.latency = latency
+        return record
+
+    def test_begin(self):
+        self.timeline.enter(phases.SETUP)
+        record = self.recorder.begin('a', 'nfd-status')
+        self.assertEqual(record.phase, phases.SETUP)
+        self.assertTrue(record.caller.startswith('ndn{}test_command_log.py:'.format(os.sep)))
+        self.assertTrue(record.caller.endswith('(test_begin)'))
+        self.assertEqual(record.latency, None)
+
+        record.finish()
+        self.assertTrue(record.latency >= 0)
+
+    def test_aggregate(self):
+        self.record('a', 'mkdir -p /tmp/a/log', 0.1)
+        self.record('b', 'mkdir -p /tmp/b/log', 0.3)
+        self.record('a', 'nfd-status', 0.5, 'x' * 100)
+        self.recorder.begin('b', 'nfd-status')
+
+        entries = self.recorder.aggregate()
+        self.assertEqual([entry[:5] for entry in entries], [['nfd-status', 2, 0.5, 0.5, 100],
+                                                            ['mkdir -p <path>', 2, 0.4, 0.3, 0]])
+        self.assertEqual(sum(entries[1][5].values()), 2)
+
+    def test_write(self):
+        self.record('a', 'mkdir -p /tmp/a/log', 0.25)
+        self.recorder.begin('b', 'nfd-status')
+
+        work_dir = tempfile.mkdtemp()
+        try:
+            self.recorder.write(work_dir)
+            with open(os.path.join(work_dir, 'commands.log')) as logFile:
+                lines = [line.rstrip('\n').split('\t') for line in logFile]
+            self.assertEqual([line[1:5] + line[6:] for line in lines],
+                             [['-', 'a', '0.250000', '0', 'mkdir -p /tmp/a/log'], ['-', 'b', '-', '0', 'nfd-status']])
+
+            with open(os.path.join(work_dir, 'report.txt')) as reportFile:
+                report = reportFile.read().splitlines()
+            self.assertTrue(report[1].endswith('mkdir -p <path>'))
+            self.assertIn('250.000', report[1])
+        finally:
+            shutil.rmtree(work_dir)
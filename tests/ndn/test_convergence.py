@@ -0,0 +1,89 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import shutil
+import tempfile
+import time
+import unittest
+
+from ndn.convergence import ConvergenceWatcher
+from tests.mock import MockShellHost
+
+NODES = ['a', 'b', 'c']
+
+def full_fib(host, cmd):
+    lines = ['/ndn/edu/%C1.Router/cs/{} nexthops={{faceid=260 (cost=10)}}'.format(node)
+             for node in NODES if node != host.name]
+    lines += ['/ndn/edu/{} nexthops={{faceid=260 (cost=10)}}'.format(node) for node in NODES if node != host.name]
+    return '\n'.join(lines) + '\n'
+
+class TestConvergenceWatcher(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def make_hosts(self, reply):
+        hosts = [MockShellHost(name, reply=reply) for name in NODES]
+        for host in hosts:
+            host.homeFolder = self.work_dir
+        return hosts
+
+    def test_converges_early(self):
+        hosts = self.make_hosts(full_fib)
+        watcher = ConvergenceWatcher(hosts, NODES, timeout=30, interval=0.05)
+
+        start_time = time.time()
+        self.assertTrue(watcher.run())
+        self.assertTrue(time.time() - start_time < 5)
+        self.assertEqual(sorted(watcher.convergenceTimes), NODES)
+
+        # Converged hosts are not polled again
+        self.assertTrue(all(len(host.cmds) == 1 for host in hosts))
+
+    def test_expected_prefixes(self):
+        watcher = ConvergenceWatcher(self.make_hosts(full_fib), NODES, timeout=30)
+        # A node has no route to its own router name nor to its own prefix
+        self.assertEqual(watcher.expectedPrefixes(MockShellHost('a')),
+                         set(['/ndn/edu/%C1.Router/cs/b', '/ndn/edu/%C1.Router/cs/c', '/ndn/edu/b', '/ndn/edu/c']))
+
+    def test_late_node(self):
+        start_time = time.time()
+        def reply(host, cmd):
+            if host.name == 'c' and time.time() - start_time < 0.2:
+                return '/ndn/edu/%C1.Router/cs/a\n'
+            return full_fib(host, cmd)
+
+        watcher = ConvergenceWatcher(self.make_hosts(reply), NODES, timeout=30, interval=0.05)
+        self.assertTrue(watcher.run())
+        self.assertTrue(watcher.convergenceTimes['c'] >= 0.2)
+        self.assertTrue(watcher.convergenceTimes['a'] < watcher.convergenceTimes['c'])
+
+    def test_deadline(self):
+        hosts = self.make_hosts(lambda host, cmd: '' if host.name == 'b' else full_fib(host, cmd))
+        watcher = ConvergenceWatcher(hosts, NODES, timeout=0.3, interval=0.05)
+
+        self.assertFalse(watcher.run())
+        self.assertFalse(watcher.isConverged(hosts[1]))
+        self.assertTrue(watcher.isConverged(hosts[0]))
@@ -0,0 +1,53 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import unittest
+
+from ndn import fan_out
+from tests.mock import MockShellHost
+
+class TestFanOut(unittest.TestCase):
+    def test_same_command(self):
+        hosts = [MockShellHost('h{}'.format(i)) for i in range(5)]
+        outputs = fan_out.run(hosts, 'nfd-status')
+
+        self.assertEqual(sorted(outputs), ['h0', 'h1', 'h2', 'h3', 'h4'])
+        self.assertEqual(outputs['h3'], 'h3 ran nfd-status\n')
+
+    def test_per_host_commands(self):
+        hosts = [MockShellHost('a'), MockShellHost('b'), MockShellHost('c')]
+        outputs = fan_out.run(hosts, {'a': 'one', 'b': 'two'})
+        self.assertEqual(outputs, {'a': 'a ran one\n', 'b': 'b ran two\n'})
+        self.assertEqual(hosts[2].cmds, [])
+
+        outputs = fan_out.run(hosts, lambda host: 'ping ' + host.name)
+        self.assertEqual(outputs['c'], 'c ran ping c\n')
+
+    def test_concurrent(self):
+        hosts = [MockShellHost('h{}'.format(i), delay=0.2) for i in range(10)]
+        start_time = time.time()
+        fan_out.run(hosts, 'nfd-status')
+
+        # Ten 0.2s commands take about as long as one
+        self.assertTrue(time.time() - start_time < 1.0)
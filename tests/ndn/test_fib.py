@@ -0,0 +1,55 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import textwrap
+import unittest
+
+from ndn import fib
+
+NFD_STATUS = textwrap.dedent(
+    """\
+    FIB:
+      /localhost/nfd nexthops={faceid=1 (cost=0)}
+      /ndn/edu/%C1.Router/cs/b nexthops={faceid=262 (cost=10), faceid=263 (cost=25)}
+      /ndn/edu/b nexthops={faceid=262 (cost=10)}
+    RIB:
+      /ndn/edu/c route={faceid=264 (origin=128 cost=10 flags=ChildInherit)}
+    """
+)
+
+class TestFib(unittest.TestCase):
+    def test_parse(self):
+        table = fib.parse(NFD_STATUS)
+
+        self.assertEqual(table.prefixes(), set(['/localhost/nfd', '/ndn/edu/%C1.Router/cs/b', '/ndn/edu/b']))
+        self.assertEqual(table.nexthops('/ndn/edu/%C1.Router/cs/b'), {262: 10, 263: 25})
+        self.assertFalse('/ndn/edu/c' in table)
+
+    def test_missing(self):
+        table = fib.parse(NFD_STATUS)
+        expected = ['/ndn/edu/b', '/ndn/edu/c', '/ndn/edu/%C1.Router/cs/b']
+        self.assertEqual(table.missing(expected), set(['/ndn/edu/c']))
+
+    def test_prefix_is_not_substring_match(self):
+        table = fib.parse("  /ndn/edu/ab nexthops={faceid=262 (cost=10)}\n")
+        self.assertEqual(table.missing(['/ndn/edu/a']), set(['/ndn/edu/a']))
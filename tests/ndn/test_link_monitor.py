@@ -0,0 +1,83 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from minindn.config import LinkConfig
+from ndn import link_monitor
+from ndn.link_monitor import LinkSampler
+from tests.mock import MockLink, MockNet, MockNode
+
+NET_DEV = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:    1000      10    0    0    0     0          0         0     1000      10    0    0    0     0       0          0
+ a-eth0:   2000      20    0    3    0     0          0         0     5000      50    0    1    0     0       0          0
+"""
+
+class TestLinkSampler(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_parse_net_dev(self):
+        counters = link_monitor.parse_net_dev(NET_DEV)
+        self.assertEqual(sorted(counters), ['a-eth0', 'lo'])
+        self.assertEqual(counters['a-eth0'], (2000, 20, 3, 5000, 50, 1))
+
+    def test_find_links(self):
+        a, b, c = MockNode('a', 1), MockNode('b', 2), MockNode('c', 3)
+        net = MockNet([a, b, c], [MockLink(a, 'a-eth0', b, 'b-eth0'), MockLink(c, 'c-eth0', b, 'b-eth1')])
+        links = link_monitor.find_links(net, [LinkConfig('b', 'c', {'bw': 10, 'delay': '10ms'})])
+
+        self.assertEqual([link['name'] for link in links], ['a:b', 'c:b'])
+        self.assertEqual(links[0]['params'], {})
+        self.assertEqual(links[1]['params'], {'bw': 10, 'delay': '10ms'})
+        self.assertEqual((links[1]['intf1'], links[1]['intf2']), ('c-eth0', 'b-eth1'))
+
+    def test_sample(self):
+        # Both ends of the link are the loopback interface of this process' namespace
+        a, b = MockNode('a', os.getpid()), MockNode('b', os.getpid())
+        sampler = LinkSampler(self.output_dir)
+        sampler.addLinks(MockNet([a, b], [MockLink(a, 'lo', b, 'lo')]), [LinkConfig('a', 'b', {'bw': 100})])
+
+        sampler.sample()
+        sampler.sample()
+        sampler.flush()
+
+        with open(os.path.join(self.output_dir, 'a:b' + link_monitor.FILE_SUFFIX), 'rb') as records:
+            self.assertEqual(len(records.read()), 2 * link_monitor.RECORD_STRUCT.size)
+
+        summary = sampler.summary()
+        self.assertEqual(sorted(summary), ['a:b'])
+        self.assertTrue(summary['a:b']['peak_utilization'] is not None)
+
+        if link_monitor.numpy is not None:
+            series = link_monitor.load_series(self.output_dir)
+            self.assertEqual(len(series['a:b']['timestamp']), 1)
+            self.assertTrue(series['a:b']['ab_bps'][0] >= 0)
+            self.assertTrue('ab_utilization' in series['a:b'])
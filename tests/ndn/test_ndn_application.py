@@ -0,0 +1,47 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from ndn.ndn_application import NdnApplication
+from tests.mock import MockHost
+
+class TestNdnApplication(unittest.TestCase):
+    def setUp(self):
+        self.host = MockHost()
+
+    def test_start_uses_single_round_trip(self):
+        app = NdnApplication(self.host)
+        app.start("nlsr -f nlsr.conf &")
+
+        self.assertEqual(self.host.cmds, ["nlsr -f nlsr.conf &"])
+        self.assertEqual(app.processId, "1001")
+        self.assertTrue(app.isRunning)
+
+    def test_stop(self):
+        app = NdnApplication(self.host)
+        app.start("nlsr -f nlsr.conf &")
+        app.stop()
+
+        self.assertEqual(self.host.cmds[-1], "sudo kill 1001")
+        self.assertFalse(app.isRunning)
@@ -21,10 +21,14 @@
 # along with Mini-NDN, e.g., in COPYING.md file.
 # If not, see <http://www.gnu.org/licenses/>.
 
+import shutil
+import tempfile
 import unittest
 
-from ndn.ndn_host import NdnHost
-from tests.mock import MockHost
+from ndn import command_log
+from ndn.command_log import CommandRecorder
+from ndn.ndn_host import NdnHost, assign_ips
+from tests.mock import MockHost, MockLink, MockNdnHost, MockNet, MockShell
 
 class TestNdnPing(unittest.TestCase):
     def test_basic(self):
@@ -34,3 +38,38 @@ class TestNdnPing(unittest.TestCase):
         }
         #host = NdnHost('NodeA', **params)
 
+
+class TestCommandRecording(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.host = MockNdnHost('a', workdir=self.work_dir)
+        command_log.recorder = CommandRecorder()
+
+    def tearDown(self):
+        command_log.recorder = None
+        shutil.rmtree(self.work_dir)
+
+    def test_send_cmd(self):
+        self.host.cmd('nfd-status')
+        self.host.cmd('nfdc', 'route', 'list')
+        self.host.cmd(['ndnping', '-c', 3, '/ndn/edu/b'])
+
+        self.assertEqual([record.command for record in command_log.recorder.commands],
+                         ['nfd-status', 'nfdc route list', 'ndnping -c 3 /ndn/edu/b'])
+        self.assertEqual(self.host.cmdCount, 3)
+
+
+class TestAssignIps(unittest.TestCase):
+    def test_assign_ips(self):
+        a, b, c = MockShell('a'), MockShell('b'), MockShell('c')
+        links = [MockLink(a, 'a-eth0', b, 'b-eth0'), MockLink(b, 'b-eth1', c, 'c-eth0')]
+        for link in links:
+            link.intf1.node.intfs.append(link.intf1)
+            link.intf2.node.intfs.append(link.intf2)
+
+        assign_ips(MockNet([a, b, c], links))
+
+        self.assertEqual((a.IP('a-eth0'), b.IP('b-eth0')), ('1.0.0.1', '1.0.0.2'))
+        self.assertEqual((b.IP('b-eth1'), c.IP('c-eth0')), ('1.0.0.5', '1.0.0.6'))
+        # One command per interface
+        self.assertEqual(b.cmds, ['ifconfig b-eth0 1.0.0.2/30 up', 'ifconfig b-eth1 1.0.0.5/30 up'])
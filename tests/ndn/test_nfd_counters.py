@@ -0,0 +1,128 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ndn import nfd_counters
+from ndn.nfd_counters import NfdCounterSampler
+
+NFDC_REPORT = """General NFD status:
+               version=0.6.2
+             startTime=20180101T000000.000000
+      nNameTreeEntries=14
+           nFibEntries=3
+           nPitEntries=2
+  nMeasurementsEntries=0
+            nCsEntries=5
+          nInInterests=IN_INTERESTS
+         nOutInterests=80
+              nInData=70
+             nOutData=60
+             nInNacks=1
+            nOutNacks=2
+  nSatisfiedInterests=70
+nUnsatisfiedInterests=3
+Faces:
+  faceid=1 remote=internal:// local=internal:// congestion={base-marking-interval=100ms} counters={in={0i 12d 0n 3456B} out={12i 0d 0n 1234B}} flags={local permanent point-to-point}
+  faceid=260 remote=udp4://1.0.0.2:6363 local=udp4://1.0.0.1:6363 counters={in={IN_INTERESTSi 30d 1n 9000B} out={40i 20d 0n 7000B}} flags={non-local permanent point-to-point}
+CS information:
+  capacity=65536
+  nEntries=5
+     nHits=7
+   nMisses=93
+"""
+
+NFD_STATUS = """General NFD status:
+               version=0.4.1
+         nInInterests=10
+        nOutInterests=8
+              nInData=7
+             nOutData=6
+             nInNacks=0
+            nOutNacks=0
+Faces:
+  faceid=257 remote=udp4://1.0.0.2:6363 local=udp4://1.0.0.1:6363 counters={in={10i 7d 2000B} out={8i 6d 1500B}} non-local permanent point-to-point
+"""
+
+class TestNfdCounterSampler(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_status_command(self):
+        self.assertEqual(nfd_counters.status_command('0.6.2'), ['nfdc', 'status', 'report'])
+        self.assertEqual(nfd_counters.status_command('0.4.1'), ['nfd-status'])
+        self.assertEqual(nfd_counters.status_command(None), ['nfd-status'])
+
+    def test_parse(self):
+        general, faces = nfd_counters.parse_status(NFDC_REPORT.replace("IN_INTERESTS", "100"))
+        self.assertEqual(general, {'nInInterests': 100, 'nOutInterests': 80, 'nInData': 70, 'nOutData': 60,
+                                   'nInNacks': 1, 'nOutNacks': 2, 'nHits': 7, 'nMisses': 93})
+        self.assertEqual(faces, {1: (0, 12, 0, 3456, 12, 0, 0, 1234), 260: (100, 30, 1, 9000, 40, 20, 0, 7000)})
+
+        general, faces = nfd_counters.parse_status(NFD_STATUS)
+        self.assertEqual(general['nInInterests'], 10)
+        self.assertEqual(faces, {257: (10, 7, 0, 2000, 8, 6, 0, 1500)})
+
+    def test_sample(self):
+        output_dir = os.path.join(self.work_dir, 'nfd-counters')
+        home_folder = os.path.join(self.work_dir, 'a')
+        os.mkdir(home_folder)
+
+        class Host(object):
+            name = 'a'
+            homeFolder = home_folder
+
+        sampler = NfdCounterSampler(output_dir, nfdVersion='0.6.2')
+        # The status is read from the node's HOME
+        sampler.command = ['sh', '-c', 'cat $HOME/status']
+        sampler.addHosts([Host()])
+
+        for in_interests in (100, 300):
+            with open(os.path.join(home_folder, 'status'), 'w') as status:
+                status.write(NFDC_REPORT.replace("IN_INTERESTS", str(in_interests)))
+            sampler.sample()
+
+        # A failed node is skipped
+        os.remove(os.path.join(home_folder, 'status'))
+        sampler.sample()
+        sampler.flush()
+
+        self.assertTrue(sampler.summary()['a']['nInInterests'] > 0)
+        self.assertEqual(os.path.getsize(os.path.join(output_dir, 'a' + nfd_counters.GENERAL_SUFFIX)),
+                         2 * nfd_counters.GENERAL_STRUCT.size)
+        self.assertEqual(os.path.getsize(os.path.join(output_dir, 'a' + nfd_counters.FACES_SUFFIX)),
+                         4 * nfd_counters.FACE_STRUCT.size)
+
+        if nfd_counters.numpy is not None:
+            nodes, faces = nfd_counters.load_rates(output_dir)
+            self.assertEqual(sorted(nodes), ['a'])
+            self.assertTrue(nodes['a']['nInInterests'][0] > 0)
+            self.assertEqual(nodes['a']['nOutData'][0], 0)
+            self.assertEqual(sorted(faces), [('a', 1), ('a', 260)])
+            self.assertTrue(faces[('a', 260)]['in_interests'][0] > 0)
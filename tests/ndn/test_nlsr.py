@@ -0,0 +1,121 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+# tests.mock would shadow the mock package otherwise
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from mock import patch
+
+from ndn import nlsr
+from ndn.nlsr import NlsrConfigGenerator
+from tests.mock import MockHost
+
+class MockNlsrHost(MockHost):
+    def __init__(self, name, homeFolder):
+        MockHost.__init__(self, name)
+        self.homeFolder = homeFolder
+        self.nlsrParameters = {'max-faces-per-prefix': 2, 'radius': 12.34, 'angle': 1.234}
+
+    def intfList(self):
+        return []
+
+class TestNlsrConfigGenerator(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        template_file = os.path.join(self.work_dir, 'nlsr.conf')
+        with open(template_file, 'w') as template:
+            template.write("; general\n$GENERAL_SECTION\n; fib\n$FIB_SECTION\n$SECURITY_SECTION")
+        nlsr.load_conf_template(template_file)
+
+        home_folder = os.path.join(self.work_dir, 'a')
+        os.mkdir(home_folder)
+        self.host = MockNlsrHost('a', home_folder)
+
+    def tearDown(self):
+        nlsr._CONF_TEMPLATE = None
+        shutil.rmtree(self.work_dir)
+
+    def test_create_config_file(self):
+        NlsrConfigGenerator(self.host, False).createConfigFile()
+
+        with open(os.path.join(self.host.homeFolder, 'nlsr.conf')) as conf_file:
+            conf = conf_file.read()
+
+        self.assertTrue(conf.startswith("; general\ngeneral\n{\n"))
+        self.assertTrue("  router /%C1.Router/cs/a\n" in conf)
+        self.assertTrue("  log-dir {}/log\n".format(self.host.homeFolder) in conf)
+        self.assertTrue("; fib\nfib\n{\n  max-faces-per-prefix 2\n}\n" in conf)
+        self.assertTrue("type any" in conf)
+        self.assertFalse("$" in conf)
+
+        # Rendering happens in-process, without shell round trips
+        self.assertEqual(self.host.cmds, [])
+
+    def test_unknown_section_is_kept(self):
+        nlsr._CONF_TEMPLATE = ["a ", "OTHER_SECTION", " b"]
+        self.assertEqual(NlsrConfigGenerator(self.host, False).render(), "a $OTHER_SECTION b")
+
+class TestCertificates(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.work_dir, 'security'))
+        with open(os.path.join(self.work_dir, 'security', 'root.cert'), 'w') as root_cert:
+            root_cert.write('root')
+
+        self.hosts = []
+        for name in 'abcdef':
+            os.mkdir(os.path.join(self.work_dir, name))
+            self.hosts.append(MockNlsrHost(name, os.path.join(self.work_dir, name)))
+
+        self.signing = 0
+        self.maxSigning = 0
+        self.signingLock = threading.Lock()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def sign(self, cmd):
+        with self.signingLock:
+            self.signing += 1
+            self.maxSigning = max(self.maxSigning, self.signing)
+        time.sleep(0.01)
+        with self.signingLock:
+            self.signing -= 1
+
+    def test_root_signing_is_serialized(self):
+        with patch('ndn.nlsr.sh', side_effect=self.sign) as sh:
+            threads = [threading.Thread(target=nlsr.Nlsr.createHostCertificates, args=(host, self.work_dir))
+                       for host in self.hosts]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(sh.call_count, len(self.hosts))
+        self.assertEqual(self.maxSigning, 1)
@@ -0,0 +1,97 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ndn import overload_watchdog
+from ndn.overload_watchdog import OverloadWatchdog
+
+STAT = """cpu  100 0 50 800 10 0 20 20 0 0
+cpu0 50 0 25 400 5 0 10 10 0 0
+cpu1 50 0 25 400 5 0 10 10 0 0
+intr 12345
+procs_running 3
+procs_blocked 0
+"""
+
+class FakeCgroup(object):
+    def __init__(self, throttledUsec):
+        self.throttledUsec = throttledUsec
+
+    def read(self):
+        self.throttledUsec += 10000000
+        return (0, 0, 0, 0, self.throttledUsec, 0, 0, 0)
+
+class TestOverloadWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_parse_proc_stat(self):
+        times, nCpus, running = overload_watchdog.parse_proc_stat(STAT)
+        self.assertEqual(times, [100, 0, 50, 800, 10, 0, 20, 20])
+        self.assertEqual((nCpus, running), (2, 3))
+
+    def test_check(self):
+        watchdog = OverloadWatchdog(self.output_dir)
+        idle = [0, 0, 0, 0, 0, 0, 0, 0]
+
+        # 90% idle, no steal
+        self.assertEqual(watchdog.check([10, 0, 0, 90, 0, 0, 0, 0], idle, 2, 1, {}), [])
+        # Saturated machine
+        self.assertEqual(watchdog.check([80, 0, 0, 2, 0, 0, 8, 10], idle, 2, 4, {'a': 0.5, 'b': 0.0}),
+                         ['steal', 'idle', 'run-queue', 'throttled:a'])
+        self.assertEqual(watchdog.check([40, 0, 0, 30, 0, 0, 30, 0], idle, 2, 1, {}), ['softirq'])
+
+    def test_intervals(self):
+        # Any running process exceeds the run queue threshold
+        watchdog = OverloadWatchdog(self.output_dir, maxRunQueue=-1)
+        watchdog.add('a', FakeCgroup(0))
+        watchdog.sample()
+        watchdog.sample()
+        watchdog.sample()
+
+        # Contiguous ticks are merged
+        self.assertEqual(len(watchdog.intervals), 1)
+        self.assertTrue('run-queue' in watchdog.intervals[0][2])
+        self.assertTrue('throttled:a' in watchdog.intervals[0][2])
+
+        watchdog.flush()
+        intervals = overload_watchdog.read_intervals(os.path.join(self.output_dir, overload_watchdog.INTERVALS_FILE))
+        self.assertEqual(len(intervals), 1)
+        self.assertTrue(overload_watchdog.is_compromised(intervals, intervals[0][0]))
+        self.assertFalse(overload_watchdog.is_compromised(intervals, intervals[0][1] + 1))
+
+        with open(os.path.join(self.output_dir, overload_watchdog.SAMPLES_FILE)) as samples:
+            self.assertEqual(len(samples.readlines()), 2)
+
+    def test_not_overloaded(self):
+        watchdog = OverloadWatchdog(self.output_dir, maxSteal=1, minIdle=-1, maxSoftirq=1, maxRunQueue=10000)
+        watchdog.sample()
+        watchdog.sample()
+        self.assertEqual(watchdog.intervals, [])
@@ -0,0 +1,79 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ndn import phases
+from ndn.phases import PhaseTimeline
+
+class TestPhaseTimeline(unittest.TestCase):
+    def test_enter(self):
+        timeline = PhaseTimeline()
+        self.assertEqual(timeline.current(), None)
+
+        timeline.enter(phases.SETUP, 10)
+        timeline.enter(phases.CONVERGENCE, 20)
+        # Entering the current phase again does not start a new one
+        timeline.enter(phases.CONVERGENCE, 25)
+        timeline.enter(phases.TRAFFIC, 30)
+        self.assertEqual(timeline.current(), phases.TRAFFIC)
+
+        timeline.end(40)
+        self.assertEqual(timeline.current(), None)
+        self.assertEqual(timeline.phases, [[phases.SETUP, 10, 20], [phases.CONVERGENCE, 20, 30],
+                                           [phases.TRAFFIC, 30, 40]])
+
+        self.assertEqual(timeline.at(5), None)
+        self.assertEqual(timeline.at(10), phases.SETUP)
+        self.assertEqual(timeline.at(25), phases.CONVERGENCE)
+        self.assertEqual(timeline.at(39.9), phases.TRAFFIC)
+        self.assertEqual(timeline.at(40), None)
+
+    def test_listeners(self):
+        timeline = PhaseTimeline()
+        changes = []
+        timeline.listeners.append(changes.append)
+
+        timeline.enter(phases.SETUP, 10)
+        timeline.enter(phases.SETUP, 15)
+        timeline.enter(phases.TRAFFIC, 20)
+        timeline.end(30)
+        timeline.end(40)
+        self.assertEqual(changes, [phases.SETUP, phases.TRAFFIC, None])
+
+    def test_write_and_read(self):
+        timeline = PhaseTimeline()
+        timeline.enter(phases.FAILURE, 1.5)
+        timeline.enter(phases.RECOVERY, 2.5)
+
+        work_dir = tempfile.mkdtemp()
+        try:
+            fileName = os.path.join(work_dir, 'phases.txt')
+            timeline.write(fileName)
+            self.assertEqual(phases.read(fileName).phases,
+                             [[phases.FAILURE, 1.5, 2.5], [phases.RECOVERY, 2.5, None]])
+        finally:
+            shutil.rmtree(work_dir)
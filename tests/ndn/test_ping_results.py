@@ -0,0 +1,144 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from ndn import ping_results
+
+def write_log(work_dir, src, dst, lines):
+    ping_dir = os.path.join(work_dir, src, 'ping-data')
+    if not os.path.isdir(ping_dir):
+        os.makedirs(ping_dir)
+    with open(os.path.join(ping_dir, '{}.txt'.format(dst)), 'w') as log:
+        log.write('PING /ndn/edu/{}\n'.format(dst))
+        log.write('\n'.join(lines) + '\n')
+
+class TestParse(unittest.TestCase):
+    def test_parse_line(self):
+        record = ping_results.parse_line('1473787440123 milliseconds - content from /ndn/edu/b: seq=9573 time=12.5 ms')
+        self.assertEqual(record, (1473787440.123, 9573, 12.5, False))
+
+        timestamp, seq, rtt, timeout = ping_results.parse_line('1473787441.5 - timeout from /ndn/edu/b: seq=9574')
+        self.assertEqual((timestamp, seq, timeout), (1473787441.5, 9574, True))
+        self.assertTrue(math.isnan(rtt))
+
+        record = ping_results.parse_line('1473787442.5 - nack from /ndn/edu/b: seq=9575 reason=NoRoute')
+        self.assertTrue(record[3])
+
+        self.assertEqual(ping_results.parse_line('PING /ndn/edu/b'), None)
+
+    def test_parse_traffic_file(self):
+        work_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(work_dir, 'b-traffic.txt')
+            with open(path, 'w') as log:
+                log.write("100.000 - Sending Interest   - PatternType=1, GlobalID=1, LocalID=0, Name=/ndn/edu/b/ping/0\n")
+                log.write("100.012 - Data Received      - PatternType=1, GlobalID=1, LocalID=0, Name=/ndn/edu/b/ping/0\n")
+                log.write("Sending Interest   - PatternType=1, GlobalID=3, LocalID=1, Name=/ndn/edu/b/ping/1\n")
+                log.write("104.500 - Interest Timed Out - PatternType=1, GlobalID=3, LocalID=1, Name=/ndn/edu/b/ping/1\n")
+                log.write("105.000 - Interest Nack'd    - PatternType=1, GlobalID=5, LocalID=2, Name=/ndn/edu/b/ping/2\n")
+
+            records = list(ping_results.parse_traffic_file(path))
+            self.assertEqual(len(records), 3)
+            self.assertEqual(records[0][:2], (100.012, 0))
+            self.assertAlmostEqual(records[0][2], 12.0, places=3)
+            self.assertFalse(records[0][3])
+            self.assertEqual((records[1][0], records[1][1], records[1][3]), (104.5, 1, True))
+            self.assertTrue(math.isnan(records[1][2]))
+            self.assertEqual((records[2][1], records[2][3]), (2, True))
+
+            # Logs of both traffic apps are found, under their destination
+            ping_dir = os.path.join(work_dir, 'a', 'ping-data')
+            os.makedirs(ping_dir)
+            shutil.move(path, ping_dir)
+            open(os.path.join(ping_dir, 'c.txt'), 'w').close()
+            nodes, jobs = ping_results.find_files(work_dir)
+            self.assertEqual(nodes, ['a', 'b', 'c'])
+            self.assertEqual([(src, dst) for path, src, dst in jobs], [(0, 1), (0, 2)])
+        finally:
+            shutil.rmtree(work_dir)
+
+@unittest.skipIf(ping_results.numpy is None, "NumPy is not installed")
+class TestIngest(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        write_log(self.work_dir, 'a', 'b', [
+            '100.2 - content from /ndn/edu/b: seq=1 time=10.0 ms',
+            '101.2 - content from /ndn/edu/b: seq=2 time=20.0 ms',
+            '102.2 - timeout from /ndn/edu/b: seq=3',
+            '103.2 - content from /ndn/edu/b: seq=4 time=30.0 ms'
+        ])
+        write_log(self.work_dir, 'b', 'a', [
+            '100.5 - timeout from /ndn/edu/a: seq=7',
+            '101.5 - content from /ndn/edu/a: seq=8 time=40.0 ms'
+        ])
+        # b's clients were launched in a second window, after a's
+        ping_results.write_launch_window(self.work_dir, 99.8, 100.1)
+        ping_results.write_launch_window(self.work_dir, 100.4, 100.45)
+        self.output_dir = os.path.join(self.work_dir, 'results')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_ingest_and_load(self):
+        ping_results.ingest(self.work_dir, self.output_dir, processes=2)
+        results = ping_results.load(self.output_dir)
+
+        self.assertEqual(results.nodes, ['a', 'b'])
+        self.assertEqual(len(results), 6)
+        self.assertEqual(sorted(results.seq.tolist()), [1, 2, 3, 4, 7, 8])
+
+        self.assertEqual(results.loss(), 2.0 / 6)
+        self.assertEqual(results.loss(src='a', dst='b'), 0.25)
+        self.assertEqual(results.lossMatrix()[1, 0], 0.5)
+        self.assertTrue(math.isnan(results.lossMatrix()[0, 0]))
+        self.assertEqual(results.rttPercentiles((50,), src='a'), [20.0])
+
+        start, availability = results.availability()
+        self.assertEqual(start, 100)
+        self.assertEqual(availability.tolist(), [0.5, 1.0, 0.0, 1.0])
+
+    def test_excluding(self):
+        results = ping_results.ingest(self.work_dir, self.output_dir, processes=1)
+
+        intervals = [(100.0, 100.6, ['idle']), (103.0, 104.0, ['steal'])]
+        self.assertEqual(results.inIntervals(intervals).sum(), 3)
+
+        kept = results.excluding(intervals)
+        self.assertEqual(sorted(kept.seq.tolist()), [2, 3, 8])
+        self.assertEqual(kept.loss(), 1.0 / 3)
+
+    def test_pair_starts(self):
+        ping_results.ingest(self.work_dir, self.output_dir, processes=1)
+        results = ping_results.load(self.output_dir)
+        self.assertEqual(results.launchWindows, [(99.8, 100.1), (100.4, 100.45)])
+
+        src, dst, first, offset = results.pairStarts()
+        self.assertEqual(zip(src.tolist(), dst.tolist()), [(0, 1), (1, 0)])
+        self.assertEqual(first.tolist(), [100.2, 100.5])
+        self.assertAlmostEqual(offset[0], 0.4)
+        self.assertAlmostEqual(offset[1], 0.1)
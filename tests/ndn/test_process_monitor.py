@@ -0,0 +1,113 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from ndn import process_monitor
+from ndn.process_monitor import ProcessSampler
+
+STAT = ("1234 (nfd (main)) S 1 1234 1234 0 -1 4194560 1000 0 0 0 "
+        "250 75 0 0 20 0 4 0 100 123456789 2048 18446744073709551615\n")
+
+class TestProcessSampler(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def read_samples(self, name, pid):
+        path = os.path.join(self.output_dir, '{}-{}{}'.format(name, pid, process_monitor.FILE_SUFFIX))
+        with open(path, 'rb') as log:
+            data = log.read()
+
+        size = process_monitor.RECORD_STRUCT.size
+        self.assertEqual(len(data) % size, 0)
+        return [process_monitor.RECORD_STRUCT.unpack_from(data, offset) for offset in range(0, len(data), size)]
+
+    def test_parse(self):
+        utime, stime, rss, vsize, num_threads = process_monitor.parse_stat(STAT)
+        self.assertEqual((utime, stime, vsize, num_threads), (250, 75, 123456789, 4))
+        self.assertEqual(rss, 2048 * os.sysconf('SC_PAGE_SIZE'))
+
+        status = "Name:\tnfd\nvoluntary_ctxt_switches:\t42\nnonvoluntary_ctxt_switches:\t7\n"
+        self.assertEqual(process_monitor.parse_status(status), (42, 7))
+
+    def test_sample_and_flush(self):
+        sampler = ProcessSampler(self.output_dir)
+        sampler.add(os.getpid(), 'self')
+        sampler.add(os.getppid(), 'parent')
+        sampler.sample()
+        sampler.sample()
+
+        # Nothing is written until the buffers are flushed
+        self.assertEqual(os.listdir(self.output_dir), [])
+        sampler.flush()
+
+        records = self.read_samples('self', os.getpid())
+        self.assertEqual(len(records), 2)
+        self.assertEqual(len(records[0]), len(process_monitor.RECORD_FIELDS))
+        self.assertTrue(abs(records[0][0] - time.time()) < 60)
+        self.assertTrue(records[0][3] > 0)
+        self.assertTrue(records[1][0] >= records[0][0])
+        self.assertEqual(len(self.read_samples('parent', os.getppid())), 2)
+
+    @unittest.skipIf(process_monitor.numpy is None, "NumPy is not installed")
+    def test_load_samples(self):
+        sampler = ProcessSampler(self.output_dir)
+        sampler.add(os.getpid(), 'a-nfd')
+        for i in range(3):
+            sampler.sample()
+        sampler.flush()
+
+        samples = process_monitor.load_samples(self.output_dir)
+        self.assertEqual(list(samples), [('a-nfd', os.getpid())])
+
+        records = samples[('a-nfd', os.getpid())]
+        self.assertEqual(len(records), 3)
+        self.assertTrue((records['num_threads'] >= 1).all())
+        self.assertTrue((records['rss'] > 0).all())
+
+    def test_exited_process_is_dropped(self):
+        sampler = ProcessSampler(self.output_dir)
+        sampler.add(2 ** 22 + 1, 'gone')
+        sampler.sample()
+        sampler.flush()
+
+        self.assertEqual(os.listdir(self.output_dir), [])
+        self.assertEqual(sampler._processes, {})
+
+    def test_thread(self):
+        sampler = ProcessSampler(self.output_dir, interval=0.01)
+        self.assertEqual(sampler.interval, 0.1)
+
+        sampler.add(os.getpid(), 'self')
+        sampler.start()
+        time.sleep(0.35)
+        sampler.stop()
+
+        self.assertTrue(2 <= len(self.read_samples('self', os.getpid())) <= 4)
@@ -0,0 +1,127 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from ndn import phases, profiling
+from ndn.phases import PhaseTimeline
+from ndn.profiling import PhaseProfiler
+
+def wait_for_node():
+    time.sleep(0.01)
+
+def build_hosts():
+    sum(range(1000))
+
+def bring_up():
+    sum(range(1000))
+
+class TestProfiling(unittest.TestCase):
+    def test_is_blocking(self):
+        self.assertTrue(profiling.is_blocking(('~', 0, '<time.sleep>')))
+        self.assertTrue(profiling.is_blocking(('~', 0, "<method 'read' of 'file' objects>")))
+        self.assertTrue(profiling.is_blocking(('mininet/node.py', 300, 'waitOutput')))
+        self.assertFalse(profiling.is_blocking(('ndn/nlsr.py', 80, 'start')))
+
+    def test_function_name(self):
+        self.assertEqual(profiling.function_name(('~', 0, '<time.sleep>')), '<time.sleep>')
+        self.assertEqual(profiling.function_name(('ndn/nlsr.py', 80, 'start')), 'ndn/nlsr.py:80(start)')
+        self.assertEqual(profiling.function_name(None), '?')
+
+class TestPhaseProfiler(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.timeline = PhaseTimeline()
+        self.profiler = PhaseProfiler(self.work_dir, self.timeline)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def profileExperiment(self):
+        self.timeline.enter(phases.SETUP)
+        self.profiler.start()
+
+        self.timeline.enter(phases.HOSTS)
+        build_hosts()
+
+        self.timeline.enter(phases.NLSR)
+        worker = threading.Thread(target=self.bringUpWorker)
+        worker.start()
+        worker.join()
+
+        self.timeline.enter(phases.SETUP)
+        self.timeline.enter(phases.TRAFFIC)
+        wait_for_node()
+        self.timeline.end()
+        self.profiler.stop()
+
+    def bringUpWorker(self):
+        with self.profiler.thread():
+            bring_up()
+
+    def functions(self, stats):
+        return set(function[2] for function in stats.stats)
+
+    def test_phases(self):
+        self.profileExperiment()
+
+        # The worker thread is part of the phase it ran in
+        self.assertIn('bring_up', self.functions(self.profiler.stats(phases.NLSR)))
+        self.assertNotIn('bring_up', self.functions(self.profiler.stats(phases.SETUP)))
+        self.assertNotIn('bring_up', self.functions(self.profiler.stats(phases.TRAFFIC)))
+        self.assertIn('build_hosts', self.functions(self.profiler.stats(phases.HOSTS)))
+        self.assertNotIn('build_hosts', self.functions(self.profiler.stats(phases.SETUP)))
+        self.assertIn('wait_for_node', self.functions(self.profiler.stats(phases.TRAFFIC)))
+        self.assertEqual(self.profiler.stats(phases.FAILURE), None)
+
+        # Phase changes after the profiler stopped are ignored
+        self.timeline.enter(phases.RECOVERY)
+        self.assertEqual(self.profiler.stats(phases.RECOVERY), None)
+
+    def test_hot_call_sites(self):
+        self.profileExperiment()
+
+        sites = profiling.hot_call_sites(self.profiler.stats(phases.TRAFFIC), blockingOnly=True)
+        self.assertEqual(sites[0][1], 1)
+        self.assertEqual(sites[0][2][2], 'wait_for_node')
+        self.assertEqual(sites[0][3][2], '<time.sleep>')
+        self.assertTrue(sites[0][0] >= 0.01)
+
+    def test_write(self):
+        self.profileExperiment()
+        self.profiler.write()
+
+        for phase in [phases.SETUP, phases.HOSTS, phases.NLSR, phases.TRAFFIC]:
+            stats = pstats.Stats(os.path.join(self.work_dir, '{}.pstats'.format(phase)))
+            self.assertTrue(len(stats.stats) > 0)
+
+        with open(os.path.join(self.work_dir, 'summary.txt')) as summaryFile:
+            summary = summaryFile.read()
+        self.assertTrue(summary.index('== setup') < summary.index('== traffic'))
+        self.assertIn('wait_for_node) -> <time.sleep>', summary)
@@ -0,0 +1,107 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from minindn.config import LinkConfig
+from ndn import queue_monitor
+from ndn.queue_monitor import QueueSampler
+from tests.mock import MockLink, MockNet, MockNode
+
+TC_OUTPUT = """qdisc htb 5: dev a-eth0 root refcnt 2 r2q 10 default 1 direct_packets_stat 0 direct_qlen 1000
+ Sent 120000 bytes 100 pkt (dropped 0, overlimits 40 requeues 0)
+ backlog 0b 0p requeues 0
+qdisc netem 10: dev a-eth0 parent 5:1 limit 1000 delay 10.0ms
+ Sent 118000 bytes 98 pkt (dropped 2, overlimits 0 requeues 1)
+ backlog 3Kb 2p requeues 1
+qdisc noqueue 0: dev lo root refcnt 2
+ Sent 0 bytes 0 pkt (dropped 0, overlimits 0 requeues 0)
+ backlog 0b 0p requeues 0
+qdisc pfifo_fast 0: dev a-eth1 root refcnt 2 bands 3 priomap  1 2 2 2 1 2 0 0 1 1 1 1 1 1 1 1
+ Sent 500 bytes 5 pkt (dropped 0, overlimits 0 requeues 0)
+ backlog 0b 0p requeues 0
+"""
+
+class FileQueueSampler(QueueSampler):
+    "Reads the tc output from files instead of the nodes' namespaces"
+    def __init__(self, outputDir, outputs):
+        QueueSampler.__init__(self, outputDir)
+        self.outputs = outputs
+
+    def command(self, nodeName):
+        return ['cat', self.outputs.pop(0)]
+
+class TestQueueSampler(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_parse_qdiscs(self):
+        qdiscs = queue_monitor.parse_qdiscs(TC_OUTPUT)
+        self.assertEqual([(qdisc['dev'], qdisc['kind'], qdisc['handle']) for qdisc in qdiscs],
+                         [('a-eth0', 'htb', '5'), ('a-eth0', 'netem', '10'), ('lo', 'noqueue', '0'),
+                          ('a-eth1', 'pfifo_fast', '0')])
+        self.assertEqual(qdiscs[0]['overlimits'], 40)
+        self.assertEqual((qdiscs[1]['dropped'], qdiscs[1]['requeues']), (2, 1))
+        self.assertEqual((qdiscs[1]['backlog_bytes'], qdiscs[1]['backlog_packets']), (3072, 2))
+
+        # Without a dev, the qdiscs are those of the given interface
+        self.assertEqual(queue_monitor.parse_qdiscs("qdisc netem 10: root limit 1000\n", dev='b-eth0')[0]['dev'], 'b-eth0')
+
+    def test_sample(self):
+        a, b, c = MockNode('a', 1), MockNode('b', 2), MockNode('c', 3)
+        net = MockNet([a, b, c], [MockLink(a, 'a-eth0', b, 'b-eth0'), MockLink(a, 'a-eth1', c, 'c-eth0')])
+
+        outputs = []
+        for i, dropped in enumerate((2, 7)):
+            path = os.path.join(self.output_dir, 'tc-{}.txt'.format(i))
+            with open(path, 'w') as output:
+                output.write(TC_OUTPUT.replace('dropped 2,', 'dropped {},'.format(dropped)))
+            outputs.append(path)
+
+        sampler = FileQueueSampler(self.output_dir, outputs)
+        sampler.addLinks(net, [LinkConfig('a', 'b', {'bw': 10}), LinkConfig('a', 'c', {})])
+        self.assertEqual(sampler.interfaces, {'a': {'a-eth0': 'a:b'}, 'b': {'b-eth0': 'a:b'}})
+
+        # Only the node a is sampled, b's namespace has no output
+        sampler.nodePids = {'a': 1}
+        sampler.sample()
+        sampler.sample()
+        sampler.flush()
+
+        summary = sampler.summary()
+        self.assertEqual(sorted(summary), ['a-a-eth0-htb-5', 'a-a-eth0-netem-10'])
+        self.assertEqual(summary['a-a-eth0-netem-10']['dropped'], 5)
+        self.assertEqual(summary['a-a-eth0-netem-10']['peak_backlog_packets'], 2)
+        self.assertEqual(summary['a-a-eth0-netem-10']['link'], 'a:b')
+
+        if queue_monitor.numpy is not None:
+            series = queue_monitor.load_series(self.output_dir)
+            self.assertEqual(series['a-a-eth0-netem-10']['link'], 'a:b')
+            self.assertEqual(len(series['a-a-eth0-netem-10']['timestamp']), 1)
+            self.assertTrue(series['a-a-eth0-netem-10']['dropped'][0] > 0)
@@ -0,0 +1,112 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ndn import fib
+from ndn import route_recorder
+from ndn.route_recorder import RouteHistory, RouteRecorder
+
+FIB_OUTPUT = """FIB:
+  /localhost/nfd nexthops={faceid=1 (cost=0)}
+  /ndn/edu/b nexthops={faceid=262 (cost=10), faceid=263 (cost=20)}
+"""
+
+class TestRouteRecorder(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_parse_rib(self):
+        rib = route_recorder.parse_rib("""RIB:
+  /ndn/edu/b route={faceid=262 (origin=128 cost=10 flags=ChildInherit), faceid=263 (origin=128 cost=20 flags=ChildInherit)}
+""")
+        self.assertEqual(rib, fib.Fib({'/ndn/edu/b': {262: 10, 263: 20}}))
+
+        rib = route_recorder.parse_rib("""prefix=/ndn/edu/b nexthop=262 origin=nlsr cost=10 flags=child-inherit expires=never
+prefix=/ndn/edu/b nexthop=262 origin=static cost=5 flags=child-inherit expires=never
+prefix=/ndn/edu/c nexthop=263 origin=nlsr cost=20 flags=child-inherit expires=never
+""")
+        self.assertEqual(rib, fib.Fib({'/ndn/edu/b': {262: 5}, '/ndn/edu/c': {263: 20}}))
+
+        # FIB lines are not routes
+        self.assertEqual(len(route_recorder.parse_rib(FIB_OUTPUT)), 0)
+
+    def test_diff(self):
+        old = fib.Fib({'/a': {1: 10, 2: 20}, '/b': {3: 5}})
+        new = fib.Fib({'/a': {1: 15}, '/c': {4: 1}})
+        changes = route_recorder.diff(old, new)
+        self.assertEqual(changes, [('~', '/a', 1, 15), ('-', '/a', 2, None), ('-', '/b', 3, None), ('+', '/c', 4, 1)])
+
+        entries = {'/a': {1: 10, 2: 20}, '/b': {3: 5}}
+        route_recorder.apply_changes(entries, changes)
+        self.assertEqual(fib.Fib(entries), new)
+
+        line = route_recorder.format_change(12.5, route_recorder.FIB, changes[1])
+        self.assertEqual(route_recorder.parse_change(line), (12.5, 'fib', changes[1]))
+
+    def test_record_and_read(self):
+        output_dir = os.path.join(self.work_dir, 'route-history')
+        home_folder = os.path.join(self.work_dir, 'a')
+        os.mkdir(home_folder)
+
+        class Host(object):
+            name = 'a'
+            homeFolder = home_folder
+
+        recorder = RouteRecorder(output_dir)
+        recorder.commands = {route_recorder.FIB: ['sh', '-c', 'cat $HOME/fib'],
+                             route_recorder.RIB: ['sh', '-c', 'cat $HOME/rib']}
+        recorder.addHosts([Host()])
+
+        fibs = [FIB_OUTPUT, FIB_OUTPUT, FIB_OUTPUT.replace('faceid=262 (cost=10), ', '')]
+        for fib_output in fibs:
+            with open(os.path.join(home_folder, 'fib'), 'w') as fib_file:
+                fib_file.write(fib_output)
+            with open(os.path.join(home_folder, 'rib'), 'w') as rib_file:
+                rib_file.write("  /ndn/edu/b route={faceid=263 (origin=128 cost=20 flags=ChildInherit)}\n")
+            recorder.sample()
+
+        # A node whose forwarder is down keeps its last tables
+        os.remove(os.path.join(home_folder, 'fib'))
+        recorder.sample()
+        recorder.flush()
+
+        with open(os.path.join(output_dir, 'a' + route_recorder.FILE_SUFFIX)) as routes:
+            # 3 FIB and 1 RIB additions, then 1 removal
+            self.assertEqual(len(routes.readlines()), 5)
+
+        history = RouteHistory(output_dir)
+        self.assertEqual(history.nodes(), ['a'])
+        changeTimes = history.changeTimes('a')
+        self.assertEqual(len(changeTimes), 2)
+
+        self.assertEqual(len(history.tableAt('a', changeTimes[0] - 1)), 0)
+        self.assertEqual(history.tableAt('a', changeTimes[0]).nexthops('/ndn/edu/b'), {262: 10, 263: 20})
+        self.assertEqual(history.tableAt('a', changeTimes[1]).nexthops('/ndn/edu/b'), {263: 20})
+        self.assertEqual(history.tableAt('a', changeTimes[1], route_recorder.RIB).nexthops('/ndn/edu/b'), {263: 20})
@@ -0,0 +1,193 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import unittest
+from mock import patch
+
+from ndn import routing_overhead
+from ndn.phases import PhaseTimeline
+from ndn.routing_overhead import RoutingOverheadMeter
+
+class MockCaptureHost(object):
+    "Runs script instead of tcpdump"
+    def __init__(self, name, script):
+        self.name = name
+        self.pid = 1
+        self.script = script
+        self.commands = []
+
+    def popen(self, command, mncmd=None, **kwargs):
+        self.commands.append(command)
+        return subprocess.Popen(['sh', '-c', self.script], **kwargs)
+
+def tlv(tlvType, value):
+    "Encode a TLV element with one-byte or three-byte type and length"
+    def number(n):
+        return chr(n) if n < 253 else chr(253) + struct.pack('>H', n)
+    return number(tlvType) + number(len(value)) + value
+
+def name(uri):
+    return tlv(0x07, ''.join(tlv(0x08, component) for component in uri.strip('/').split('/')))
+
+def interest(uri):
+    return tlv(0x05, name(uri) + tlv(0x0a, 'nonce'))
+
+def data(uri):
+    return tlv(0x06, name(uri) + tlv(0x15, 'content'))
+
+def nack(uri):
+    return tlv(0x64, tlv(0x0320, tlv(0x0321, chr(150))) + tlv(0x50, interest(uri)))
+
+def udp_frame(payload, outgoing, linkType=113):
+    "A `tcpdump -i any` (Linux cooked, v1 or v2) frame of an IPv4 UDP datagram"
+    if linkType == 276:
+        sll = struct.pack('>HHIHBB8s', 0x0800, 0, 2, 1, 4 if outgoing else 0, 6, '\0' * 8)
+    else:
+        sll = struct.pack('>HHH8sH', 4 if outgoing else 0, 1, 6, '\0' * 8, 0x0800)
+    ip = struct.pack('>BBHHHBBH4s4s', 0x45, 0, 20 + 8 + len(payload), 0, 0, 64, 17, 0, '\1\0\0\1', '\1\0\0\2')
+    udp = struct.pack('>HHHH', 6363, 6363, 8 + len(payload), 0)
+    return sll + ip + udp + payload
+
+def write_pcap(path, frames, snaplen=routing_overhead.SNAPLEN, linkType=113):
+    with open(path, 'wb') as pcap:
+        pcap.write(struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, snaplen, linkType))
+        for timestamp, frame in frames:
+            captured = frame[:snaplen]
+            pcap.write(struct.pack('<IIII', int(timestamp), int(round((timestamp % 1) * 1e6)),
+                                   len(captured), len(frame)))
+            pcap.write(captured)
+
+HELLO = '/ndn/edu/memphis/%C1.Router/cs/a/NLSR/INFO/%07%1A/ndn/edu/b'
+LSA = '/localhop/ndn/NLSR/LSA/edu/memphis/%C1.Router/cs/b/NAME/1'
+SYNC = '/localhop/ndn/nlsr/sync/%00%01/abcdef'
+
+class TestRoutingOverhead(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_parse_ndn_packet(self):
+        self.assertEqual(routing_overhead.parse_ndn_packet(interest('/a/NLSR/INFO/b')),
+                         ('interest', ['a', 'NLSR', 'INFO', 'b']))
+        self.assertEqual(routing_overhead.parse_ndn_packet(data('/a/b')), ('data', ['a', 'b']))
+        self.assertEqual(routing_overhead.parse_ndn_packet(tlv(0x64, tlv(0x50, data('/c')))), ('data', ['c']))
+        self.assertEqual(routing_overhead.parse_ndn_packet(nack('/d/e')), ('nack', ['d', 'e']))
+
+        # IDLE LpPacket and unknown packets
+        self.assertEqual(routing_overhead.parse_ndn_packet(tlv(0x64, tlv(0x52, '\0'))), None)
+        self.assertEqual(routing_overhead.parse_ndn_packet('\x10\x00'), None)
+
+        # Truncated names keep their complete components
+        self.assertEqual(routing_overhead.parse_ndn_packet(interest('/a/bcdef')[:8]), ('interest', ['a']))
+
+    def test_classify(self):
+        self.assertEqual(routing_overhead.classify(HELLO.strip('/').split('/')), 'hello')
+        self.assertEqual(routing_overhead.classify(LSA.strip('/').split('/')), 'lsa')
+        self.assertEqual(routing_overhead.classify(SYNC.strip('/').split('/')), 'sync')
+        self.assertEqual(routing_overhead.classify(['ndn', 'edu', 'b', 'ping', '1']), None)
+        self.assertEqual(routing_overhead.classify(['NLSR']), None)
+
+    def test_link_types(self):
+        path = os.path.join(self.work_dir, 'a-' + routing_overhead.CAPTURE_FILE)
+
+        # tcpdump 4.99 and later capture `-i any` as LINUX_SLL2
+        write_pcap(path, [(100.2, udp_frame(interest(HELLO), True, 276)),
+                          (100.4, udp_frame(data(HELLO), False, 276))], linkType=276)
+        counts = routing_overhead.count_file(path)
+        self.assertEqual(counts[(100, 'hello', 'interest', True)], [1, len(interest(HELLO))])
+        self.assertEqual(counts[(100, 'hello', 'data', False)][0], 1)
+
+        write_pcap(path, [(100.2, udp_frame(interest(HELLO), True))], linkType=228)
+        with patch('ndn.routing_overhead.logging.warning') as warning:
+            self.assertEqual(routing_overhead.count_file(path), {})
+        self.assertEqual(warning.call_count, 1)
+
+    def test_count_and_summarize(self):
+        path = os.path.join(self.work_dir, 'a-' + routing_overhead.CAPTURE_FILE)
+        write_pcap(path, [
+            (100.2, udp_frame(interest(HELLO), True)),
+            (100.4, udp_frame(data(HELLO), False)),
+            (100.6, udp_frame(interest(LSA) + 'x' * 1000, True)),
+            (101.1, udp_frame(interest(SYNC), True)),
+            (101.2, udp_frame(nack(SYNC), True)),
+            (101.3, udp_frame(interest('/ndn/edu/b/ping/1'), True)),
+            (102.5, udp_frame(data(LSA), True))
+        ])
+
+        counts = routing_overhead.count_file(path)
+        self.assertEqual(counts[(100, 'hello', 'interest', True)], [1, len(interest(HELLO))])
+        self.assertEqual(counts[(100, 'hello', 'data', False)][0], 1)
+        # Sizes are those on the wire, not the captured ones
+        self.assertEqual(counts[(100, 'lsa', 'interest', True)][1], len(interest(LSA)) + 1000)
+        self.assertEqual(counts[(101, 'sync', 'nack', True)][0], 1)
+        self.assertEqual(len(counts), 6)
+
+        timeline = PhaseTimeline()
+        timeline.enter('setup', 100)
+        timeline.enter('traffic', 102)
+        timeline.end(104)
+
+        summary = routing_overhead.summarize({'a': counts}, timeline)
+        setup = summary['setup']['total']
+        self.assertEqual(setup['all']['packets'], 4)
+        self.assertEqual(setup['all']['packets_per_second'], 2.0)
+        self.assertEqual(setup['sync']['nack'], 1)
+        self.assertFalse('hello' in summary['traffic']['total'])
+        self.assertEqual(summary['traffic']['hosts']['a']['lsa']['data'], 1)
+
+        meter = RoutingOverheadMeter(self.work_dir, {'hyperbolic-state': 'off'}, timeline=timeline)
+        meter.captures = {'a': (path, None)}
+        self.assertEqual(meter.analyze(processes=1), summary)
+
+        with open(os.path.join(self.work_dir, routing_overhead.SUMMARY_FILE)) as summary_file:
+            saved = json.load(summary_file)
+        self.assertEqual(saved['parameters'], {'hyperbolic-state': 'off'})
+        self.assertEqual(saved['missing_captures'], [])
+        with open(os.path.join(self.work_dir, 'a-routing-overhead.txt')) as counts_file:
+            self.assertEqual(len(counts_file.readlines()), 6)
+
+    @patch('ndn.routing_overhead.START_CHECK_DELAY', 0.2)
+    def test_failed_capture(self):
+        meter = RoutingOverheadMeter(self.work_dir, timeline=PhaseTimeline())
+        a = MockCaptureHost('a', 'sleep 5')
+        b = MockCaptureHost('b', 'echo "tcpdump: permission denied" >&2; exit 1')
+        try:
+            self.assertEqual(meter.start([a, b]), ['b'])
+        finally:
+            meter.stop()
+
+        self.assertEqual(a.commands[0][6:8], ['-Z', 'root'])
+        with open(meter.captureLog('b')) as log_file:
+            self.assertEqual(log_file.read(), 'tcpdump: permission denied\n')
+
+        meter.analyze(processes=1)
+        with open(os.path.join(self.work_dir, routing_overhead.SUMMARY_FILE)) as summary_file:
+            self.assertEqual(json.load(summary_file)['missing_captures'], ['a', 'b'])
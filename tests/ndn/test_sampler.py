@@ -0,0 +1,67 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import shutil
+import tempfile
+import threading
+import unittest
+
+from ndn.sampler import PeriodicSampler
+
+class FailingSampler(PeriodicSampler):
+    "Fails its first sample"
+    def __init__(self, outputDir):
+        PeriodicSampler.__init__(self, outputDir, interval=0.1)
+        self.samples = 0
+        self.sampled = threading.Event()
+
+    def sample(self):
+        self.samples += 1
+        if self.samples == 1:
+            raise IOError("The first sample fails")
+        self.sampled.set()
+
+class TestPeriodicSampler(unittest.TestCase):
+    def setUp(self):
+        self.outputDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.outputDir)
+
+    def test_sample_function(self):
+        sampled = threading.Event()
+        sampler = PeriodicSampler(self.outputDir, interval=0.1, sampleFunction=sampled.set)
+        sampler.start()
+        self.assertTrue(sampled.wait(2))
+        sampler.stop()
+
+    def test_no_sample(self):
+        self.assertRaises(ValueError, PeriodicSampler, self.outputDir)
+
+    def test_failed_sample(self):
+        # The sampling thread survives an exception and keeps sampling
+        sampler = FailingSampler(self.outputDir)
+        sampler.start()
+        self.assertTrue(sampler.sampled.wait(2))
+        sampler.stop()
+        self.assertTrue(sampler.samples >= 2)
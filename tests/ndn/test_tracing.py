@@ -0,0 +1,101 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from ndn import phases, tracing
+from ndn.phases import PhaseTimeline
+from ndn.tracing import Tracer
+
+class TestTracer(unittest.TestCase):
+    def test_span(self):
+        tracer = Tracer()
+        with tracer.span('bring-up'):
+            with tracer.span('nfd', track='a', stage=1):
+                pass
+
+        self.assertEqual([(span[0], span[1]) for span in tracer.spans], [('bring-up', 'main'), ('nfd', 'a')])
+        self.assertEqual(tracer.spans[1][4], {'stage': 1})
+        # The outer span encloses the inner one
+        self.assertTrue(tracer.spans[0][2] <= tracer.spans[1][2] <= tracer.spans[1][3] <= tracer.spans[0][3])
+        self.assertTrue(tracer.duration('bring-up') >= 0)
+        self.assertEqual(tracer.duration('nfd'), 0)
+
+    def test_span_closed_on_error(self):
+        tracer = Tracer()
+        with self.assertRaises(ValueError):
+            with tracer.span('config parse'):
+                raise ValueError()
+        self.assertNotEqual(tracer.spans[0][3], None)
+
+    def test_concurrent_hosts(self):
+        tracer = Tracer()
+        def bringUp(name):
+            with tracer.span('nlsr', track=name):
+                pass
+
+        threads = [threading.Thread(target=bringUp, args=(str(i),)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(span[1] for span in tracer.spans), [str(i) for i in range(8)])
+
+    def test_events(self):
+        tracer = Tracer()
+        tracer.spans = [['bring-up', 'main', 1.0, 3.0, {}], ['nfd', 'b', 1.0, 1.5, {}], ['nfd', 'a', 1.0, 2.0, {}]]
+        tracer.instant('fail', track='a')
+        timeline = PhaseTimeline()
+        timeline.enter(phases.SETUP, 0.5)
+        timeline.end(3.5)
+
+        events = tracer.events(timeline)
+        names = dict((event['tid'], event['args']['name']) for event in events if event['name'] == 'thread_name')
+        self.assertEqual(names, {0: 'main', 1: 'phases', 2: 'a', 3: 'b'})
+
+        spans = [event for event in events if event['ph'] == 'X']
+        self.assertEqual([(event['name'], event['tid'], event['ts'], event['dur']) for event in spans],
+                         [('bring-up', 0, 1000000, 2000000), ('nfd', 3, 1000000, 500000),
+                          ('nfd', 2, 1000000, 1000000), (phases.SETUP, 1, 500000, 3000000)])
+
+        instants = [event for event in events if event['ph'] == 'i']
+        self.assertEqual([(event['name'], event['tid']) for event in instants], [('fail', 2)])
+
+    def test_export(self):
+        work_dir = tempfile.mkdtemp()
+        try:
+            tracer = Tracer()
+            with tracer.span('teardown'):
+                pass
+            trace_file = os.path.join(work_dir, 'trace.json')
+            tracer.export(trace_file)
+
+            events = tracing.read(trace_file)
+            self.assertEqual([event['name'] for event in events if event['ph'] == 'X'], ['teardown'])
+        finally:
+            shutil.rmtree(work_dir)
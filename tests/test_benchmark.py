@@ -0,0 +1,62 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tests import benchmark
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_write_topology(self):
+        topology_file = os.path.join(self.work_dir, 'topology.conf')
+        benchmark.write_topology(topology_file, 20)
+        with open(topology_file) as topology:
+            lines = topology.read().splitlines()
+
+        self.assertEqual(lines[0], '[nodes]')
+        self.assertEqual(lines[21], '[links]')
+        links = [line.split()[0] for line in lines[22:]]
+        # A ring, plus at most one chord per node
+        self.assertTrue(20 <= len(links) <= 40)
+        self.assertEqual(len(set(links)), len(links))
+
+    def test_run(self):
+        results = benchmark.run(10, self.work_dir)
+        self.assertEqual(sorted(results), sorted(benchmark.PHASES))
+
+        # One nfd and one nlsr per node, a strategy, a ping server and a batch of pings
+        self.assertEqual(results['nlsr']['commands'], 20)
+        self.assertEqual(results['experiment']['commands'], 30)
+        self.assertEqual(sum(result['sudo'] for result in results.values()), 0)
+        self.assertTrue(os.path.isfile(os.path.join(self.work_dir, 'n0', 'nlsr.conf')))
+
+        report = benchmark.format_results({'10': results}, {'10': results})
+        self.assertIn('+0% time, +0 commands', report)
@@ -0,0 +1,196 @@
+# -*- Mode:python; c-file-style:"gnu"; indent-tabs-mode:nil -*- */
+#
+# Copyright (C) 2015-2016, The University of Memphis,
+#                          Arizona Board of Regents,
+#                          Regents of the University of California.
+#
+# This file is part of Mini-NDN.
+# See AUTHORS.md for a complete list of Mini-NDN authors and contributors.
+#
+# Mini-NDN is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Mini-NDN is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Mini-NDN, e.g., in COPYING.md file.
+# If not, see <http://www.gnu.org/licenses/>.
+
+# tests.mock would shadow the mock package otherwise
+from __future__ import absolute_import
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from mock import patch
+
+import minindn.config
+from minindn.topology import Topology
+from ndn import nlsr
+from ndn.bring_up import BringUp
+from ndn.experiments.experiment import Experiment
+from ndn.ndn_host import assign_ips, make_home_folders
+from tests import benchmark
+from tests.mock import MockMininet, patch_nfd
+
+# Upper bounds on the shell commands and sudo commands sent to each node, per phase.
+# A change that adds a round trip per node on these paths multiplies the setup time of
+# large topologies; raise a budget only for a round trip that cannot be avoided.
+CONSTRUCTION_BUDGET = (0, 0)
+# Per interface: one ifconfig
+IP_BUDGET = (1, 0)
+# nfd and nlsr, whose PIDs come with the command
+NLSR_BUDGET = (2, 0)
+# ndnsec key generation, certificate generation and installation
+NLSR_SECURITY_BUDGET = (6, 0)
+# Strategy, ping server and one batch of ping clients
+EXPERIMENT_BUDGET = (3, 0)
+
+# Upper bounds on the commands and sudo commands run in the root namespace, with
+# mininet.clean.sh or subprocess, as (once, per node). Every one of them is a fork
+# and exec of the orchestrator, run one node at a time in the worst case.
+ROOT_BUDGET = ((0, 0), (0, 0))
+# The root key and certificate, then the signing of each node's site certificate
+NLSR_SECURITY_ROOT_BUDGET = ((2, 0), (1, 0))
+
+N_NODES = 30
+
+class CommandCounter(object):
+    '''Counts the commands sent to every host of a MockMininet, and those run in the
+       root namespace through the given mocks, since the last call'''
+    def __init__(self, hosts, rootMocks):
+        self.hosts = hosts
+        self.rootMocks = rootMocks
+        self.counts = dict((host.name, 0) for host in hosts)
+        self.rootCount = 0
+
+    def rootCommands(self):
+        commands = []
+        for rootMock in self.rootMocks:
+            for args, kwargs in rootMock.call_args_list:
+                command = args[0] if len(args) > 0 else kwargs.get('args')
+                commands.append(command if isinstance(command, str) else ' '.join(command))
+        return commands
+
+    def next(self):
+        '''Return (host name -> (commands, sudo commands), (root commands, root sudo commands))
+           since the last call'''
+        counts = {}
+        for host in self.hosts:
+            cmds = host.cmds[self.counts[host.name]:]
+            counts[host.name] = (len(cmds), len([cmd for cmd in cmds if 'sudo ' in cmd]))
+            self.counts[host.name] = len(host.cmds)
+
+        rootCmds = self.rootCommands()
+        newRootCmds = rootCmds[self.rootCount:]
+        self.rootCount = len(rootCmds)
+        return counts, (len(newRootCmds), len([cmd for cmd in newRootCmds if 'sudo ' in cmd]))
+
+class TestCommandBudget(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        topology_file = os.path.join(self.work_dir, 'topology.conf')
+        benchmark.write_topology(topology_file, N_NODES)
+        nlsr.load_conf_template(benchmark.NLSR_CONF_TEMPLATE)
+
+        # Commands run in the root namespace are counted rather than run
+        self.sh = self.startPatch(patch('ndn.nlsr.sh'))
+        self.popen = self.startPatch(patch('subprocess.Popen', wraps=subprocess.Popen))
+        for patcher in patch_nfd():
+            self.startPatch(patcher)
+
+        self.topo = Topology(minindn.config.parse(topology_file), self.work_dir)
+        make_home_folders(self.work_dir, [host.name for host in self.topo.hosts_conf])
+        self.net = MockMininet(self.topo)
+        self.counter = CommandCounter(self.net.hosts, [self.sh, self.popen])
+
+    def tearDown(self):
+        nlsr._CONF_TEMPLATE = None
+        shutil.rmtree(self.work_dir)
+
+    def startPatch(self, patcher):
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def assertWithinBudget(self, counts, budget, units=None, rootBudget=ROOT_BUDGET):
+        hostCounts, (rootCommands, rootSudo) = counts
+        (once, perNode) = rootBudget
+        for index, count in ((0, rootCommands), (1, rootSudo)):
+            limit = once[index] + perNode[index] * len(self.net.hosts)
+            self.assertTrue(count <= limit, "{} {}commands run in the root namespace, over the budget of {}"
+                            .format(count, 'sudo ' if index == 1 else '', limit))
+
+        for name, (commands, sudo) in hostCounts.items():
+            scale = 1 if units is None else units[name]
+            self.assertTrue(commands <= budget[0] * scale,
+                            "{} sent {} commands, over the budget of {}".format(name, commands, budget[0] * scale))
+            self.assertTrue(sudo <= budget[1] * scale,
+                            "{} sent {} sudo commands, over the budget of {}".format(name, sudo, budget[1] * scale))
+
+    def bringUpNlsr(self, nlsr_opts):
+        bring_up = BringUp(self.net.hosts)
+        bring_up.addStage('nfd', lambda host: host.nfd.start())
+        nlsr.add_stages(bring_up, self.net, self.topo.hosts_conf, self.work_dir, nlsr_opts)
+        bring_up.run()
+        self.assertEqual(bring_up.failures, {})
+
+    def test_construction(self):
+        # MockShell does not send Mininet's own commands, only Mini-NDN's are counted
+        self.assertWithinBudget(self.counter.next(), CONSTRUCTION_BUDGET)
+
+        assign_ips(self.net)
+        self.assertWithinBudget(self.counter.next(), IP_BUDGET,
+                                dict((host.name, len(host.intfList())) for host in self.net.hosts))
+
+    def test_nlsr(self):
+        assign_ips(self.net)
+        self.counter.next()
+
+        self.bringUpNlsr({})
+        self.assertWithinBudget(self.counter.next(), NLSR_BUDGET)
+
+    @patch('ndn.nlsr.shutil.copyfile')
+    def test_nlsr_security(self, copyfile):
+        assign_ips(self.net)
+        self.counter.next()
+
+        self.bringUpNlsr({'security': True})
+        budget = (NLSR_BUDGET[0] + NLSR_SECURITY_BUDGET[0], NLSR_BUDGET[1] + NLSR_SECURITY_BUDGET[1])
+        self.assertWithinBudget(self.counter.next(), budget, rootBudget=NLSR_SECURITY_ROOT_BUDGET)
+        self.assertTrue(self.sh.call_count > 0)
+
+    def startExperiment(self, pctTraffic):
+        assign_ips(self.net)
+        self.bringUpNlsr({})
+        self.counter.next()
+
+        experiment = Experiment({
+            'net': self.net,
+            'nodes': ','.join(host.name for host in self.net.hosts),
+            'ctime': 60,
+            'nPings': 300,
+            'pctTraffic': pctTraffic,
+            'workDir': self.work_dir
+        })
+        bring_up = BringUp(self.net.hosts)
+        experiment.addSetupStages(bring_up)
+        bring_up.run()
+        experiment.startPctPings()
+        return experiment
+
+    def test_experiment(self):
+        self.startExperiment(0.2)
+        self.assertWithinBudget(self.counter.next(), EXPERIMENT_BUDGET)
+
+    def test_pingall_experiment(self):
+        # Pinging every other node still takes a single batch per node
+        experiment = self.startExperiment(1.0)
+        self.assertEqual(len(experiment.pingedDict[self.net.hosts[0]]), N_NODES - 1)
+        self.assertWithinBudget(self.counter.next(), EXPERIMENT_BUDGET)